@@ -1,25 +1,71 @@
 import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
 import numpy as np
-import pickle
-import tensorflow as tf
-from sklearn.preprocessing import LabelEncoder
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext, suppress
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
 import time
 
-# ========================= 
-# Global Color Map 
-# ========================= 
-COLOR_MAP = {
-    "Normal": "#17b724",     # green
-    "Suspicious": "#ffae00",  # yellow
-    "Malicious": "#ff2a2a"    # red
-}
+from netpulse import assets, pipeline
+from netpulse.charts import (
+    COLOR_MAP,
+    TIMELINE_BUCKET,
+    create_pie_chart,
+    create_bar_chart,
+    create_timeline_chart,
+    create_heatmap_chart,
+    create_protocol_chart,
+    create_confidence_bins_chart,
+    create_packet_sequence_viz,
+    create_radar_chart,
+    create_3d_scatter,
+)
+from netpulse.aggregates import (
+    CONF_BINS,
+    chart_aggregates,
+    corr_matrix,
+    mean_confidence,
+    merge_aggregates,
+    radar_stats,
+    sorted_class_counts,
+    timeline_frame,
+    top_protocols,
+)
+from netpulse.alerting import FLOW_KEY_COLUMNS, AlertEngine, flow_keys, score_alerts
+from netpulse.batching import batched_artifacts
+from netpulse.export import EXPORT_FORMATS, Exporter, csv_bytes, iter_frame_chunks
+from netpulse.hunting import FlowIndex
+from netpulse.monitor import CsvTailer, MicroBatcher, SocketListener
+from netpulse.parallel import ScoringPool
+from netpulse.profiling import Profiler, StageTimer
+from netpulse.sequences import DEFAULT_MAX_TEMPLATES, SequenceTemplateCache
+from netpulse.pipeline import (
+    IDENTITY_COLS,
+    RESULT_COLS,
+    align_features,
+    attach_predictions,
+    compact_dtypes,
+    dedup_inputs,
+    encode_categoricals,
+    flows_to_sequences,
+    input_columns,
+    input_format,
+    merge_cascade_stats,
+    read_flows,
+    sequence_columns,
+)
 
 # Set page config
 st.set_page_config(
@@ -841,46 +887,73 @@ st.markdown("""
 # ========================= 
 # Load Artifacts 
 # ========================= 
-@st.cache_resource
+# TensorFlow and the model load on a background thread started by the first
+# session, so the welcome screen renders right away; scripts only wait for it
+# once an upload or the monitor actually needs the model.
+MODEL_DIR = pipeline.resolve_model_dir()
+MODEL_RUNTIME = pipeline.resolve_runtime()
+# Packet-sequence templates kept across runs and sessions (NETPULSE_SEQUENCE_TEMPLATES=0 turns it off)
+SEQUENCE_TEMPLATES = int(os.environ.get("NETPULSE_SEQUENCE_TEMPLATES", DEFAULT_MAX_TEMPLATES))
+
 def load_artifacts():
+    artifacts = pipeline.load_artifacts(MODEL_DIR, runtime=MODEL_RUNTIME)
+    if SEQUENCE_TEMPLATES > 0:
+        artifacts.sequence_cache = SequenceTemplateCache(SEQUENCE_TEMPLATES, artifacts.seq_len)
+    return artifacts
+
+@st.cache_resource
+def start_artifact_loader(fingerprint):
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="netpulse-model-load")
+    future = executor.submit(load_artifacts)
+    executor.shutdown(wait=False)
+    return future
+
+def wait_for_artifacts(loader):
     try:
-        fusion = tf.keras.models.load_model("netpulse_fusion_v2.h5")
-        with open("scaler3.pkl", "rb") as f:
-            scaler3 = pickle.load(f)
-        with open("class_map.pkl", "rb") as f:
-            class_map = pickle.load(f)
-        with open("config.pkl", "rb") as f:
-            config = pickle.load(f)
-        return fusion, scaler3, class_map, config
+        return loader.result()
     except Exception as e:
+        # Drop the failed future so the next rerun starts a fresh load
+        start_artifact_loader.clear()
         st.error(f"Error loading artifacts: {str(e)}")
-        return None, None, None, None
+        return None
+
+# In-process scoring from every session goes through one inference thread that
+# merges concurrent requests into shared batches (NETPULSE_BATCH_ROWS=0 turns it off)
+INFERENCE_BATCH_ROWS = int(os.environ.get("NETPULSE_BATCH_ROWS", pipeline.INFER_BATCH_ROWS))
+INFERENCE_BATCH_WAIT_MS = float(os.environ.get("NETPULSE_BATCH_WAIT_MS", 5))
 
-fusion, scaler3, class_map, config = load_artifacts()
+@st.cache_resource
+def get_batched_artifacts(fingerprint, _artifacts):
+    return batched_artifacts(_artifacts, max_batch_rows=INFERENCE_BATCH_ROWS, max_wait=INFERENCE_BATCH_WAIT_MS / 1000)
 
-if fusion:
-    SEQ_LEN = config.get("SEQ_LEN", 50)
+ARTIFACT_FINGERPRINT = pipeline.artifact_fingerprint(MODEL_DIR, MODEL_RUNTIME)
+artifact_loader = start_artifact_loader(ARTIFACT_FINGERPRINT)
+artifacts = None
+inference_batcher = None
+fusion, scaler3, class_map, config = None, None, None, None
 
 # ========================= 
 # UI Header 
 # ========================= 
-# Load and encode logo
-import base64
-import os
+# The logo is downsized once per process. With static serving on, pages only
+# reference app/static/ and the browser caches the file; otherwise one cached
+# data URI of the small copy is reused by every rerun.
+@st.cache_resource
+def get_logo_src():
+    try:
+        path = assets.build_logo()
+    except (OSError, ImportError):
+        return ""
+    if path is None:
+        return ""
+    if st.get_option("server.enableStaticServing") and os.path.dirname(path) == assets.STATIC_DIR:
+        return f"app/static/{os.path.basename(path)}"
+    return assets.data_uri(path)
 
-logo_base64 = ""
-try:
-    if os.path.exists("netpulse_logo.png"):
-        with open("netpulse_logo.png", "rb") as f:
-            logo_base64 = base64.b64encode(f.read()).decode()
-    elif os.path.exists("/mnt/user-data/uploads/netpulse_logo.png"):
-        with open("/mnt/user-data/uploads/netpulse_logo.png", "rb") as f:
-            logo_base64 = base64.b64encode(f.read()).decode()
-except:
-    pass
+logo_src = get_logo_src()
 
 # Display logo centered using pure CSS - NO COLUMNS AT ALL
-if logo_base64:
+if logo_src:
     st.markdown(f"""
     <div style='display: flex; justify-content: center; align-items: center; margin-bottom: 1.5rem;'>
         <div style='background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%);
@@ -890,7 +963,7 @@ if logo_base64:
                     padding: 2rem 4rem;
                     box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
                     text-align: center;'>
-            <img src="data:image/png;base64,{logo_base64}" width="450" style="display: block; margin: 0 auto;"/>
+            <img src="{logo_src}" width="450" style="display: block; margin: 0 auto;"/>
         </div>
     </div>
     """, unsafe_allow_html=True)
@@ -907,7 +980,16 @@ with st.sidebar:
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
     
     # Logo/Icon section with background
-    st.markdown("""
+    if logo_src:
+        sidebar_logo = f"<img src='{logo_src}' width='180' style='display: block; margin: 0 auto;'/>"
+    else:
+        sidebar_logo = """
+        <div style='text-align: center; padding: 0.5rem 0;'>
+            <div style='font-size: 2rem;'>🛡️</div>
+            <div style='font-size: 1rem; font-weight: 700; color: #17b724; margin-top: 0.5rem;'>NET PULSE</div>
+        </div>
+        """
+    st.markdown(f"""
     <div style='background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%);
                 backdrop-filter: blur(20px);
                 border: 1px solid rgba(255, 255, 255, 0.15);
@@ -916,23 +998,9 @@ with st.sidebar:
                 margin-bottom: 1.5rem;
                 box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
                 text-align: center;'>
+        {sidebar_logo}
+    </div>
     """, unsafe_allow_html=True)
-    try:
-        st.image("netpulse_logo.png", width=180)
-    except:
-        try:
-            st.image("/mnt/user-data/uploads/netpulse_logo.png", width=180)
-        except:
-            try:
-                st.image("/mnt/user-data/uploads/1769091506209_image.png", width=180)
-            except:
-                st.markdown("""
-                <div style='text-align: center; padding: 0.5rem 0;'>
-                    <div style='font-size: 2rem;'>🛡️</div>
-                    <div style='font-size: 1rem; font-weight: 700; color: #17b724; margin-top: 0.5rem;'>NET PULSE</div>
-                </div>
-                """, unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
     
     st.markdown("---")
     
@@ -961,16 +1029,101 @@ with st.sidebar:
         help="Lower values = more sensitive detection"
     )
     
-    auto_export = st.checkbox("Auto-export Reports", value=False)
+    col1, col2 = st.columns(2)
+    with col1:
+        alert_window = st.number_input(
+            "Window (min)", min_value=1, max_value=1440, value=5,
+            help="Alerts for the same flow key and threat class within this gap are merged"
+        )
+    with col2:
+        alert_rate_limit = st.number_input(
+            "Max Alerts / Window", min_value=1, max_value=10000, value=25,
+            help="New alerts beyond this per window are suppressed and counted"
+        )
+    
+    auto_export = st.checkbox(
+        "Auto-export Reports",
+        value=False,
+        help="Write every scored upload to the export directory on a background thread"
+    )
+    export_dir = st.text_input(
+        "Export Directory",
+        value=os.environ.get("NETPULSE_EXPORT_DIR", "exports"),
+        disabled=not auto_export
+    )
+    export_format = st.selectbox(
+        "Export Format",
+        list(EXPORT_FORMATS),
+        format_func=lambda fmt: "Parquet (zstd)" if fmt == 'parquet' else "CSV (gzip, chunked)",
+        disabled=not auto_export
+    )
+    
+    st.markdown("---")
+    
+    st.markdown("#### 🪜 Cascade Scoring")
+    cascade_mode = st.checkbox(
+        "Level-1 Screening",
+        value=False,
+        help="Screen flows with the binary level-1 model; only likely attacks reach the fusion model"
+    )
+    cascade_cutoff = st.slider(
+        "Escalation Cutoff",
+        0.0, 1.0, 0.1, 0.01,
+        help="Flows with a level-1 attack probability at or above this go to the fusion model",
+        disabled=not cascade_mode
+    )
+    measure_agreement = st.checkbox(
+        "Measure Agreement",
+        value=False,
+        help="Also run full fusion scoring to report how often the cascade agrees",
+        disabled=not cascade_mode
+    )
+    
+    st.markdown("---")
+    
+    st.markdown("#### 💾 Large Files")
+    streaming_mode = st.checkbox(
+        "Streaming Mode",
+        value=False,
+        help="Score the upload in fixed-size chunks so memory stays bounded"
+    )
+    chunk_rows = st.number_input(
+        "Chunk Size (rows)",
+        min_value=10_000,
+        max_value=1_000_000,
+        value=100_000,
+        step=10_000,
+        disabled=not streaming_mode
+    )
+    scoring_workers = st.number_input(
+        "Worker Processes",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=1,
+        help="Shard fusion scoring across worker processes; 1 scores in-process"
+    )
+    dedup_flows = st.checkbox(
+        "Deduplicate Flows",
+        value=False,
+        help="Score each distinct feature vector once and copy its result to repeated flows"
+    )
+    
+    st.markdown("#### ⏱️ Diagnostics")
+    profile_run = st.checkbox(
+        "Profile This Run (cProfile)",
+        value=False,
+        help="Capture a cProfile report of the analysis, shown in the Performance panel"
+    )
     
     st.markdown("---")
     
     # Model Info Card
-    st.markdown("""
+    st.markdown(f"""
     <div style='background: rgba(255, 255, 255, 0.03); padding: 1rem; border-radius: 12px; border: 1px solid rgba(255, 255, 255, 0.08);'>
         <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>MODEL INFO</div>
         <div style='font-weight: 600; color: #ffffff; margin-bottom: 0.25rem;'>Fusion CNN-LSTM</div>
         <div style='font-size: 0.85rem; color: #a0aec0;'>Dataset: UNSW-NB15</div>
+        <div style='font-size: 0.85rem; color: #a0aec0;'>Runtime: {MODEL_RUNTIME}</div>
         <div style='font-size: 0.85rem; color: #17b724; font-weight: 600; margin-top: 0.5rem;'>82% Accuracy</div>
     </div>
     """, unsafe_allow_html=True)
@@ -1014,441 +1167,1217 @@ with st.sidebar:
     st.markdown('</div>', unsafe_allow_html=True)
 
 # ========================= 
-# Flow → Sequence Conversion 
+# Scoring Pipeline 
+# ========================= 
+@st.cache_resource
+def get_scoring_pool(workers):
+    # One pool per worker count, shared by all sessions; each worker loads the model once
+    return ScoringPool(MODEL_DIR, workers, runtime=MODEL_RUNTIME, sequence_templates=SEQUENCE_TEMPLATES).warm_up()
+
+def score_flows(df):
+    if scoring_workers > 1:
+        return get_scoring_pool(scoring_workers).score(df, dedup_flows, dedup_stats)
+    return pipeline.score_flows(artifacts, df, dedup_flows, dedup_stats)
+
+@st.cache_resource
+def load_level1():
+    try:
+        return pipeline.load_level1(MODEL_DIR)
+    except Exception as e:
+        st.warning(f"Level-1 screener unavailable, using full fusion scoring: {str(e)}")
+        return None
+
+def cascade_score(df, cutoff, measure_agreement=False):
+    level1 = load_level1()
+    if level1 is None:
+        return score_flows(df), None
+    predict = get_scoring_pool(scoring_workers).predict if scoring_workers > 1 else None
+    return pipeline.cascade_score(artifacts, level1, df, cutoff, measure_agreement, predict=predict)
+
+def cascade_score_mode(prefix=""):
+    # Agreement is part of the key: it adds stats the plain cascade run does not have
+    mode = f"{prefix}cascade@{cascade_cutoff:.2f}"
+    return f"{mode}+agreement" if measure_agreement else mode
+
+def render_cascade_stats(stats):
+    def rate(rows, seconds):
+        return f"{rows / seconds:,.0f} flows/s" if seconds > 0 else "—"
+    
+    with st.expander("🪜 Cascade Statistics", expanded=False):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            escalated_pct = stats['escalated_flows'] / stats['total_flows'] * 100 if stats['total_flows'] else 0
+            st.metric("Escalated to Fusion", f"{stats['escalated_flows']:,}", f"{escalated_pct:.1f}% of flows", delta_color="off")
+        with col2:
+            st.metric("Level-1 Throughput", rate(stats['total_flows'], stats['level1_seconds']))
+        with col3:
+            st.metric("Fusion Throughput", rate(stats['escalated_flows'], stats['fusion_seconds']))
+        with col4:
+            st.metric("End-to-End", rate(stats['total_flows'], stats['level1_seconds'] + stats['fusion_seconds']))
+        
+        if 'agreement_rate' in stats:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Agreement vs Full Fusion", f"{stats['agreement_rate'] * 100:.2f}%")
+            with col2:
+                st.metric("Threats Screened Out", f"{stats['missed_threats']:,}")
+            with col3:
+                st.metric("Full Fusion Throughput", rate(stats['total_flows'], stats['full_fusion_seconds']))
+
+# ========================= 
+# Result Cache 
+# ========================= 
+# Streamlit reruns the whole script on every widget change. Scored results are
+# kept process-wide, keyed by the upload's content hash and the model version,
+# so reruns only re-render. Least recently used entries are evicted once the
+# entry count or the memory cap is exceeded.
+RESULT_CACHE_MAX_ENTRIES = 8
+RESULT_CACHE_MAX_MB = float(os.environ.get("NETPULSE_RESULT_CACHE_MB", 1024))
+
+@st.cache_resource
+def get_result_cache():
+    return {'entries': OrderedDict(), 'nbytes': 0, 'lock': threading.Lock()}
+
+# Bumped when the app changes what the same model returns for the same upload
+# (2: model inputs no longer downcast to float32), so older cached scores go stale
+SCORING_REVISION = 2
+
+def model_version():
+    if not config:
+        return "unloaded"
+    return f"{config.get('version', 'unknown')}:{config.get('SEQ_LEN', 50)}:{ARTIFACT_FINGERPRINT}:r{SCORING_REVISION}"
+
+def upload_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def result_cache_key(digest, mode):
+    return f"{digest}:{model_version()}:{mode}"
+
+def _result_nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_result_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(_result_nbytes(v) for v in value.values())
+    return 0
+
+def session_memory_mb(*results):
+    # What one analyst's session keeps alive: its results and its session_state
+    nbytes = sum(_result_nbytes(value) for value in results)
+    nbytes += sum(_result_nbytes(value) for value in st.session_state.to_dict().values())
+    return nbytes / 1024 / 1024
+
+def result_cache_get(key):
+    cache = get_result_cache()
+    with cache['lock']:
+        entry = cache['entries'].get(key)
+        if entry is None:
+            return None
+        cache['entries'].move_to_end(key)
+        return entry[0]
+
+def result_cache_put(key, value):
+    nbytes = _result_nbytes(value)
+    if nbytes > RESULT_CACHE_MAX_MB * 1024 * 1024:
+        return
+    cache = get_result_cache()
+    with cache['lock']:
+        if key in cache['entries']:
+            cache['nbytes'] -= cache['entries'].pop(key)[1]
+        cache['entries'][key] = (value, nbytes)
+        cache['nbytes'] += nbytes
+        while (len(cache['entries']) > RESULT_CACHE_MAX_ENTRIES
+               or cache['nbytes'] > RESULT_CACHE_MAX_MB * 1024 * 1024):
+            _, (evicted, evicted_nbytes) = cache['entries'].popitem(last=False)
+            cache['nbytes'] -= evicted_nbytes
+            # Streamed results own an on-disk store that goes with the entry
+            if isinstance(evicted, dict) and 'store_path' in evicted:
+                remove_result_store(evicted['store_path'])
+
+# ========================= 
+# Persistent Prediction Cache 
+# ========================= 
+# Per-flow predictions are stored in SQLite keyed by upload hash and artifact
+# fingerprint, so a repeat upload from any session, or after a restart, skips
+# inference. Entries for older artifacts are purged on open; the least recently
+# used entries are evicted once the store exceeds its size budget.
+PREDICTION_CACHE_DIR = os.environ.get(
+    "NETPULSE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "netpulse")
+)
+PREDICTION_CACHE_MAX_MB = float(os.environ.get("NETPULSE_CACHE_MB", 2048))
+
+def _prediction_db():
+    os.makedirs(PREDICTION_CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(PREDICTION_CACHE_DIR, "predictions.sqlite"), timeout=30)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS predictions (
+            file_key TEXT NOT NULL,
+            model_version TEXT NOT NULL,
+            n_rows INTEGER NOT NULL,
+            n_classes INTEGER NOT NULL,
+            prediction BLOB NOT NULL,
+            confidence BLOB NOT NULL,
+            probs BLOB NOT NULL,
+            nbytes INTEGER NOT NULL,
+            last_access REAL NOT NULL,
+            PRIMARY KEY (file_key, model_version)
+        )
+    """)
+    # Run statistics (cascade) as JSON; added after the table first shipped
+    if 'stats' not in {row[1] for row in conn.execute("PRAGMA table_info(predictions)")}:
+        conn.execute("ALTER TABLE predictions ADD COLUMN stats TEXT")
+    return conn
+
+@st.cache_resource
+def purge_stale_predictions(version):
+    try:
+        with closing(_prediction_db()) as conn, conn:
+            conn.execute("DELETE FROM predictions WHERE model_version != ?", (version,))
+    except sqlite3.Error:
+        pass
+    return True
+
+def load_cached_predictions(file_key):
+    version = model_version()
+    purge_stale_predictions(version)
+    try:
+        with closing(_prediction_db()) as conn, conn:
+            row = conn.execute(
+                "SELECT n_rows, n_classes, prediction, confidence, probs, stats FROM predictions "
+                "WHERE file_key = ? AND model_version = ?",
+                (file_key, version)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE predictions SET last_access = ? WHERE file_key = ? AND model_version = ?",
+                (time.time(), file_key, version)
+            )
+    except sqlite3.Error:
+        return None
+
+    n_rows, n_classes, prediction, confidence, probs, stats = row
+    return {
+        'prediction': np.frombuffer(prediction, dtype=np.int8),
+        'confidence': np.frombuffer(confidence, dtype=np.float32),
+        'probs': np.frombuffer(probs, dtype=np.float32).reshape(n_rows, n_classes),
+        'stats': json.loads(stats) if stats else None,
+    }
+
+def store_cached_predictions(file_key, preds, stats=None):
+    preds = np.asarray(preds, dtype=np.float32)
+    prediction = preds.argmax(axis=1).astype(np.int8).tobytes()
+    confidence = preds.max(axis=1).tobytes()
+    probs = preds.tobytes()
+    nbytes = len(prediction) + len(confidence) + len(probs)
+    if nbytes > PREDICTION_CACHE_MAX_MB * 1024 * 1024:
+        return
+
+    try:
+        with closing(_prediction_db()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO predictions "
+                "(file_key, model_version, n_rows, n_classes, prediction, confidence, probs, nbytes, last_access, stats) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (file_key, model_version(), len(preds), preds.shape[1],
+                 prediction, confidence, probs, nbytes, time.time(), json.dumps(stats) if stats else None)
+            )
+            total = conn.execute("SELECT COALESCE(SUM(nbytes), 0) FROM predictions").fetchone()[0]
+            budget = PREDICTION_CACHE_MAX_MB * 1024 * 1024
+            for key, version, size in conn.execute(
+                "SELECT file_key, model_version, nbytes FROM predictions ORDER BY last_access"
+            ).fetchall():
+                if total <= budget:
+                    break
+                conn.execute("DELETE FROM predictions WHERE file_key = ? AND model_version = ?", (key, version))
+                total -= size
+    except sqlite3.Error:
+        pass
+
+# ========================= 
+# Streaming Ingestion 
+# ========================= 
+# Results are appended to a fixed-width binary store (21 bytes + probabilities
+# per flow, including the time and flow-key code alerting needs) and every chart
+# input is kept as a running aggregate, so memory stays bounded by the chunk
+# size rather than the file size.
+STREAM_STORE_DIR = os.environ.get("NETPULSE_STREAM_DIR") or None
+# Stores are removed with their result-cache entry; ones left behind by an
+# earlier process are swept at startup once untouched for this long
+STREAM_STORE_TTL_HOURS = float(os.environ.get("NETPULSE_STREAM_TTL_HOURS", 24))
+STREAM_TOP_THREATS = 100
+STREAM_SAMPLE_ROWS = 200
+STREAM_ALERT_BLOCK = 1_000_000
+
+def result_dtype(n_classes):
+    return np.dtype([
+        ('row', 'i8'),
+        ('prediction', 'i1'),
+        ('confidence', 'f4'),
+        ('time', 'i8'),
+        ('key', 'i4'),
+        ('probs', 'f4', (n_classes,)),
+    ])
+
+def new_stream_aggregates(store_path):
+    return {
+        'store_path': store_path,
+        'total_flows': 0,
+        'n_columns': 0,
+        'has_time': False,
+        'class_counts': pd.Series(0, index=list(class_map.values()), dtype='int64'),
+        'confidence_sum': 0.0,
+        'conf_hist': {label: np.zeros(len(CONF_BINS) - 1, dtype=np.int64) for label in class_map.values()},
+        'timeline': None,
+        'proto_counts': None,
+        'radar_sums': None,
+        'radar_counts': None,
+        'corr_cols': None,
+        'corr_n': 0,
+        'corr_mean': None,
+        'corr_comoment': None,
+        'top_threats': None,
+        'sample': None,
+        'flow_keys': {},
+        'cascade_stats': None,
+    }
+
+def class_labels():
+    return [class_map[k] for k in sorted(class_map)]
+
+def update_stream_aggregates(agg, chunk, bucket=TIMELINE_BUCKET):
+    # Chart inputs fold into running totals; the heatmap keeps the first chunk's columns
+    merge_aggregates(agg, chart_aggregates(chunk, class_labels(), bucket, corr_cols=agg['corr_cols']))
+
+    top = chunk if agg['top_threats'] is None else pd.concat([agg['top_threats'], chunk])
+    top = top.sort_values('confidence', ascending=False, kind='stable')
+    agg['top_threats'] = top.groupby('prediction_label', observed=True).head(STREAM_TOP_THREATS)
+
+    if agg['sample'] is None:
+        agg['sample'] = chunk.head(STREAM_SAMPLE_ROWS)
+    elif len(agg['sample']) < STREAM_SAMPLE_ROWS:
+        agg['sample'] = pd.concat([agg['sample'], chunk.head(STREAM_SAMPLE_ROWS - len(agg['sample']))])
+
+def alert_inputs(agg, chunk):
+    # Times as int64 ns (NaT when absent) and flow keys as codes into agg['flow_keys']
+    if 'time' in chunk.columns:
+        times = pd.to_datetime(chunk['time'], errors='coerce').to_numpy('datetime64[ns]').view(np.int64)
+    else:
+        times = np.full(len(chunk), np.iinfo(np.int64).min)
+    keys = flow_keys(chunk)
+    if keys is None:
+        return times, np.full(len(chunk), -1, dtype=np.int32)
+    codes, uniques = pd.factorize(keys)
+    vocab = agg['flow_keys']
+    mapping = np.array([vocab.setdefault(key, len(vocab)) for key in uniques], dtype=np.int32)
+    return times, mapping[codes]
+
+def write_result_records(store, rows, preds, times=None, keys=None):
+    records = np.empty(len(rows), dtype=result_dtype(preds.shape[1]))
+    records['row'] = rows
+    records['prediction'] = preds.argmax(axis=1)
+    records['confidence'] = preds.max(axis=1)
+    records['time'] = np.iinfo(np.int64).min if times is None else times
+    records['key'] = -1 if keys is None else keys
+    records['probs'] = preds
+    records.tofile(store)
+
+def upload_columns():
+    # Columnar uploads read only what scoring and alerting use
+    return input_columns(scaler3, extra=dict.fromkeys(c for cols in FLOW_KEY_COLUMNS for c in cols))
+
+def stream_store_path(cache_key):
+    # One store per result-cache key, so rescoring the same upload overwrites it
+    name = f"netpulse_stream_{hashlib.sha256(cache_key.encode()).hexdigest()[:16]}"
+    return os.path.join(STREAM_STORE_DIR or tempfile.gettempdir(), name, "results.bin")
+
+def remove_result_store(store_path):
+    shutil.rmtree(os.path.dirname(store_path), ignore_errors=True)
+
+@st.cache_resource
+def sweep_result_stores():
+    # Once per process: stores of earlier runs that no cache entry will clean up
+    base = STREAM_STORE_DIR or tempfile.gettempdir()
+    cutoff = time.time() - STREAM_STORE_TTL_HOURS * 3600
+    try:
+        names = os.listdir(base)
+    except OSError:
+        return True
+    for name in names:
+        path = os.path.join(base, name)
+        if name.startswith(("netpulse_stream_", "netpulse_monitor_")) and os.path.isdir(path):
+            try:
+                stale = os.path.getmtime(path) < cutoff
+            except OSError:
+                continue
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+    return True
+
+sweep_result_stores()
+
+def stream_score_upload(source, chunk_rows, store_path, fmt='csv', on_progress=None, cached_probs=None, scorer=None):
+    scorer = scorer or score_flows
+    os.makedirs(os.path.dirname(store_path), exist_ok=True)
+    agg = new_stream_aggregates(store_path)
+
+    # Written under a private name and renamed when complete, so a session
+    # rescoring the same upload concurrently never sees a partial store
+    fd, partial_path = tempfile.mkstemp(suffix=".partial", dir=os.path.dirname(store_path))
+    try:
+        with os.fdopen(fd, "wb") as store:
+            for chunk in read_flows(source, chunk_rows=chunk_rows, columns=upload_columns(), fmt=fmt):
+                agg['n_columns'] = len(chunk.columns)
+                if cached_probs is None:
+                    preds = scorer(chunk)
+                else:
+                    preds = cached_probs[agg['total_flows']:agg['total_flows'] + len(chunk)]
+                write_result_records(store, chunk.index.to_numpy(), preds, *alert_inputs(agg, chunk))
+                attach_predictions(chunk, preds, class_map)
+                update_stream_aggregates(agg, chunk)
+
+                if on_progress:
+                    on_progress(agg)
+        os.replace(partial_path, store_path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(partial_path)
+        raise
+
+    return agg
+
+def read_result_store(store_path):
+    return np.memmap(store_path, dtype=result_dtype(len(class_map)), mode="r")
+
+@st.cache_resource(max_entries=8)
+def get_stream_alerts(cache_key, threshold, window_minutes, rate_limit, _agg):
+    # Replays the result store block by block, so re-alerting at a new threshold
+    # never re-scores and never holds more than one block in memory
+    engine = AlertEngine(class_map, threshold, pd.Timedelta(minutes=window_minutes), rate_limit)
+    store = read_result_store(_agg['store_path'])
+    # Code -1 (no key columns in that batch) picks the trailing empty label
+    labels = np.array([*_agg['flow_keys'], ""], dtype=object)
+    for start in range(0, len(store), STREAM_ALERT_BLOCK):
+        block = store[start:start + STREAM_ALERT_BLOCK]
+        engine.process(
+            np.asarray(block['probs']),
+            times=np.asarray(block['time']).view('datetime64[ns]') if _agg['has_time'] else None,
+            keys=labels[block['key']] if _agg['flow_keys'] else None,
+            rows=np.asarray(block['row'])
+        )
+    return engine
+
+# ========================= 
+# Auto-export 
+# ========================= 
+# Exports run on one background thread and read results chunk by chunk, so a
+# rerun never waits on disk and no export is ever built as one giant string.
+@st.cache_resource
+def get_exporter():
+    return Exporter()
+
+def export_name(upload_name, digest, score_mode):
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.splitext(upload_name)[0])
+    mode = re.sub(r"[^A-Za-z0-9_.-]+", "-", score_mode)
+    return f"netpulse_{stem}_{digest[:12]}_{mode}"
+
+def iter_stream_results(data, fmt, store_path, chunk_rows):
+    # Re-reads the upload alongside the result store, so streamed results are
+    # exported with every input column without holding them all in memory
+    store = read_result_store(store_path)
+    offset = 0
+    for chunk in read_flows(io.BytesIO(data), chunk_rows=chunk_rows, columns=upload_columns(), fmt=fmt):
+        records = store[offset:offset + len(chunk)]
+        offset += len(chunk)
+        yield attach_predictions(chunk, np.asarray(records['probs']), class_map)
+
+def render_export_status(future):
+    if not future.done():
+        st.caption(f"📦 Auto-export running in the background ({get_exporter().pending()} pending)...")
+    elif future.exception() is not None:
+        st.warning(f"⚠️ Auto-export failed: {future.exception()}")
+    else:
+        result = future.result()
+        st.caption(f"📦 Exported {result['rows']:,} flows to `{result['path']}` ({result['bytes'] / 1024 / 1024:.1f} MB)")
+
+# ========================= 
+# Dashboard Components 
 # ========================= 
-def flow_to_sequence(row):
-    spkts = int(row.get('spkts', row.get('src_pkts', 0)))
-    dpkts = int(row.get('dpkts', row.get('dst_pkts', 0)))
-    sbytes = float(row.get('sbytes', row.get('src_bytes', 0)))
-    dbytes = float(row.get('dbytes', row.get('dst_bytes', 0)))
-    dur = float(row.get('dur', row.get('duration', 0.001)) or 0.001)
-    
-    src_sizes = [sbytes/spkts] * spkts if spkts > 0 else []
-    dst_sizes = [dbytes/dpkts] * dpkts if dpkts > 0 else []
-    src_times = np.linspace(0, dur, len(src_sizes)) if len(src_sizes) else []
-    dst_times = np.linspace(0, dur, len(dst_sizes)) if len(dst_sizes) else []
-    src_dir = [+1] * len(src_sizes)
-    dst_dir = [-1] * len(dst_sizes)
-    
-    packets = list(zip(src_times, src_sizes, src_dir)) + \
-              list(zip(dst_times, dst_sizes, dst_dir))
-    packets.sort(key=lambda x: x[0])
-    
-    seq = []
-    prev_t = 0
-    for t, size, d in packets:
-        gap = t - prev_t
-        prev_t = t
-        seq.append([size, gap, d])
-    
-    if len(seq) < SEQ_LEN:
-        seq += [[0, 0, 0]] * (SEQ_LEN - len(seq))
+def render_detection_summary(pred_counts, total_flows):
+    malicious_count = pred_counts.get('Malicious', 0)
+    suspicious_count = pred_counts.get('Suspicious', 0)
+    
+    if malicious_count > 0:
+        st.error(f"🚨 **ALERT:** Found **{malicious_count}** malicious and **{suspicious_count}** suspicious flows")
+    elif suspicious_count > 0:
+        st.warning(f"⚠️ **WARNING:** Found **{suspicious_count}** suspicious flows")
     else:
-        seq = seq[:SEQ_LEN]
+        st.success(f"✅ **ALL CLEAR:** No threats detected in {total_flows:,} analyzed flows")
+
+def render_kpi_cards(pred_counts, total_flows, avg_confidence):
+    col1, col2, col3, col4 = st.columns(4)
+    
+    total_threats = pred_counts.get('Malicious', 0) + pred_counts.get('Suspicious', 0)
+    threat_severity = (pred_counts.get('Malicious', 0) / total_flows * 100) if total_flows > 0 else 0
+    avg_confidence_pct = avg_confidence * 100
+    
+    if pred_counts.get('Malicious', 0) > 0:
+        risk_level = "HIGH"
+        risk_color = "#ff2a2a"
+    elif pred_counts.get('Suspicious', 0) > 0:
+        risk_level = "MEDIUM"
+        risk_color = "#ffae00"
+    else:
+        risk_level = "LOW"
+        risk_color = "#17b724"
+    
+    with col1:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>TOTAL THREATS</div>
+            <div style='font-size: 2.5rem; font-weight: 700; color: #ff2a2a;'>{total_threats}</div>
+            <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>Malicious + Suspicious</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>THREAT SEVERITY</div>
+            <div style='font-size: 2.5rem; font-weight: 700; color: #ff2a2a;'>{threat_severity:.1f}%</div>
+            <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>of total traffic</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    return np.array(seq)
+    with col3:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>AVG CONFIDENCE</div>
+            <div style='font-size: 2.5rem; font-weight: 700; color: #17b724;'>{avg_confidence_pct:.1f}%</div>
+            <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>detection accuracy</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class='metric-card'>
+            <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>RISK LEVEL</div>
+            <div style='font-size: 2.5rem; font-weight: 700; color: {risk_color};'>{risk_level}</div>
+            <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>security status</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+def render_threat_cards(threat_df, detail_cols):
+    for idx, row in threat_df.iterrows():
+        threat_level = row['prediction_label']
+        confidence = row['confidence']
+        threat_class = threat_level.lower()
+        color = COLOR_MAP[threat_level]
+    
+        confidence_pct = confidence * 100
+    
+        st.markdown(f"""
+        <div class='threat-container threat-container-{threat_class}'>
+            <div class='threat-header'>
+                <div>
+                    <span class='threat-badge threat-{threat_class}'>{threat_level}</span>
+                    <span style='color: #a0aec0; font-size: 0.85rem; margin-left: 1rem;'>
+                        Flow ID: {idx}
+                    </span>
+                </div>
+                <div style='font-size: 1.2rem; font-weight: 700; color: {color};'>
+                    {confidence_pct:.1f}%
+                </div>
+            </div>
+            <div class='confidence-bar'>
+                <div class='confidence-fill' style='width: {confidence_pct}%; background: {color};'></div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+        with st.expander("📋 View Details", expanded=False):
+            col1, col2, col3 = st.columns(3)
+    
+            for i, col in enumerate(detail_cols[:9]):
+                with [col1, col2, col3][i % 3]:
+                    st.metric(col, f"{row[col]}")
 
 # ========================= 
-# Enhanced Visualization Functions 
+# Alert System 
 # ========================= 
-def create_pie_chart(pred_counts):
-    pred_counts = pred_counts.reindex(["Normal", "Suspicious", "Malicious"]).dropna()
-    
-    fig = px.pie(
-        values=pred_counts.values,
-        names=pred_counts.index,
-        title="<b>Threat Distribution</b>",
-        color=pred_counts.index,
-        color_discrete_map=COLOR_MAP,
-        hole=0.5
+def render_alert_feed(alerts):
+    feed = alerts.frame()
+    st.markdown("#### 📋 Alert Feed")
+    st.caption(
+        f"{alerts.candidates:,} flows at ≥ {alerts.threshold:.2f} confidence → {len(feed):,} alerts "
+        f"· {alerts.suppressed_groups:,} more ({alerts.suppressed_flows:,} flows) rate-limited"
     )
+    if len(feed):
+        feed = feed.sort_values(['max_prob', 'flows'], ascending=False, kind='stable')
+        st.dataframe(feed, height=300, use_container_width=True, hide_index=True)
+
+def render_alert_section(pred_counts, alerts=None):
+    # With an alert engine, banners count aggregated alerts at the sensitivity
+    # threshold instead of raw per-flow predictions
+    if alerts is not None:
+        counts = alerts.counts()
+        malicious = counts.get('Malicious', {'alerts': 0, 'flows': 0})
+        suspicious = counts.get('Suspicious', {'alerts': 0, 'flows': 0})
+        malicious_count, suspicious_count = malicious['alerts'], suspicious['alerts']
+        malicious_text = f"{malicious['alerts']:,} malicious alerts covering {malicious['flows']:,} flows detected in your network traffic"
+        suspicious_text = f"{suspicious['alerts']:,} suspicious alerts covering {suspicious['flows']:,} flows - investigation recommended"
+    else:
+        malicious_count, suspicious_count = pred_counts.get('Malicious', 0), pred_counts.get('Suspicious', 0)
+        malicious_text = f"{malicious_count} malicious flows detected in your network traffic"
+        suspicious_text = f"{suspicious_count} suspicious flows detected - investigation recommended"
     
-    fig.update_traces(
-        textposition='outside',
-        textinfo='percent+label',
-        marker=dict(
-            line=dict(color='rgba(0,0,0,0.5)', width=2)
-        ),
-        pull=[0, 0.05, 0.1],
-        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
-    )
+    if malicious_count > 0:
+        st.markdown(f"""
+        <div style='background: linear-gradient(135deg, rgba(255, 42, 42, 0.2) 0%, rgba(255, 42, 42, 0.1) 100%);
+                    backdrop-filter: blur(20px);
+                    border: 1px solid rgba(255, 42, 42, 0.3);
+                    border-radius: 16px;
+                    padding: 1.5rem;
+                    margin: 1rem 0;'>
+            <div style='font-size: 1.5rem; font-weight: 700; color: #ff2a2a; margin-bottom: 0.5rem;'>
+                🚨 CRITICAL ALERT
+            </div>
+            <div style='color: #ffffff; font-size: 1.1rem;'>
+                {malicious_text}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    fig.update_layout(
-        height=450,
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Outfit', size=13, color='#a0aec0'),
-        title_font=dict(size=18, color='#ffffff', family='Outfit'),
-        legend=dict(
-            orientation="v",
-            yanchor="middle",
-            y=0.5,
-            xanchor="left",
-            x=1.1,
-            bgcolor='rgba(255,255,255,0.03)',
-            bordercolor='rgba(255,255,255,0.1)',
-            borderwidth=1,
-            font=dict(size=12)
-        ),
-        margin=dict(l=20, r=150, t=60, b=20)
-    )
+        with st.expander("🛡️ Recommended Actions", expanded=True):
+            st.markdown("""
+            <div style='line-height: 1.8;'>
+                <p style='color: #ffffff; font-weight: 600; margin-bottom: 1rem;'>Immediate Response Required:</p>
+                <ol style='color: #a0aec0;'>
+                    <li><strong style='color: #ffffff;'>Immediate Isolation:</strong> Block source IPs of malicious flows</li>
+                    <li><strong style='color: #ffffff;'>Forensic Analysis:</strong> Capture packet data for investigation</li>
+                    <li><strong style='color: #ffffff;'>Alert Escalation:</strong> Notify security team immediately</li>
+                    <li><strong style='color: #ffffff;'>Rule Update:</strong> Add new patterns to firewall rules</li>
+                    <li><strong style='color: #ffffff;'>Network Monitoring:</strong> Increase monitoring frequency</li>
+                </ol>
+            </div>
+            """, unsafe_allow_html=True)
     
-    return fig
-
-def create_bar_chart(pred_counts):
-    fig = px.bar(
-        x=pred_counts.index,
-        y=pred_counts.values,
-        title="<b>Threat Count by Category</b>",
-        color=pred_counts.index,
-        color_discrete_map=COLOR_MAP,
-        labels={'x': 'Threat Category', 'y': 'Count'},
-        text=pred_counts.values
-    )
+    elif suspicious_count > 0:
+        st.markdown(f"""
+        <div style='background: linear-gradient(135deg, rgba(255, 174, 0, 0.2) 0%, rgba(255, 174, 0, 0.1) 100%);
+                    backdrop-filter: blur(20px);
+                    border: 1px solid rgba(255, 174, 0, 0.3);
+                    border-radius: 16px;
+                    padding: 1.5rem;
+                    margin: 1rem 0;'>
+            <div style='font-size: 1.5rem; font-weight: 700; color: #ffae00; margin-bottom: 0.5rem;'>
+                ⚠️ WARNING
+            </div>
+            <div style='color: #ffffff; font-size: 1.1rem;'>
+                {suspicious_text}
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    fig.update_traces(
-        marker=dict(
-            line=dict(color='rgba(0,0,0,0.5)', width=1.5),
-            pattern_shape="/"
-        ),
-        texttemplate='<b>%{text}</b>',
-        textposition='outside',
-        hovertemplate='<b>%{x}</b><br>Count: %{y}<br><extra></extra>'
-    )
+        with st.expander("🔍 Investigation Suggestions"):
+            st.markdown("""
+            <div style='line-height: 1.8;'>
+                <ol style='color: #a0aec0;'>
+                    <li><strong style='color: #ffffff;'>Monitor:</strong> Increase monitoring for affected IPs</li>
+                    <li><strong style='color: #ffffff;'>Log Review:</strong> Check system logs for anomalies</li>
+                    <li><strong style='color: #ffffff;'>Traffic Analysis:</strong> Deep packet inspection recommended</li>
+                    <li><strong style='color: #ffffff;'>Pattern Analysis:</strong> Look for similar traffic patterns</li>
+                </ol>
+            </div>
+            """, unsafe_allow_html=True)
     
-    fig.update_layout(
-        height=450,
-        showlegend=False,
-        xaxis_title="<b>Threat Category</b>",
-        yaxis_title="<b>Count</b>",
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Outfit', color='#a0aec0', size=12),
-        title_font=dict(size=18, color='#ffffff', family='Outfit'),
-        xaxis=dict(
-            gridcolor='rgba(255,255,255,0.05)',
-            showline=True,
-            linecolor='rgba(255,255,255,0.1)',
-            linewidth=2,
-            tickfont=dict(size=13, color='#ffffff')
-        ),
-        yaxis=dict(
-            gridcolor='rgba(255,255,255,0.05)',
-            showline=True,
-            linecolor='rgba(255,255,255,0.1)',
-            linewidth=2,
-            tickfont=dict(size=12)
-        ),
-        margin=dict(l=60, r=40, t=60, b=60)
-    )
+    else:
+        st.markdown("""
+        <div style='background: linear-gradient(135deg, rgba(23, 183, 36, 0.2) 0%, rgba(23, 183, 36, 0.1) 100%);
+                    backdrop-filter: blur(20px);
+                    border: 1px solid rgba(23, 183, 36, 0.3);
+                    border-radius: 16px;
+                    padding: 1.5rem;
+                    margin: 1rem 0;'>
+            <div style='font-size: 1.5rem; font-weight: 700; color: #17b724; margin-bottom: 0.5rem;'>
+                ✅ ALL CLEAR
+            </div>
+            <div style='color: #ffffff; font-size: 1.1rem;'>
+                No threats detected in analyzed traffic - network appears secure
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    return fig
+    if alerts is not None:
+        render_alert_feed(alerts)
 
-def create_threat_timeline(df):
-    if 'time' in df.columns:
-        df['time'] = pd.to_datetime(df['time'])
-        timeline_df = df.groupby([df['time'].dt.floor('H'), 'prediction_label']).size().reset_index(name='count')
-        
-        fig = px.line(
-            timeline_df,
-            x='time',
-            y='count',
-            color='prediction_label',
-            title="<b>Threat Activity Timeline</b>",
-            color_discrete_map=COLOR_MAP,
-            markers=True
-        )
-        
-        fig.update_traces(
-            line=dict(width=3),
-            marker=dict(size=10, line=dict(width=2, color='rgba(0,0,0,0.5)')),
-            hovertemplate='<b>%{fullData.name}</b><br>Time: %{x}<br>Count: %{y}<extra></extra>'
-        )
-        
-        fig.update_layout(
-            height=450,
-            xaxis_title="<b>Time</b>",
-            yaxis_title="<b>Threat Count</b>",
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Outfit', color='#a0aec0', size=12),
-            title_font=dict(size=18, color='#ffffff', family='Outfit'),
-            xaxis=dict(
-                gridcolor='rgba(255,255,255,0.05)',
-                showline=True,
-                linecolor='rgba(255,255,255,0.1)',
-                linewidth=2,
-                tickfont=dict(size=12)
-            ),
-            yaxis=dict(
-                gridcolor='rgba(255,255,255,0.05)',
-                showline=True,
-                linecolor='rgba(255,255,255,0.1)',
-                linewidth=2,
-                tickfont=dict(size=12)
-            ),
-            legend=dict(
-                bgcolor='rgba(255,255,255,0.03)',
-                bordercolor='rgba(255,255,255,0.1)',
-                borderwidth=1,
-                font=dict(size=12)
-            ),
-            hovermode='x unified',
-            margin=dict(l=60, r=40, t=60, b=60)
-        )
-        
-        return fig
-    return None
+# ========================= 
+# Threat Hunting 
+# ========================= 
+HUNT_MAX_ROWS = 1000
+HUNT_LABELS = {'prediction_label': "Threat Level", 'proto': "Protocol", 'service': "Service", 'state': "State"}
+
+@st.cache_resource(max_entries=8)
+def get_batch_alerts(cache_key, threshold, window_minutes, rate_limit, _df, _probs):
+    return score_alerts(_df, _probs, class_map, threshold, window=pd.Timedelta(minutes=window_minutes),
+                        max_alerts_per_window=rate_limit)
+
+@st.cache_resource(max_entries=4)
+def get_flow_index(cache_key, _df):
+    # Built once per scored upload; the key already identifies the frame
+    return FlowIndex(_df)
+
+def render_threat_hunting(df, index):
+    st.markdown("### 🎯 Threat Hunting")
+    st.caption(f"Indexed {index.n_rows:,} flows in {index.build_seconds * 1000:,.0f} ms · {index.nbytes / 1024 / 1024:.1f} MB of indexes")
+    
+    categorical = {}
+    cat_cols = [c for c in HUNT_LABELS if c in index.categorical]
+    for col, column in zip(cat_cols, st.columns(max(len(cat_cols), 1))):
+        with column:
+            options = sorted(index.categorical[col])
+            selected = st.multiselect(HUNT_LABELS[col], options, key=f"hunt_{col}")
+            categorical[col] = selected
+    
+    ranges = {}
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if 'confidence' in index.ranges:
+            low, high = st.slider("Confidence", 0.0, 1.0, (0.0, 1.0), 0.01, key="hunt_confidence")
+            ranges['confidence'] = (None if low <= 0 else low, None if high >= 1 else high)
+    for col, label, column in [('sbytes', "Source Bytes", col2), ('dur', "Duration (s)", col3)]:
+        if col in index.ranges:
+            with column:
+                values = index.ranges[col][0]
+                finite = values[np.isfinite(values)]
+                top = float(finite[-1]) if len(finite) else 0.0
+                low = st.number_input(f"{label} ≥", min_value=0.0, value=0.0, key=f"hunt_{col}_low")
+                high = st.number_input(f"{label} ≤", min_value=0.0, value=top, key=f"hunt_{col}_high")
+                ranges[col] = (low if low > 0 else None, high if high < top else None)
+    
+    text = st.text_input("🔍 Free text (every term must prefix a token, e.g. `http fin`)", key="hunt_text",
+                         help=f"Searches {', '.join(index.token_cols) or 'no columns'}. On large uploads, near-unique columns such as timestamps are left out.")
+    
+    start = time.perf_counter()
+    rows = index.query(categorical=categorical, ranges=ranges, text=text)
+    query_ms = (time.perf_counter() - start) * 1000
+    
+    st.markdown(f"**{len(rows):,} of {index.n_rows:,} flows match** · query {query_ms:,.1f} ms")
+    matches = df.iloc[rows[:HUNT_MAX_ROWS]]
+    st.dataframe(matches, height=400, use_container_width=True)
+    if len(rows) > HUNT_MAX_ROWS:
+        st.caption(f"Showing the first {HUNT_MAX_ROWS:,} matches; download for all of them.")
+    
+    st.download_button(
+        "📥 Download Matches (CSV)",
+        lambda: csv_bytes(iter_frame_chunks(df.iloc[rows])),
+        file_name=f"netpulse_hunt_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+        mime="text/csv",
+        disabled=len(rows) == 0
+    )
+
+# ========================= 
+# Real-time Monitor 
+# ========================= 
+# New flows are read from a tailed file or a local socket, scored in
+# micro-batches sized to the latency target, and folded into the same running
+# aggregates streaming mode uses, so old rows are never re-read or re-scored.
+MONITOR_POLL_SECONDS = 2.0
+MONITOR_BUCKET = pd.Timedelta(minutes=1)
+MONITOR_RECENT_ALERTS = 50
+# A monitor whose browser session has been gone for two sweeps this far apart
+# is closed, so a tab shut without pressing Stop does not keep its port bound
+MONITOR_REAP_SECONDS = 30
+
+def close_monitor(monitor):
+    monitor['closed'] = True
+    monitor['source'].close()
+    remove_result_store(monitor['store_path'])
 
-def create_heatmap(df):
-    numerical_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    if len(numerical_cols) > 1:
-        corr_matrix = df[numerical_cols[:10]].corr()
+def reap_monitors(registry):
+    missing = set()
+    while True:
+        time.sleep(MONITOR_REAP_SECONDS)
+        if not runtime.exists():
+            continue
+        active = runtime.get_instance().is_active_session
+        with registry['lock']:
+            gone = {session_id for session_id in registry['monitors'] if not active(session_id)}
+            ended = [registry['monitors'].pop(session_id) for session_id in gone & missing]
+            missing = gone - missing
+        for monitor in ended:
+            close_monitor(monitor)
+
+@st.cache_resource
+def get_monitor_registry():
+    # Live monitors of every session by session id, watched by one reaper thread
+    registry = {'monitors': {}, 'lock': threading.Lock()}
+    threading.Thread(target=reap_monitors, args=(registry,), name="netpulse-monitor-reaper", daemon=True).start()
+    return registry
+
+def start_monitor(source_kind, target, from_start, latency_target):
+    if source_kind == "socket":
+        source = SocketListener(int(target))
+    else:
+        source = CsvTailer(target, from_start=from_start)
+    # A monitor this one replaces releases its source and result store first
+    stop_monitor()
+    store_dir = tempfile.mkdtemp(prefix="netpulse_monitor_", dir=STREAM_STORE_DIR)
+    st.session_state.monitor = {
+        'source': source,
+        'store_path': os.path.join(store_dir, "results.bin"),
+        'agg': new_stream_aggregates(os.path.join(store_dir, "results.bin")),
+        'batcher': MicroBatcher(latency_target),
+        'recent_alerts': None,
+        'alerts': AlertEngine(class_map, alert_threshold, pd.Timedelta(minutes=alert_window), alert_rate_limit),
+        'batches': 0,
+        'scoring_seconds': 0.0,
+        'started': time.time(),
+        'closed': False,
+    }
+    ctx = get_script_run_ctx()
+    if ctx is not None:
+        registry = get_monitor_registry()
+        with registry['lock']:
+            registry['monitors'][ctx.session_id] = st.session_state.monitor
+
+def stop_monitor():
+    monitor = st.session_state.pop('monitor', None)
+    if monitor:
+        ctx = get_script_run_ctx()
+        if ctx is not None:
+            registry = get_monitor_registry()
+            with registry['lock']:
+                registry['monitors'].pop(ctx.session_id, None)
+        if not monitor['closed']:
+            close_monitor(monitor)
+
+def poll_monitor(monitor, scorer):
+    # Score new rows until none are waiting or this tick's latency budget is spent
+    source, batcher, agg = monitor['source'], monitor['batcher'], monitor['agg']
+    # Slider changes apply to flows scored from now on
+    alerts = monitor['alerts']
+    alerts.threshold = alert_threshold
+    alerts.window_ns = pd.Timedelta(minutes=alert_window).value
+    alerts.max_alerts_per_window = alert_rate_limit
+    tick_start = time.perf_counter()
+    scored = 0
+    
+    while time.perf_counter() - tick_start < batcher.latency_target:
+        chunk = source.read(batcher.batch_rows())
+        if chunk is None:
+            break
         
-        fig = px.imshow(
-            corr_matrix,
-            title="<b>Feature Correlation Heatmap</b>",
-            color_continuous_scale='RdBu_r',
-            aspect='auto',
-            zmin=-1,
-            zmax=1,
-            text_auto='.2f'
-        )
+        start = time.perf_counter()
+        preds = scorer(chunk)
+        elapsed = time.perf_counter() - start
+        batcher.record(len(chunk), elapsed)
+        monitor['scoring_seconds'] += elapsed
+        monitor['batches'] += 1
         
-        fig.update_traces(
-            hovertemplate='<b>%{x}</b> × <b>%{y}</b><br>Correlation: %{z:.3f}<extra></extra>'
-        )
+        chunk.index = pd.RangeIndex(agg['total_flows'], agg['total_flows'] + len(chunk))
+        if 'time' not in chunk.columns:
+            chunk['time'] = pd.Timestamp.now()
+        times, keys = alert_inputs(agg, chunk)
+        with open(monitor['store_path'], "ab") as store:
+            write_result_records(store, chunk.index.to_numpy(), preds, times, keys)
+        alerts.process(preds, times=times.view('datetime64[ns]'), keys=flow_keys(chunk), rows=chunk.index.to_numpy())
         
-        fig.update_layout(
-            height=500,
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Outfit', color='#a0aec0', size=11),
-            title_font=dict(size=18, color='#ffffff', family='Outfit'),
-            xaxis=dict(tickfont=dict(size=11)),
-            yaxis=dict(tickfont=dict(size=11)),
-            margin=dict(l=100, r=40, t=60, b=100)
-        )
+        attach_predictions(chunk, preds, class_map)
+        update_stream_aggregates(agg, chunk, bucket=MONITOR_BUCKET)
         
-        return fig
-    return None
-
-def create_packet_sequence_viz(sequence):
-    seq_array = np.array(sequence)
-    
-    fig = go.Figure()
-    
-    # Packet Size Bars with gradient
-    fig.add_trace(go.Bar(
-        x=list(range(len(seq_array))),
-        y=seq_array[:, 0],
-        name='Packet Size',
-        marker=dict(
-            color=seq_array[:, 0],
-            colorscale='Viridis',
-            line=dict(color='rgba(0,0,0,0.3)', width=1)
-        ),
-        opacity=0.9,
-        hovertemplate='<b>Packet %{x}</b><br>Size: %{y:.2f} bytes<extra></extra>'
-    ))
-    
-    # Time Gap Line
-    fig.add_trace(go.Scatter(
-        x=list(range(len(seq_array))),
-        y=seq_array[:, 1] * 100,
-        name='Time Gap (scaled)',
-        yaxis='y2',
-        line=dict(color='#ff2a2a', width=4, shape='spline'),
-        mode='lines+markers',
-        marker=dict(size=8, line=dict(width=2, color='rgba(255,255,255,0.5)')),
-        fill='tozeroy',
-        fillcolor='rgba(255, 42, 42, 0.1)',
-        hovertemplate='<b>Packet %{x}</b><br>Time Gap: %{y:.2f} ms<extra></extra>'
-    ))
-    
-    fig.update_layout(
-        title="<b>Packet Sequence Analysis</b>",
-        height=450,
-        xaxis_title="<b>Packet Number</b>",
-        yaxis_title="<b>Packet Size (bytes)</b>",
-        yaxis2=dict(
-            title="<b>Time Gap (ms)</b>",
-            overlaying='y',
-            side='right',
-            gridcolor='rgba(255,255,255,0.05)',
-            tickfont=dict(size=12, color='#ff2a2a')
-        ),
-        showlegend=True,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Outfit', color='#a0aec0', size=12),
-        title_font=dict(size=18, color='#ffffff', family='Outfit'),
-        xaxis=dict(
-            gridcolor='rgba(255,255,255,0.05)',
-            showline=True,
-            linecolor='rgba(255,255,255,0.1)',
-            linewidth=2,
-            tickfont=dict(size=12)
-        ),
-        yaxis=dict(
-            gridcolor='rgba(255,255,255,0.05)',
-            showline=True,
-            linecolor='rgba(255,255,255,0.1)',
-            linewidth=2,
-            tickfont=dict(size=12, color='#17b724')
-        ),
-        legend=dict(
-            bgcolor='rgba(255,255,255,0.03)',
-            bordercolor='rgba(255,255,255,0.1)',
-            borderwidth=1,
-            font=dict(size=12),
-            x=0.02,
-            y=0.98
-        ),
-        hovermode='x unified',
-        margin=dict(l=60, r=80, t=60, b=60)
-    )
+        threats = chunk[chunk['prediction'] != 0].iloc[::-1]
+        if len(threats):
+            recent = threats if monitor['recent_alerts'] is None else pd.concat([threats, monitor['recent_alerts']])
+            monitor['recent_alerts'] = recent.head(MONITOR_RECENT_ALERTS)
+        scored += len(chunk)
     
-    return fig
+    return scored
 
-def create_threat_radar(df):
-    threat_stats = df.groupby('prediction_label').agg({
-        'spkts': 'mean',
-        'dpkts': 'mean',
-        'sbytes': 'mean',
-        'dbytes': 'mean',
-        'dur': 'mean'
-    }).reset_index()
+@st.fragment(run_every=MONITOR_POLL_SECONDS)
+def render_monitor_live():
+    monitor = st.session_state.get('monitor')
+    if monitor is None:
+        return
+    
+    scorer = (lambda chunk: cascade_score(chunk, cascade_cutoff)[0]) if cascade_mode else score_flows
+    scored = poll_monitor(monitor, scorer)
+    agg, batcher = monitor['agg'], monitor['batcher']
+    total_flows = agg['total_flows']
+    pred_counts = agg['class_counts']
+    avg_confidence = mean_confidence(agg)
     
-    categories = ['Source Pkts', 'Dest Pkts', 'Source Bytes', 'Dest Bytes', 'Duration']
-    original_categories = ['spkts', 'dpkts', 'sbytes', 'dbytes', 'dur']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Flows Scored", f"{total_flows:,}", f"+{scored:,} this tick", delta_color="off")
+    with col2:
+        rate = total_flows / monitor['scoring_seconds'] if monitor['scoring_seconds'] > 0 else 0
+        st.metric("Scoring Throughput", f"{rate:,.0f} flows/s")
+    with col3:
+        latency = f"{batcher.last_latency * 1000:,.0f} ms" if batcher.last_latency is not None else "—"
+        st.metric("Last Batch Latency", latency, f"target {batcher.latency_target * 1000:,.0f} ms", delta_color="off")
+    with col4:
+        st.metric("Next Batch Size", f"{batcher.batch_rows():,} rows")
+    render_inference_queue()
     
-    fig = go.Figure()
+    render_kpi_cards(pred_counts, total_flows, avg_confidence)
     
-    for threat in threat_stats['prediction_label'].unique():
-        values = threat_stats[threat_stats['prediction_label'] == threat][original_categories].values[0]
-        values = values / np.max(values) * 100 if np.max(values) > 0 else values
-        
-        color = COLOR_MAP.get(threat, '#ffffff')
-        
-        fig.add_trace(go.Scatterpolar(
-            r=values.tolist() + [values[0]],
-            theta=categories + [categories[0]],
-            name=threat,
-            fill='toself',
-            line=dict(color=color, width=3),
-            marker=dict(size=10, line=dict(width=2, color='rgba(255,255,255,0.3)')),
-            hovertemplate='<b>%{fullData.name}</b><br>%{theta}: %{r:.1f}<extra></extra>'
-        ))
+    if agg['timeline'] is not None and show_timeline:
+        fig_timeline = create_timeline_chart(timeline_frame(agg))
+        if fig_timeline:
+            st.plotly_chart(fig_timeline, use_container_width=True, config={'displayModeBar': False})
     
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],
-                gridcolor='rgba(255,255,255,0.1)',
-                tickfont=dict(color='#a0aec0', size=11),
-                linecolor='rgba(255,255,255,0.1)'
-            ),
-            angularaxis=dict(
-                gridcolor='rgba(255,255,255,0.1)',
-                tickfont=dict(color='#ffffff', size=12),
-                linecolor='rgba(255,255,255,0.1)'
-            ),
-            bgcolor='rgba(0,0,0,0)'
-        ),
-        title="<b>Threat Characteristics Radar</b>",
-        height=500,
-        paper_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Outfit', color='#a0aec0', size=12),
-        title_font=dict(size=18, color='#ffffff', family='Outfit'),
-        legend=dict(
-            bgcolor='rgba(255,255,255,0.03)',
-            bordercolor='rgba(255,255,255,0.1)',
-            borderwidth=1,
-            font=dict(size=12)
-        ),
-        margin=dict(l=80, r=80, t=80, b=80)
-    )
+    if monitor['recent_alerts'] is not None:
+        st.markdown(f"### 🚨 Latest {len(monitor['recent_alerts'])} Threats")
+        st.dataframe(monitor['recent_alerts'], height=300, use_container_width=True)
     
-    return fig
+    st.markdown("---")
+    render_alert_section(pred_counts, monitor['alerts'])
 
-def create_3d_scatter(df):
-    if 'spkts' in df.columns and 'dpkts' in df.columns and 'sbytes' in df.columns:
-        sample_df = df.head(200)
+def render_realtime_monitor():
+    st.markdown("### 📡 Real-time Monitor")
+    monitor = st.session_state.get('monitor')
+    if monitor is not None and monitor['closed']:
+        # Reaped while this session was disconnected
+        stop_monitor()
+        monitor = None
+    
+    if monitor is None:
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            source_kind = st.radio(
+                "Flow Source",
+                ["file", "socket"],
+                format_func=lambda kind: "📄 Growing CSV / flow log" if kind == "file" else "🔌 Local socket (CSV lines)"
+            )
+        with col2:
+            if source_kind == "file":
+                target = st.text_input("File Path", placeholder="/var/log/netpulse/flows.csv")
+                from_start = st.checkbox("Score existing rows first", value=False, help="Otherwise only rows appended from now on are scored")
+            else:
+                target = st.number_input("Port", min_value=1024, max_value=65535, value=9555, help="Send a CSV header line, then one flow per line")
+                from_start = False
+        latency_ms = st.slider("Latency Target (ms)", 100, 5000, 1000, 100, help="Micro-batches are sized so scoring one stays near this")
         
-        fig = px.scatter_3d(
-            sample_df,
-            x='spkts',
-            y='dpkts',
-            z='sbytes',
-            color='prediction_label',
-            title="<b>3D Traffic Pattern Analysis</b>",
-            color_discrete_map=COLOR_MAP,
-            opacity=0.8,
-            size_max=10,
-            hover_data=['confidence']
-        )
+        if st.button("▶️ Start Monitoring", disabled=not fusion or not target):
+            try:
+                start_monitor(source_kind, target, from_start, latency_ms / 1000)
+            except (OSError, ValueError) as e:
+                st.error(f"❌ Could not start monitor: {str(e)}")
+            else:
+                st.rerun()
+        return
+    
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        uptime = pd.Timedelta(seconds=int(time.time() - monitor['started']))
+        st.info(f"🟢 Live: {monitor['source'].describe()} · up {uptime} · refreshes every {MONITOR_POLL_SECONDS:.0f}s")
+    with col2:
+        if st.button("⏹️ Stop Monitoring"):
+            stop_monitor()
+            st.rerun()
+    
+    render_monitor_live()
+
+# ========================= 
+# Performance Panel 
+# ========================= 
+def render_inference_queue():
+    # Shared by every session, so these reflect all current scoring traffic
+    if inference_batcher is None:
+        return
+    stats = inference_batcher.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Inference Queue", f"{stats['queue_depth']:,} requests", f"{stats['queued_rows']:,} rows", delta_color="off")
+    with col2:
+        st.metric("Avg Batch", f"{stats['mean_batch_rows']:,.0f} rows",
+                  f"{stats['mean_requests_per_batch']:.1f} requests/batch", delta_color="off")
+    with col3:
+        st.metric("Avg Queue Wait", f"{stats['mean_wait_ms']:,.1f} ms", f"peak {stats['peak_wait_ms']:,.1f} ms", delta_color="off")
+    with col4:
+        st.metric("Batches Run", f"{stats['batches']:,}", f"{stats['requests']:,} requests", delta_color="off")
+
+def render_sequence_cache():
+    # Cumulative over every session since the model was loaded; worker processes keep their own
+    cache = artifacts.sequence_cache if artifacts else None
+    if cache is None:
+        return
+    stats = cache.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Sequence Hit Rate", f"{stats['hit_rate']:.1%}", f"{stats['hits']:,} rows reused", delta_color="off")
+    with col2:
+        st.metric("Sequences Built", f"{stats['built']:,}", f"of {stats['rows']:,} rows", delta_color="off")
+    with col3:
+        st.metric("Templates Cached", f"{stats['templates']:,}", f"max {stats['max_templates']:,}", delta_color="off")
+    with col4:
+        st.metric("Template Evictions", f"{stats['evictions']:,}")
+
+def render_performance_panel(perf, profiler, n_rows):
+    summary = perf.summary()
+    total = perf.total_seconds
+    
+    with st.expander("⏱️ Performance", expanded=False):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Timed Total", f"{total:.2f}s")
+        with col2:
+            st.metric("Spans", f"{len(perf.spans)}")
+        with col3:
+            st.metric("End-to-End", f"{n_rows / total:,.0f} flows/s" if total > 0 else "—")
+        with col4:
+            if dedup_stats['unique']:
+                st.metric("Dedup Ratio", f"{dedup_stats['rows'] / dedup_stats['unique']:,.2f}x",
+                          f"{dedup_stats['unique']:,} distinct of {dedup_stats['rows']:,}", delta_color="off")
+            else:
+                st.metric("Dedup Ratio", "—")
+        render_inference_queue()
+        render_sequence_cache()
         
-        fig.update_traces(
-            marker=dict(
-                size=6,
-                line=dict(width=0.8, color='rgba(0,0,0,0.5)')
-            ),
-            hovertemplate='<b>%{fullData.name}</b><br>Src Pkts: %{x}<br>Dst Pkts: %{y}<br>Src Bytes: %{z}<br>Confidence: %{customdata[0]:.2%}<extra></extra>'
+        table = pd.DataFrame(summary, columns=['name', 'calls', 'seconds', 'rows', 'flows_per_sec'])
+        table['share'] = table['seconds'] / total * 100 if total > 0 else 0.0
+        st.dataframe(
+            table.sort_values('seconds', ascending=False),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'name': "Stage",
+                'calls': "Calls",
+                'seconds': st.column_config.NumberColumn("Seconds", format="%.4f"),
+                'rows': "Rows",
+                'flows_per_sec': st.column_config.NumberColumn("Flows/s", format="%.0f"),
+                'share': st.column_config.ProgressColumn("Share", format="%.1f%%", min_value=0, max_value=100),
+            }
         )
         
-        fig.update_layout(
-            height=600,
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family='Outfit', color='#a0aec0', size=12),
-            title_font=dict(size=18, color='#ffffff', family='Outfit'),
-            scene=dict(
-                bgcolor='rgba(0,0,0,0)',
-                xaxis=dict(
-                    backgroundcolor='rgba(0,0,0,0)',
-                    gridcolor='rgba(255,255,255,0.1)',
-                    title=dict(text='<b>Source Packets</b>', font=dict(size=13, color='#ffffff')),
-                    tickfont=dict(size=11, color='#a0aec0')
-                ),
-                yaxis=dict(
-                    backgroundcolor='rgba(0,0,0,0)',
-                    gridcolor='rgba(255,255,255,0.1)',
-                    title=dict(text='<b>Dest Packets</b>', font=dict(size=13, color='#ffffff')),
-                    tickfont=dict(size=11, color='#a0aec0')
-                ),
-                zaxis=dict(
-                    backgroundcolor='rgba(0,0,0,0)',
-                    gridcolor='rgba(255,255,255,0.1)',
-                    title=dict(text='<b>Source Bytes</b>', font=dict(size=13, color='#ffffff')),
-                    tickfont=dict(size=11, color='#a0aec0')
-                )
-            ),
-            legend=dict(
-                bgcolor='rgba(255,255,255,0.03)',
-                bordercolor='rgba(255,255,255,0.1)',
-                borderwidth=1,
-                font=dict(size=12)
-            ),
-            margin=dict(l=0, r=0, t=60, b=0)
+        st.download_button(
+            "📥 Export Timings (JSON)",
+            perf.to_json(rows=n_rows, dedup=dedup_stats, captured_at=datetime.now().isoformat(timespec='seconds')),
+            file_name=f"netpulse_timings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
         )
         
-        return fig
-    return None
+        if profiler.enabled:
+            report = profiler.report()
+            st.markdown("**cProfile (top 40 by cumulative time)**")
+            st.code(report, language=None)
+            st.download_button(
+                "📥 Download Profile (TXT)",
+                report,
+                file_name=f"netpulse_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+                mime="text/plain"
+            )
 
 # ========================= 
 # Main Content 
 # ========================= 
-uploaded = st.file_uploader("", type=["csv"], help="Upload your network traffic data in CSV format")
+UPLOAD_TYPES = ["csv", "parquet", "pq", "feather", "arrow", "ipc"]
+
+monitor_mode = detection_mode == "Real-time Monitor"
+if not monitor_mode:
+    stop_monitor()
+uploaded = None if monitor_mode else st.file_uploader(
+    "", type=UPLOAD_TYPES,
+    help="Upload your network traffic data as CSV, Parquet or Feather/Arrow IPC"
+)
+upload_fmt = input_format(uploaded.name) if uploaded else None
+
+if uploaded or monitor_mode or artifact_loader.done():
+    with nullcontext() if artifact_loader.done() else st.spinner("⏳ Loading detection model..."):
+        artifacts = wait_for_artifacts(artifact_loader)
+    if artifacts:
+        if INFERENCE_BATCH_ROWS > 0:
+            artifacts, inference_batcher = get_batched_artifacts(ARTIFACT_FINGERPRINT, artifacts)
+        fusion, scaler3, class_map, config = artifacts.fusion, artifacts.scaler3, artifacts.class_map, artifacts.config
+        SEQ_LEN = config.get("SEQ_LEN", 50)
+
+perf = StageTimer()
+# Rows scored and distinct model inputs among them, when deduplicating
+dedup_stats = {'rows': 0, 'unique': 0}
+profiler = Profiler(enabled=bool(uploaded) and profile_run).start()
 
-if uploaded:
-    df = pd.read_csv(uploaded)
-    st.session_state.original_df = df.copy()
+if monitor_mode:
+    render_realtime_monitor()
+
+elif uploaded and streaming_mode:
+    if not fusion:
+        st.error("❌ Model not loaded properly. Please check your model file.")
+        st.stop()
+    
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    file_size = max(uploaded.size, 1)
+    
+    def report_progress(agg):
+        status_text.text(f"🔄 Scored {agg['total_flows']:,} flows...")
+        # Columnar uploads are read from an in-memory buffer, so only CSV moves tell()
+        if upload_fmt == 'csv':
+            progress_bar.progress(min(uploaded.tell() / file_size, 1.0))
+    
+    score_mode = cascade_score_mode("stream:") if cascade_mode else "stream"
+    digest = upload_digest(uploaded.getvalue())
+    cache_key = result_cache_key(digest, score_mode)
+    with perf.span("result cache lookup"):
+        agg = result_cache_get(cache_key)
+        if agg is not None and not os.path.exists(agg['store_path']):
+            agg = None
+    if agg is None:
+        with perf.span("prediction cache lookup"):
+            stored = load_cached_predictions(f"{digest}:{score_mode}")
+        # Per-chunk cascade stats, summed over the upload
+        cascade_totals = [None]
+        
+        def score_cascade_chunk(chunk):
+            preds, stats = cascade_score(chunk, cascade_cutoff, measure_agreement)
+            if stats:
+                cascade_totals[0] = merge_cascade_stats(cascade_totals[0], stats)
+            return preds
+        
+        scorer = score_cascade_chunk if cascade_mode else score_flows
+        with st.spinner("🔍 Streaming network traffic..."), perf.span("streamed scoring") as span:
+            agg = stream_score_upload(
+                uploaded, int(chunk_rows), stream_store_path(cache_key), upload_fmt, on_progress=report_progress,
+                cached_probs=stored['probs'] if stored else None, scorer=scorer
+            )
+            span['rows'] = agg['total_flows']
+        if stored is None:
+            agg['cascade_stats'] = cascade_totals[0]
+            store_cached_predictions(f"{digest}:{score_mode}", read_result_store(agg['store_path'])['probs'],
+                                     agg['cascade_stats'])
+        else:
+            agg['cascade_stats'] = stored['stats']
+        result_cache_put(cache_key, agg)
+    
+    progress_bar.empty()
+    status_text.empty()
+    
+    total_flows = agg['total_flows']
+    pred_counts = agg['class_counts']
+    avg_confidence = mean_confidence(agg)
+    st.session_state.summary_stats = {
+        'total_flows': total_flows,
+        'malicious_count': pred_counts.get('Malicious', 0),
+        'suspicious_count': pred_counts.get('Suspicious', 0),
+        'normal_count': pred_counts.get('Normal', 0),
+        'avg_confidence': avg_confidence
+    }
     
-    # File info cards
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
     col1, col2, col3, col4 = st.columns(4)
+    store_mb = os.path.getsize(agg['store_path']) / 1024 / 1024
+    for col, title, value in [
+        (col1, "TOTAL FLOWS", f"{total_flows:,}"),
+        (col2, "FEATURES", f"{agg['n_columns']}"),
+        (col3, "TIME DATA", "Available" if agg['has_time'] else "N/A"),
+        (col4, "RESULT STORE", f"{store_mb:.1f} MB"),
+    ]:
+        with col:
+            st.markdown(f"""
+            <div class='metric-card'>
+                <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>{title}</div>
+                <div style='font-size: 1.5rem; font-weight: 700; color: #ffffff;'>{value}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.success(f"✅ File streamed successfully: **{uploaded.name}** → `{agg['store_path']}`")
+    if detection_mode == "Threat Hunting":
+        st.info("🎯 Threat Hunting needs the scored flows in memory; turn off Streaming Mode to hunt over this upload.")
+    render_detection_summary(pred_counts, total_flows)
+    
+    if agg['cascade_stats']:
+        render_cascade_stats(agg['cascade_stats'])
+    
+    if auto_export:
+        data = uploaded.getvalue()
+        render_export_status(get_exporter().submit(
+            cache_key, lambda: iter_stream_results(data, upload_fmt, agg['store_path'], int(chunk_rows)),
+            export_dir, export_name(uploaded.name, digest, score_mode), export_format
+        ))
+    
+    tab1, tab2, tab3 = st.tabs([
+        "📊 Overview Dashboard",
+        "📈 Visualizations",
+        "🚨 Threat Details"
+    ])
+    
+    with tab1:
+        render_kpi_cards(pred_counts, total_flows, avg_confidence)
+        st.markdown("---")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(perf.timed(create_pie_chart)(pred_counts[pred_counts > 0]), use_container_width=True, config={'displayModeBar': False})
+        with col2:
+            st.plotly_chart(perf.timed(create_bar_chart)(pred_counts), use_container_width=True, config={'displayModeBar': False})
+        
+        if agg['timeline'] is not None and show_timeline:
+            fig_timeline = perf.timed(create_timeline_chart)(timeline_frame(agg))
+            if fig_timeline:
+                st.plotly_chart(fig_timeline, use_container_width=True, config={'displayModeBar': False})
+    
+    with tab2:
+        col1, col2 = st.columns(2)
+        with col1:
+            if agg['proto_counts'] is not None:
+                st.plotly_chart(perf.timed(create_protocol_chart)(top_protocols(agg)), use_container_width=True, config={'displayModeBar': False})
+        with col2:
+            st.plotly_chart(perf.timed(create_confidence_bins_chart)(CONF_BINS, agg['conf_hist']), use_container_width=True, config={'displayModeBar': False})
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if agg['radar_sums'] is not None:
+                st.plotly_chart(perf.timed(create_radar_chart)(radar_stats(agg)), use_container_width=True, config={'displayModeBar': False})
+        with col2:
+            if show_heatmap:
+                fig_heatmap = perf.timed(create_heatmap_chart)(corr_matrix(agg))
+                if fig_heatmap:
+                    st.plotly_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False})
+    
+    with tab3:
+        threat_filter = st.multiselect(
+            "🎯 Filter by Threat Type:",
+            ["Normal", "Suspicious", "Malicious"],
+            default=["Malicious", "Suspicious"]
+        )
+        top_threats = agg['top_threats']
+        top_threats = top_threats[top_threats['prediction_label'].isin(threat_filter)]
+        top_threats = top_threats.sort_values('confidence', ascending=False).head(STREAM_TOP_THREATS)
+        st.markdown(f"### 🔍 Top {len(top_threats)} Threats")
+        render_threat_cards(top_threats, [c for c in top_threats.columns if c not in RESULT_COLS])
+    
+    st.markdown("---")
+    with perf.span("alerting", total_flows):
+        alerts = get_stream_alerts(cache_key, alert_threshold, alert_window, alert_rate_limit, agg)
+    render_alert_section(pred_counts, alerts)
+    
+    profiler.stop()
+    render_performance_panel(perf, profiler, total_flows)
+
+elif uploaded:
+    score_mode = cascade_score_mode() if cascade_mode else "batch"
+    digest = upload_digest(uploaded.getvalue())
+    cache_key = result_cache_key(digest, score_mode)
+    with perf.span("result cache lookup"):
+        cached = result_cache_get(cache_key)
+    if cached is None:
+        with perf.span(f"{upload_fmt} read") as span:
+            df = read_flows(uploaded, columns=upload_columns(), fmt=upload_fmt)
+            span['rows'] = len(df)
+        with perf.span("compact dtypes", len(df)):
+            df.attrs['input_nbytes'] = int(df.memory_usage(deep=True).sum())
+            # Model inputs keep their read precision, so scores match netpulse-score
+            compact_dtypes(df, keep=[*IDENTITY_COLS, *(input_columns(scaler3) or [])])
+    else:
+        df = cached[0]
+    
+    # File info cards
+    st.markdown('<div class="fade-in">', unsafe_allow_html=True)
+    col1, col2, col3, col4, col5 = st.columns(5)
     
     with col1:
         st.markdown("""
@@ -1464,7 +2393,7 @@ if uploaded:
             <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>FEATURES</div>
             <div style='font-size: 2rem; font-weight: 700; color: #ffffff;'>{}</div>
         </div>
-        """.format(len(df.columns)), unsafe_allow_html=True)
+        """.format(len([c for c in df.columns if c not in RESULT_COLS])), unsafe_allow_html=True)
     
     with col3:
         time_range = "N/A" if 'time' not in df.columns else "Available"
@@ -1477,12 +2406,18 @@ if uploaded:
     
     with col4:
         memory_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+        input_mb = df.attrs.get('input_nbytes', 0) / 1024 / 1024
         st.markdown("""
         <div class='metric-card'>
             <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>MEMORY</div>
             <div style='font-size: 1.5rem; font-weight: 700; color: #ffffff;'>{:.1f} MB</div>
+            <div style='font-size: 0.75rem; color: #a0aec0;'>{:.1f} MB as read</div>
         </div>
-        """.format(memory_mb), unsafe_allow_html=True)
+        """.format(memory_mb, input_mb), unsafe_allow_html=True)
+    
+    with col5:
+        # Filled once scoring has produced this session's results
+        session_card = st.empty()
     
     st.markdown('</div>', unsafe_allow_html=True)
     
@@ -1493,78 +2428,119 @@ if uploaded:
     status_text = st.empty()
     
     with st.spinner("🔍 Analyzing network traffic..."):
-        status_text.text("🔄 Preprocessing data...")
-        progress_bar.progress(20)
-        
-        flows = df.copy()
-        
-        # Encode categorical columns
-        cat_cols = ['proto', 'service', 'state']
-        for col in cat_cols:
-            if col in flows.columns:
-                le = LabelEncoder()
-                flows[col] = le.fit_transform(flows[col].astype(str))
-        
-        status_text.text("🔄 Removing unnecessary columns...")
-        progress_bar.progress(40)
-        
-        drop_cols = ['id', 'attack_cat', 'label', 'class3']
-        flows = flows.drop(columns=drop_cols, errors='ignore')
-        
-        if scaler3 and hasattr(scaler3, 'feature_names_in_'):
-            expected_features = scaler3.feature_names_in_
-            flows = flows.reindex(columns=expected_features)
-        
-        status_text.text("🔄 Building packet sequences...")
-        progress_bar.progress(60)
-        
-        sequences = np.array([flow_to_sequence(r) for _, r in df.iterrows()])
-        
-        status_text.text("🔄 Scaling features...")
-        progress_bar.progress(70)
-        
-        if scaler3:
-            flows_scaled = scaler3.transform(flows)
-        
-        status_text.text("🤖 Running AI prediction...")
-        progress_bar.progress(80)
-        
-        if fusion:
-            preds = fusion.predict([flows_scaled, sequences], verbose=0)
-            confidence_scores = np.max(preds, axis=1)
-            pred_classes = preds.argmax(axis=1)
+        if cached is None:
+            with perf.span("prediction cache lookup"):
+                stored = load_cached_predictions(f"{digest}:{score_mode}")
+            cascade_stats = None
+            n_rows = len(df)
             
-            df['prediction'] = pred_classes
-            df['prediction_label'] = df['prediction'].map(class_map)
-            df['confidence'] = confidence_scores
-            df['threat_score'] = df['prediction'].apply(lambda x: 0 if x == 0 else 0.5 if x == 1 else 1.0)
-            
-            status_text.text("✅ Analysis complete!")
-            progress_bar.progress(100)
+            if stored is not None:
+                preds, cascade_stats = stored['probs'], stored['stats']
+            elif cascade_mode and fusion:
+                status_text.text("🪜 Screening flows with the level-1 model...")
+                
+                with perf.span("cascade scoring", n_rows):
+                    preds, cascade_stats = cascade_score(df, cascade_cutoff, measure_agreement)
+            elif scoring_workers > 1 and fusion:
+                status_text.text(f"🤖 Scoring across {scoring_workers} worker processes...")
+                
+                with perf.span("parallel scoring", n_rows):
+                    preds = score_flows(df)
+            elif fusion:
+                # Progress advances as each stage completes
+                stages = 5
+                inverse = None
+                
+                status_text.text("🔄 Encoding categorical features...")
+                with perf.span("categorical encoding", n_rows):
+                    flows = encode_categoricals(df.copy(), artifacts.categories)
+                progress_bar.progress(1 / stages)
+                
+                status_text.text("🔄 Aligning feature columns...")
+                with perf.span("reindex", n_rows):
+                    flows = align_features(flows, scaler3)
+                progress_bar.progress(2 / stages)
+                
+                columns = sequence_columns(df)
+                if dedup_flows:
+                    status_text.text("🔄 Deduplicating flows...")
+                    with perf.span("dedup", n_rows):
+                        flows, columns, inverse = dedup_inputs(flows, columns, dedup_stats)
+                
+                status_text.text("🔄 Building packet sequences...")
+                with perf.span("flow_to_sequence", len(flows)):
+                    sequences = artifacts.build_sequences(columns)
+                progress_bar.progress(3 / stages)
+                
+                status_text.text("🔄 Scaling features...")
+                with perf.span("scaler3.transform", len(flows)):
+                    flows_scaled = scaler3.transform(flows)
+                progress_bar.progress(4 / stages)
+                
+                status_text.text("🤖 Running AI prediction...")
+                with perf.span("fusion.predict", len(flows)):
+                    preds = artifacts.predict(flows_scaled, sequences)
+                    if inverse is not None:
+                        preds = preds[inverse]
+                progress_bar.progress(5 / stages)
             
-            time.sleep(0.5)
+            if fusion:
+                if stored is None:
+                    with perf.span("prediction cache store"):
+                        store_cached_predictions(f"{digest}:{score_mode}", preds, cascade_stats)
+                with perf.span("attach predictions", n_rows):
+                    attach_predictions(df, preds, class_map)
+                # Every chart draws from these, so reruns never go back over the rows
+                with perf.span("chart aggregates", n_rows):
+                    charts = chart_aggregates(df, class_labels())
+                
+                progress_bar.empty()
+                status_text.empty()
+                
+                preds = np.asarray(preds, dtype=np.float32)
+                result_cache_put(cache_key, (df, cascade_stats, preds, charts))
+        else:
+            df, cascade_stats, preds, charts = cached
             progress_bar.empty()
             status_text.empty()
-            
-            pred_counts = df['prediction_label'].value_counts()
+        
+        if fusion:
+            session_card.markdown("""
+            <div class='metric-card'>
+                <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>SESSION MEMORY</div>
+                <div style='font-size: 1.5rem; font-weight: 700; color: #ffffff;'>{:.1f} MB</div>
+                <div style='font-size: 0.75rem; color: #a0aec0;'>results + session state</div>
+            </div>
+            """.format(session_memory_mb(df, preds)), unsafe_allow_html=True)
+        
+        if fusion:
+            pred_counts = sorted_class_counts(charts)
+            avg_confidence = mean_confidence(charts)
             st.session_state.summary_stats = {
                 'total_flows': len(df),
                 'malicious_count': pred_counts.get('Malicious', 0),
                 'suspicious_count': pred_counts.get('Suspicious', 0),
                 'normal_count': pred_counts.get('Normal', 0),
-                'avg_confidence': df['confidence'].mean()
+                'avg_confidence': avg_confidence
             }
             
             # Success message with stats
-            malicious_count = pred_counts.get('Malicious', 0)
-            suspicious_count = pred_counts.get('Suspicious', 0)
+            render_detection_summary(pred_counts, len(df))
             
-            if malicious_count > 0:
-                st.error(f"🚨 **ALERT:** Found **{malicious_count}** malicious and **{suspicious_count}** suspicious flows")
-            elif suspicious_count > 0:
-                st.warning(f"⚠️ **WARNING:** Found **{suspicious_count}** suspicious flows")
-            else:
-                st.success(f"✅ **ALL CLEAR:** No threats detected in {len(df):,} analyzed flows")
+            if auto_export:
+                render_export_status(get_exporter().submit(
+                    cache_key, lambda: iter_frame_chunks(df),
+                    export_dir, export_name(uploaded.name, digest, score_mode), export_format
+                ))
+            
+            if cascade_stats:
+                render_cascade_stats(cascade_stats)
+            
+            if detection_mode == "Threat Hunting":
+                with perf.span("flow index", len(df)):
+                    flow_index = get_flow_index(cache_key, df)
+                render_threat_hunting(df, flow_index)
+                st.markdown("---")
             
             # ========================= 
             # Tabs for different views 
@@ -1581,57 +2557,7 @@ if uploaded:
                 st.markdown('<div class="fade-in">', unsafe_allow_html=True)
                 
                 # KPI Cards
-                col1, col2, col3, col4 = st.columns(4)
-                
-                total_threats = pred_counts.get('Malicious', 0) + pred_counts.get('Suspicious', 0)
-                threat_severity = (pred_counts.get('Malicious', 0) / len(df) * 100) if len(df) > 0 else 0
-                avg_confidence = df['confidence'].mean() * 100
-                
-                if pred_counts.get('Malicious', 0) > 0:
-                    risk_level = "HIGH"
-                    risk_color = "#ff2a2a"
-                elif pred_counts.get('Suspicious', 0) > 0:
-                    risk_level = "MEDIUM"
-                    risk_color = "#ffae00"
-                else:
-                    risk_level = "LOW"
-                    risk_color = "#17b724"
-                
-                with col1:
-                    st.markdown(f"""
-                    <div class='metric-card'>
-                        <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>TOTAL THREATS</div>
-                        <div style='font-size: 2.5rem; font-weight: 700; color: #ff2a2a;'>{total_threats}</div>
-                        <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>Malicious + Suspicious</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col2:
-                    st.markdown(f"""
-                    <div class='metric-card'>
-                        <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>THREAT SEVERITY</div>
-                        <div style='font-size: 2.5rem; font-weight: 700; color: #ff2a2a;'>{threat_severity:.1f}%</div>
-                        <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>of total traffic</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col3:
-                    st.markdown(f"""
-                    <div class='metric-card'>
-                        <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>AVG CONFIDENCE</div>
-                        <div style='font-size: 2.5rem; font-weight: 700; color: #17b724;'>{avg_confidence:.1f}%</div>
-                        <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>detection accuracy</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                
-                with col4:
-                    st.markdown(f"""
-                    <div class='metric-card'>
-                        <div style='font-size: 0.85rem; color: #a0aec0; margin-bottom: 0.5rem;'>RISK LEVEL</div>
-                        <div style='font-size: 2.5rem; font-weight: 700; color: {risk_color};'>{risk_level}</div>
-                        <div style='font-size: 0.75rem; color: #a0aec0; margin-top: 0.5rem;'>security status</div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                render_kpi_cards(pred_counts, len(df), avg_confidence)
                 
                 st.markdown("---")
                 
@@ -1640,20 +2566,20 @@ if uploaded:
                 
                 with col1:
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_pie = create_pie_chart(pred_counts)
+                    fig_pie = perf.timed(create_pie_chart)(pred_counts[pred_counts > 0])
                     st.plotly_chart(fig_pie, use_container_width=True, config={'displayModeBar': False})
                     st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col2:
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_bar = create_bar_chart(pred_counts)
+                    fig_bar = perf.timed(create_bar_chart)(pred_counts)
                     st.plotly_chart(fig_bar, use_container_width=True, config={'displayModeBar': False})
                     st.markdown('</div>', unsafe_allow_html=True)
                 
                 # Timeline
-                if 'time' in df.columns and show_timeline:
+                if charts['timeline'] is not None and show_timeline:
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_timeline = create_threat_timeline(df)
+                    fig_timeline = perf.timed(create_timeline_chart)(timeline_frame(charts))
                     if fig_timeline:
                         st.plotly_chart(fig_timeline, use_container_width=True, config={'displayModeBar': False})
                     st.markdown('</div>', unsafe_allow_html=True)
@@ -1666,84 +2592,19 @@ if uploaded:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    if 'proto' in df.columns:
-                        proto_counts = df['proto'].value_counts().head(10)
+                    if charts['proto_counts'] is not None:
                         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                        fig_proto = px.bar(
-                            x=proto_counts.index,
-                            y=proto_counts.values,
-                            title="<b>Top Protocols</b>",
-                            color=proto_counts.values,
-                            color_continuous_scale='Viridis',
-                            labels={'x': 'Protocol', 'y': 'Count'},
-                            text=proto_counts.values
-                        )
-                        fig_proto.update_traces(
-                            texttemplate='%{text}',
-                            textposition='outside',
-                            hovertemplate='<b>Protocol %{x}</b><br>Count: %{y}<extra></extra>'
-                        )
-                        fig_proto.update_layout(
-                            height=450,
-                            paper_bgcolor='rgba(0,0,0,0)',
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            font=dict(family='Outfit', color='#a0aec0', size=12),
-                            title_font=dict(size=18, color='#ffffff', family='Outfit'),
-                            xaxis=dict(
-                                gridcolor='rgba(255,255,255,0.05)',
-                                tickfont=dict(size=12)
-                            ),
-                            yaxis=dict(
-                                gridcolor='rgba(255,255,255,0.05)',
-                                tickfont=dict(size=12)
-                            ),
-                            margin=dict(l=60, r=40, t=60, b=60)
-                        )
+                        fig_proto = perf.timed(create_protocol_chart)(top_protocols(charts))
                         st.plotly_chart(fig_proto, use_container_width=True, config={'displayModeBar': False})
                         st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col2:
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_conf = px.histogram(
-                        df,
-                        x='confidence',
-                        color='prediction_label',
-                        title="<b>Confidence Score Distribution</b>",
-                        color_discrete_map=COLOR_MAP,
-                        nbins=30,
-                        marginal="box"
-                    )
-                    fig_conf.update_traces(
-                        hovertemplate='Confidence: %{x:.2%}<br>Count: %{y}<extra></extra>'
-                    )
-                    fig_conf.update_layout(
-                        height=450,
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        font=dict(family='Outfit', color='#a0aec0', size=12),
-                        title_font=dict(size=18, color='#ffffff', family='Outfit'),
-                        xaxis=dict(
-                            gridcolor='rgba(255,255,255,0.05)',
-                            tickfont=dict(size=12),
-                            title='<b>Confidence Score</b>'
-                        ),
-                        yaxis=dict(
-                            gridcolor='rgba(255,255,255,0.05)',
-                            tickfont=dict(size=12),
-                            title='<b>Count</b>'
-                        ),
-                        legend=dict(
-                            bgcolor='rgba(255,255,255,0.03)',
-                            bordercolor='rgba(255,255,255,0.1)',
-                            borderwidth=1,
-                            font=dict(size=12)
-                        ),
-                        margin=dict(l=60, r=40, t=60, b=60)
-                    )
+                    fig_conf = perf.timed(create_confidence_bins_chart)(CONF_BINS, charts['conf_hist'])
                     st.plotly_chart(fig_conf, use_container_width=True, config={'displayModeBar': False})
                     st.markdown('</div>', unsafe_allow_html=True)
                 
-                if show_sequence_viz and len(sequences) > 0:
+                if show_sequence_viz and len(df) > 0:
                     st.markdown("---")
                     st.markdown("### 📦 Packet Sequence Analysis")
                     
@@ -1752,7 +2613,7 @@ if uploaded:
                         seq_idx = st.slider(
                             "Select Flow Index",
                             0,
-                            min(100, len(sequences)-1),
+                            min(100, len(df)-1),
                             0
                         )
                     with col2:
@@ -1766,7 +2627,7 @@ if uploaded:
                             """, unsafe_allow_html=True)
                     
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_seq = create_packet_sequence_viz(sequences[seq_idx])
+                    fig_seq = perf.timed(create_packet_sequence_viz)(flows_to_sequences(*sequence_columns(df.iloc[[seq_idx]]), seq_len=SEQ_LEN)[0])
                     st.plotly_chart(fig_seq, use_container_width=True, config={'displayModeBar': False})
                     st.markdown('</div>', unsafe_allow_html=True)
                 
@@ -1778,22 +2639,23 @@ if uploaded:
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_radar = create_threat_radar(df)
-                    st.plotly_chart(fig_radar, use_container_width=True, config={'displayModeBar': False})
-                    st.markdown('</div>', unsafe_allow_html=True)
+                    if charts['radar_sums'] is not None:
+                        st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+                        fig_radar = perf.timed(create_radar_chart)(radar_stats(charts))
+                        st.plotly_chart(fig_radar, use_container_width=True, config={'displayModeBar': False})
+                        st.markdown('</div>', unsafe_allow_html=True)
                 
                 with col2:
                     if show_heatmap:
                         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                        fig_heatmap = create_heatmap(df)
+                        fig_heatmap = perf.timed(create_heatmap_chart)(corr_matrix(charts))
                         if fig_heatmap:
                             st.plotly_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False})
                         st.markdown('</div>', unsafe_allow_html=True)
                 
                 if show_3d:
                     st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                    fig_3d = create_3d_scatter(df)
+                    fig_3d = perf.timed(create_3d_scatter)(df)
                     if fig_3d:
                         st.plotly_chart(fig_3d, use_container_width=True, config={'displayModeBar': True})
                     st.markdown('</div>', unsafe_allow_html=True)
@@ -1843,48 +2705,13 @@ if uploaded:
                     
                     st.markdown(f"### 🔍 Top {len(threat_df_sorted)} Threats")
                     
-                    for idx, row in threat_df_sorted.iterrows():
-                        threat_level = row['prediction_label']
-                        confidence = row['confidence']
-                        threat_class = threat_level.lower()
-                        color = COLOR_MAP[threat_level]
-                        
-                        confidence_pct = confidence * 100
-                        
-                        st.markdown(f"""
-                        <div class='threat-container threat-container-{threat_class}'>
-                            <div class='threat-header'>
-                                <div>
-                                    <span class='threat-badge threat-{threat_class}'>{threat_level}</span>
-                                    <span style='color: #a0aec0; font-size: 0.85rem; margin-left: 1rem;'>
-                                        Flow ID: {idx}
-                                    </span>
-                                </div>
-                                <div style='font-size: 1.2rem; font-weight: 700; color: {color};'>
-                                    {confidence_pct:.1f}%
-                                </div>
-                            </div>
-                            <div class='confidence-bar'>
-                                <div class='confidence-fill' style='width: {confidence_pct}%; background: {color};'></div>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        with st.expander("📋 View Details", expanded=False):
-                            detail_cols = [c for c in df.columns if c not in ['prediction', 'prediction_label', 'confidence', 'threat_score']]
-                            
-                            col1, col2, col3 = st.columns(3)
-                            
-                            for i, col in enumerate(detail_cols[:9]):
-                                with [col1, col2, col3][i % 3]:
-                                    st.metric(col, f"{row[col]}")
+                    render_threat_cards(threat_df_sorted, [c for c in df.columns if c not in RESULT_COLS])
                     
                     # Export
                     st.markdown("---")
-                    csv = threat_df.to_csv(index=False)
                     st.download_button(
                         label="📥 Download Threat Report (CSV)",
-                        data=csv,
+                        data=lambda: csv_bytes(iter_frame_chunks(threat_df)),
                         file_name=f"threat_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                         mime="text/csv"
                     )
@@ -1914,21 +2741,23 @@ if uploaded:
                     )
                 
                 with col3:
-                    search_term = st.text_input("🔍 Search in data:", "")
-                
-                # Apply filters
-                filtered_df = df[
-                    (df['prediction_label'].isin(filter_threat)) &
-                    (df['confidence'] >= min_confidence)
-                ]
+                    search_term = st.text_input(
+                        "🔍 Search in data:", "",
+                        help="Each word must start a word in a text column (protocol, service, state, label, "
+                             "addresses); numeric columns are not searched"
+                    )
                 
-                if search_term:
-                    filtered_df = filtered_df[
-                        filtered_df.astype(str).apply(
-                            lambda row: row.str.contains(search_term, case=False).any(),
-                            axis=1
-                        )
-                    ]
+                # Apply filters through the flow index instead of scanning the frame;
+                # the index reads no selected level as no filter, here it shows no rows
+                if filter_threat:
+                    rows = get_flow_index(cache_key, df).query(
+                        categorical={'prediction_label': filter_threat},
+                        ranges={'confidence': (min_confidence if min_confidence > 0 else None, None)},
+                        text=search_term
+                    )
+                else:
+                    rows = np.arange(0)
+                filtered_df = df.iloc[rows]
                 
                 st.markdown(f"**Showing {len(filtered_df):,} of {len(df):,} flows**")
                 
@@ -1963,10 +2792,9 @@ if uploaded:
                 
                 # Export
                 st.markdown("---")
-                csv = df.to_csv(index=False)
                 st.download_button(
                     "📥 Download Full Results (CSV)",
-                    csv,
+                    lambda: csv_bytes(iter_frame_chunks(df)),
                     file_name=f"netpulse_full_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
@@ -1978,83 +2806,13 @@ if uploaded:
             # ========================= 
             st.markdown("---")
             
-            if pred_counts.get('Malicious', 0) > 0:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, rgba(255, 42, 42, 0.2) 0%, rgba(255, 42, 42, 0.1) 100%);
-                            backdrop-filter: blur(20px);
-                            border: 1px solid rgba(255, 42, 42, 0.3);
-                            border-radius: 16px;
-                            padding: 1.5rem;
-                            margin: 1rem 0;'>
-                    <div style='font-size: 1.5rem; font-weight: 700; color: #ff2a2a; margin-bottom: 0.5rem;'>
-                        🚨 CRITICAL ALERT
-                    </div>
-                    <div style='color: #ffffff; font-size: 1.1rem;'>
-                        {pred_counts.get('Malicious', 0)} malicious flows detected in your network traffic
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                with st.expander("🛡️ Recommended Actions", expanded=True):
-                    st.markdown("""
-                    <div style='line-height: 1.8;'>
-                        <p style='color: #ffffff; font-weight: 600; margin-bottom: 1rem;'>Immediate Response Required:</p>
-                        <ol style='color: #a0aec0;'>
-                            <li><strong style='color: #ffffff;'>Immediate Isolation:</strong> Block source IPs of malicious flows</li>
-                            <li><strong style='color: #ffffff;'>Forensic Analysis:</strong> Capture packet data for investigation</li>
-                            <li><strong style='color: #ffffff;'>Alert Escalation:</strong> Notify security team immediately</li>
-                            <li><strong style='color: #ffffff;'>Rule Update:</strong> Add new patterns to firewall rules</li>
-                            <li><strong style='color: #ffffff;'>Network Monitoring:</strong> Increase monitoring frequency</li>
-                        </ol>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            elif pred_counts.get('Suspicious', 0) > 0:
-                st.markdown(f"""
-                <div style='background: linear-gradient(135deg, rgba(255, 174, 0, 0.2) 0%, rgba(255, 174, 0, 0.1) 100%);
-                            backdrop-filter: blur(20px);
-                            border: 1px solid rgba(255, 174, 0, 0.3);
-                            border-radius: 16px;
-                            padding: 1.5rem;
-                            margin: 1rem 0;'>
-                    <div style='font-size: 1.5rem; font-weight: 700; color: #ffae00; margin-bottom: 0.5rem;'>
-                        ⚠️ WARNING
-                    </div>
-                    <div style='color: #ffffff; font-size: 1.1rem;'>
-                        {pred_counts.get('Suspicious', 0)} suspicious flows detected - investigation recommended
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                with st.expander("🔍 Investigation Suggestions"):
-                    st.markdown("""
-                    <div style='line-height: 1.8;'>
-                        <ol style='color: #a0aec0;'>
-                            <li><strong style='color: #ffffff;'>Monitor:</strong> Increase monitoring for affected IPs</li>
-                            <li><strong style='color: #ffffff;'>Log Review:</strong> Check system logs for anomalies</li>
-                            <li><strong style='color: #ffffff;'>Traffic Analysis:</strong> Deep packet inspection recommended</li>
-                            <li><strong style='color: #ffffff;'>Pattern Analysis:</strong> Look for similar traffic patterns</li>
-                        </ol>
-                    </div>
-                    """, unsafe_allow_html=True)
+            with perf.span("alerting", len(df)):
+                alerts = get_batch_alerts(cache_key, alert_threshold, alert_window, alert_rate_limit, df, preds)
+            render_alert_section(pred_counts, alerts)
             
-            else:
-                st.markdown("""
-                <div style='background: linear-gradient(135deg, rgba(23, 183, 36, 0.2) 0%, rgba(23, 183, 36, 0.1) 100%);
-                            backdrop-filter: blur(20px);
-                            border: 1px solid rgba(23, 183, 36, 0.3);
-                            border-radius: 16px;
-                            padding: 1.5rem;
-                            margin: 1rem 0;'>
-                    <div style='font-size: 1.5rem; font-weight: 700; color: #17b724; margin-bottom: 0.5rem;'>
-                        ✅ ALL CLEAR
-                    </div>
-                    <div style='color: #ffffff; font-size: 1.1rem;'>
-                        No threats detected in analyzed traffic - network appears secure
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-        
+            profiler.stop()
+            render_performance_panel(perf, profiler, len(df))
+    
         else:
             st.error("❌ Model not loaded properly. Please check your model file.")
 
@@ -2062,20 +2820,8 @@ else:
     # Welcome screen
     st.markdown('<div class="fade-in">', unsafe_allow_html=True)
     
-    # Load and encode logo for welcome screen
-    welcome_logo_base64 = ""
-    try:
-        if os.path.exists("netpulse_logo.png"):
-            with open("netpulse_logo.png", "rb") as f:
-                welcome_logo_base64 = base64.b64encode(f.read()).decode()
-        elif os.path.exists("/mnt/user-data/uploads/netpulse_logo.png"):
-            with open("/mnt/user-data/uploads/netpulse_logo.png", "rb") as f:
-                welcome_logo_base64 = base64.b64encode(f.read()).decode()
-    except:
-        pass
-    
     # Display logo centered - NO COLUMNS
-    if welcome_logo_base64:
+    if logo_src:
         st.markdown(f"""
         <div style='display: flex; justify-content: center; align-items: center; margin: 2rem 0 1.5rem 0;'>
             <div style='background: linear-gradient(135deg, rgba(255, 255, 255, 0.1) 0%, rgba(255, 255, 255, 0.05) 100%);
@@ -2085,7 +2831,7 @@ else:
                         padding: 2.5rem 4rem;
                         box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
                         text-align: center;'>
-                <img src="data:image/png;base64,{welcome_logo_base64}" width="400" style="display: block; margin: 0 auto;"/>
+                <img src="{logo_src}" width="400" style="display: block; margin: 0 auto;"/>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -2127,6 +2873,7 @@ else:
             <div class='feature-title'>Supported Formats</div>
             <div class='feature-description'>
                 • CSV files (UNSW-NB15)<br>
+                • Parquet / Feather / Arrow IPC<br>
                 • Network Flow Data<br>
                 • PCAP (coming soon)<br>
                 • NetFlow (coming soon)
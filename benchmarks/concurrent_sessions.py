@@ -0,0 +1,100 @@
+"""Scoring throughput and latency of concurrent sessions, with and without the shared batcher.
+
+    python benchmarks/concurrent_sessions.py --sessions 1,4,16 --request-rows 64 --seconds 10
+
+Each session is a thread that scores --request-rows rows at a time in a loop,
+the way monitor ticks and streaming chunks arrive from several dashboards at
+once. "direct" sessions call the shared model concurrently; "batched" ones go
+through netpulse.batching.InferenceBatcher.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from netpulse import batching, pipeline, synthetic  # noqa: E402
+
+
+def run_sessions(predict, flows, sequences, sessions, request_rows, seconds):
+    latencies = [[] for _ in range(sessions)]
+    stop = time.perf_counter() + seconds
+
+    def session(i):
+        rng = np.random.default_rng(i)
+        while time.perf_counter() < stop:
+            start = rng.integers(0, len(flows) - request_rows + 1)
+            t = time.perf_counter()
+            predict(flows[start:start + request_rows], sequences[start:start + request_rows])
+            latencies[i].append(time.perf_counter() - t)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+
+    lat = np.concatenate([np.asarray(x) for x in latencies]) * 1000
+    return {
+        'requests': len(lat),
+        'flows_per_sec': len(lat) * request_rows / elapsed,
+        'p50_ms': float(np.percentile(lat, 50)),
+        'p95_ms': float(np.percentile(lat, 95)),
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,4,16", help="comma-separated session counts (default: 1,4,16)")
+    parser.add_argument("--request-rows", type=int, default=64, help="rows per scoring call (default: 64)")
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each run (default: 10)")
+    parser.add_argument("--max-wait-ms", type=float, default=batching.DEFAULT_MAX_WAIT * 1000)
+    parser.add_argument("--max-batch-rows", type=int, default=pipeline.INFER_BATCH_ROWS)
+    parser.add_argument("--model-dir")
+    parser.add_argument("--runtime", choices=pipeline.RUNTIMES)
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    artifacts = pipeline.load_artifacts(args.model_dir, runtime=args.runtime)
+    df = synthetic.generate_flows(20_000, feature_names=list(artifacts.scaler3.feature_names_in_))
+    flows, sequences = pipeline.prepare_inputs(artifacts, df)
+
+    results = []
+    print(f"{os.cpu_count()} cores, {args.request_rows} rows per request, {artifacts.runtime} runtime")
+    print(f"{'sessions':>8} {'mode':>8} {'flows/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'rows/batch':>11} {'reqs/batch':>11}")
+    for sessions in [int(n) for n in args.sessions.split(",")]:
+        for mode in ("direct", "batched"):
+            batcher = None
+            predict = artifacts.predict
+            if mode == "batched":
+                batcher = batching.InferenceBatcher(artifacts.predict, args.max_batch_rows, args.max_wait_ms / 1000)
+                predict = batcher
+            row = {'sessions': sessions, 'mode': mode,
+                   **run_sessions(predict, flows, sequences, sessions, args.request_rows, args.seconds)}
+            if batcher is not None:
+                stats = batcher.stats()
+                batcher.close()
+                row['mean_batch_rows'] = stats['rows'] / stats['batches'] if stats['batches'] else 0.0
+                row['mean_requests_per_batch'] = stats['requests'] / stats['batches'] if stats['batches'] else 0.0
+            results.append(row)
+            print(f"{sessions:>8} {mode:>8} {row['flows_per_sec']:>10,.0f} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} "
+                  f"{row.get('mean_batch_rows', args.request_rows):>11,.0f} {row.get('mean_requests_per_batch', 1):>11.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""Load test for netpulse-serve: concurrent keep-alive clients posting flow batches.
+
+    netpulse-serve --port 9600 &
+    python benchmarks/http_load.py --url http://127.0.0.1:9600 --clients 1,4,16 --batch-rows 100
+    python benchmarks/http_load.py --spawn --format arrow --seconds 20 --json load.json
+
+Each client holds one persistent HTTP/1.1 connection and posts --batch-rows
+synthetic flows per request, as JSON lines or Arrow IPC, for --seconds. Request
+bodies are encoded before the clock starts, so the numbers measure the service.
+After each run the server's own /latency histogram and /health batcher stats
+are recorded next to the client-side ones.
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from netpulse import synthetic  # noqa: E402
+from netpulse.server import ARROW_TYPES, DEFAULT_PORT, JSON_TYPES  # noqa: E402
+
+
+def encode_bodies(batch_rows, n_bodies, fmt, seed):
+    bodies = []
+    for i in range(n_bodies):
+        df = synthetic.generate_flows(batch_rows, seed=seed, offset=i * batch_rows)
+        df.insert(0, 'id', np.arange(i * batch_rows, (i + 1) * batch_rows))
+        if fmt == 'arrow':
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            sink = io.BytesIO()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            bodies.append(sink.getvalue())
+        else:
+            bodies.append(df.to_json(orient='records', lines=True).encode())
+    return bodies
+
+
+def get_json(host, port, path):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request("GET", path)
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def run_clients(host, port, bodies, content_type, clients, seconds):
+    latencies = [[] for _ in range(clients)]
+    errors = [0] * clients
+    stop = time.perf_counter() + seconds
+
+    def client(i):
+        conn = http.client.HTTPConnection(host, port, timeout=120)
+        headers = {"Content-Type": content_type, "Accept": content_type}
+        n = 0
+        while time.perf_counter() < stop:
+            body = bodies[(i + n * clients) % len(bodies)]
+            n += 1
+            start = time.perf_counter()
+            try:
+                conn.request("POST", "/score", body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=120)
+                ok = False
+            latencies[i].append(time.perf_counter() - start)
+            errors[i] += not ok
+        conn.close()
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - begin
+
+    lat = np.concatenate([np.asarray(x) for x in latencies]) * 1000
+    requests = len(lat)
+    return {
+        'requests': requests,
+        'errors': sum(errors),
+        'requests_per_sec': requests / elapsed,
+        'p50_ms': float(np.percentile(lat, 50)) if requests else 0.0,
+        'p95_ms': float(np.percentile(lat, 95)) if requests else 0.0,
+        'p99_ms': float(np.percentile(lat, 99)) if requests else 0.0,
+    }
+
+
+def spawn_server(args, port):
+    command = [sys.executable, "-m", "netpulse.server", "--port", str(port)]
+    if args.model_dir:
+        command += ["--model-dir", args.model_dir]
+    if args.runtime:
+        command += ["--runtime", args.runtime]
+    server = subprocess.Popen(command, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    deadline = time.monotonic() + 300
+    while time.monotonic() < deadline:
+        try:
+            get_json("127.0.0.1", port, "/health")
+            return server
+        except OSError:
+            if server.poll() is not None:
+                raise RuntimeError(f"netpulse-serve exited with status {server.returncode}")
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("netpulse-serve did not come up within 300s")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}", help="service to drive")
+    parser.add_argument("--spawn", action="store_true", help="start a netpulse-serve on the --url port for the run")
+    parser.add_argument("--clients", default="1,4,16", help="comma-separated concurrent client counts (default: 1,4,16)")
+    parser.add_argument("--batch-rows", type=int, default=100, help="flows per request (default: 100)")
+    parser.add_argument("--format", choices=['json', 'arrow'], default='json')
+    parser.add_argument("--seconds", type=float, default=10, help="duration of each run (default: 10)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--model-dir", help="with --spawn: model directory of the server")
+    parser.add_argument("--runtime", help="with --spawn: model runtime of the server")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    url = urlsplit(args.url)
+    host, port = url.hostname or "127.0.0.1", url.port or DEFAULT_PORT
+    counts = [int(n) for n in args.clients.split(",")]
+    content_type = ARROW_TYPES[0] if args.format == 'arrow' else JSON_TYPES[0]
+    bodies = encode_bodies(args.batch_rows, max(counts) * 4, args.format, args.seed)
+
+    server = spawn_server(args, port) if args.spawn else None
+    results = []
+    try:
+        print(f"{args.format} bodies of {args.batch_rows} flows ({np.mean([len(b) for b in bodies]) / 1024:,.0f} KB), "
+              f"{args.seconds:g}s per run")
+        print(f"{'clients':>8} {'req/s':>8} {'flows/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+              f"{'errors':>7} {'reqs/batch':>11}")
+        for clients in counts:
+            before = get_json(host, port, "/health")['batcher']
+            row = {'clients': clients, 'batch_rows': args.batch_rows, 'format': args.format,
+                   **run_clients(host, port, bodies, content_type, clients, args.seconds)}
+            row['flows_per_sec'] = row['requests_per_sec'] * args.batch_rows
+            after = get_json(host, port, "/health")['batcher']
+            batches = after['batches'] - before['batches']
+            row['requests_per_batch'] = (after['requests'] - before['requests']) / batches if batches else 0.0
+            row['server_latency'] = get_json(host, port, "/latency")['/score']
+            results.append(row)
+            print(f"{clients:>8} {row['requests_per_sec']:>8,.1f} {row['flows_per_sec']:>10,.0f} {row['p50_ms']:>8.1f} "
+                  f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['errors']:>7} {row['requests_per_batch']:>11.1f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if any(r['errors'] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
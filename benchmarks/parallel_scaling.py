@@ -0,0 +1,72 @@
+"""Throughput of sharded fusion scoring versus worker count.
+
+    python benchmarks/parallel_scaling.py flows.csv --workers 1,2,4,8,16,32 --shard-rows 50000
+
+Each worker count gets a fresh pool that is warmed up (models loaded) before the
+timed run, so the numbers reflect steady-state scoring rather than start-up.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from netpulse import pipeline  # noqa: E402
+from netpulse.parallel import DEFAULT_SHARD_ROWS, ScoringPool  # noqa: E402
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="flow capture to score (.csv, .parquet)")
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts (default: 1,2,4,8)")
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+    parser.add_argument("--rows", type=int, help="only score the first N rows")
+    parser.add_argument("--model-dir")
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    df = pipeline.read_flows(args.input)
+    if args.rows:
+        df = df.head(args.rows)
+    counts = [int(n) for n in args.workers.split(",")]
+
+    results = []
+    reference = None
+    print(f"{len(df):,} flows, {os.cpu_count()} cores, shard {args.shard_rows:,} rows")
+    print(f"{'workers':>8} {'seconds':>9} {'flows/s':>12} {'speedup':>8} {'agree':>7}")
+    for workers in counts:
+        with ScoringPool(args.model_dir, workers, args.shard_rows) as pool:
+            pool.warm_up()
+            start = time.perf_counter()
+            preds = pool.score(df)
+            seconds = time.perf_counter() - start
+
+        labels = preds.argmax(axis=1)
+        if reference is None:
+            reference = labels
+        row = {
+            'workers': workers,
+            'seconds': seconds,
+            'flows_per_sec': len(df) / seconds if seconds > 0 else 0.0,
+            'agreement': float(np.mean(labels == reference)) if len(df) else 1.0,
+        }
+        row['speedup'] = row['flows_per_sec'] / results[0]['flows_per_sec'] if results else 1.0
+        results.append(row)
+        print(f"{workers:>8} {seconds:>9.2f} {row['flows_per_sec']:>12,.0f} {row['speedup']:>7.2f}x {row['agreement']:>7.2%}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({'rows': len(df), 'cpu_count': os.cpu_count(), 'shard_rows': args.shard_rows,
+                       'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
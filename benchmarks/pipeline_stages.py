@@ -0,0 +1,239 @@
+"""Per-stage timings of the scoring pipeline on synthetic UNSW-NB15-shaped traffic.
+
+    python benchmarks/pipeline_stages.py --sizes 10k,100k,1m --report bench.json
+    python benchmarks/pipeline_stages.py --sizes 10m --max-predict-rows 1m
+
+Each size runs in a fresh subprocess so peak RSS is per size. Inputs are
+generated once per (size, seed, format) and reused. Captures larger than
+--chunk-rows are processed in chunks, the way streaming mode and the CLI do, and
+stage times are summed across chunks. The report records, per stage, seconds,
+flows/sec and the process peak RSS once the stage finished.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from netpulse import aggregates, charts, pipeline, synthetic  # noqa: E402
+
+STAGES = ['read', 'encode', 'sequence', 'scale', 'predict', 'charts']
+
+
+def parse_rows(text):
+    text = text.strip().lower().replace("_", "")
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def input_path(args, n_rows):
+    os.makedirs(args.data_dir, exist_ok=True)
+    ext = "parquet" if args.format == "parquet" else "csv"
+    path = os.path.join(args.data_dir, f"flows_{n_rows}_seed{args.seed}.{ext}")
+    if not os.path.exists(path):
+        # Keeps the extension, which picks the format write_flows writes
+        partial = f"{path}.partial.{ext}"
+        synthetic.write_flows(partial, n_rows, chunk_rows=args.chunk_rows, seed=args.seed)
+        os.replace(partial, path)
+    return path
+
+
+def build_charts(df, labels):
+    # Same aggregates and figures the batch dashboard builds for a scored upload
+    agg = aggregates.chart_aggregates(df, labels)
+    pred_counts = aggregates.sorted_class_counts(agg)
+    figures = [
+        charts.create_pie_chart(pred_counts),
+        charts.create_bar_chart(pred_counts),
+        charts.create_timeline_chart(aggregates.timeline_frame(agg)) if agg['timeline'] is not None else None,
+        charts.create_protocol_chart(aggregates.top_protocols(agg)) if agg['proto_counts'] is not None else None,
+        charts.create_confidence_bins_chart(aggregates.CONF_BINS, agg['conf_hist']),
+        charts.create_radar_chart(aggregates.radar_stats(agg)) if agg['radar_sums'] is not None else None,
+        charts.create_heatmap_chart(aggregates.corr_matrix(agg)),
+        charts.create_3d_scatter(df),
+    ]
+    return [fig for fig in figures if fig is not None]
+
+
+def run_size(args, n_rows):
+    start = time.perf_counter()
+    path = input_path(args, n_rows)
+    generate_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    artifacts = pipeline.load_artifacts(args.model_dir)
+    load_seconds = time.perf_counter() - start
+    baseline_rss = peak_rss_mb()
+
+    seconds = dict.fromkeys(STAGES, 0.0)
+    rows = dict.fromkeys(STAGES, 0)
+    peak = {}
+    predicted = 0
+    last_preds = None
+
+    def done(stage, n, began):
+        seconds[stage] += time.perf_counter() - began
+        rows[stage] += n
+        peak[stage] = peak_rss_mb()
+
+    chunks = pipeline.read_flows(path, chunk_rows=args.chunk_rows, columns=pipeline.input_columns(artifacts.scaler3))
+    while True:
+        began = time.perf_counter()
+        df = next(chunks, None)
+        if df is None:
+            break
+        n = len(df)
+        done('read', n, began)
+
+        began = time.perf_counter()
+        flows = pipeline.encode_categoricals(df.copy(), artifacts.categories)
+        flows = pipeline.align_features(flows, artifacts.scaler3)
+        done('encode', n, began)
+
+        began = time.perf_counter()
+        sequences = pipeline.flows_to_sequences(*pipeline.sequence_columns(df), seq_len=artifacts.seq_len)
+        done('sequence', n, began)
+
+        began = time.perf_counter()
+        flows_scaled = artifacts.scaler3.transform(flows)
+        done('scale', n, began)
+
+        budget = n if args.max_predict_rows is None else max(0, min(n, args.max_predict_rows - predicted))
+        if budget:
+            began = time.perf_counter()
+            last_preds = artifacts.predict(flows_scaled[:budget], sequences[:budget], batch_rows=args.batch_size)
+            done('predict', budget, began)
+            predicted += budget
+        del flows, sequences, flows_scaled
+        if last_preds is None:
+            # --max-predict-rows 0: no labels to chart either
+            continue
+        # Rows past --max-predict-rows reuse measured predictions so the chart
+        # stage still sees a realistic label mix
+        preds = last_preds if len(last_preds) == n else np.resize(last_preds, (n, last_preds.shape[1]))
+
+        began = time.perf_counter()
+        pipeline.attach_predictions(df, preds, artifacts.class_map)
+        build_charts(df, [artifacts.class_map[k] for k in sorted(artifacts.class_map)])
+        done('charts', n, began)
+
+    stages = {
+        stage: {
+            'rows': rows[stage],
+            'seconds': round(seconds[stage], 4),
+            'flows_per_sec': round(rows[stage] / seconds[stage], 1) if seconds[stage] > 0 else None,
+            'peak_rss_mb': round(peak.get(stage, baseline_rss), 1),
+        }
+        for stage in STAGES
+    }
+    # End-to-end rate extrapolates predict to every row when it was capped
+    per_row = sum(seconds[s] / rows[s] for s in STAGES if rows[s])
+    return {
+        'rows': n_rows,
+        'input': os.path.basename(path),
+        'input_mb': round(os.path.getsize(path) / (1 << 20), 1),
+        'generate_seconds': round(generate_seconds, 3),
+        'model_load_seconds': round(load_seconds, 3),
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'stages': stages,
+        'flows_per_sec': round(1 / per_row, 1) if per_row else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def package_version():
+    try:
+        from importlib.metadata import version
+        return version("netpulse")
+    except Exception:
+        return None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10k,100k,1m", help="comma-separated row counts, k/m suffixes allowed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--chunk-rows", type=parse_rows, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=pipeline.INFER_BATCH_ROWS,
+                        help="rows per compiled inference call")
+    parser.add_argument("--max-predict-rows", type=parse_rows,
+                        help="only run the model on the first N rows of each size (predict is the slowest stage); "
+                             "0 skips the predict and chart stages")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "netpulse-bench"))
+    parser.add_argument("--model-dir")
+    parser.add_argument("--report", default="benchmark_report.json")
+    parser.add_argument("--run-size", type=int, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+    if args.run_size is not None:
+        print(json.dumps(run_size(args, args.run_size)))
+        return 0
+
+    results = []
+    for n_rows in (parse_rows(s) for s in args.sizes.split(",")):
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *argv, "--run-size", str(n_rows)],
+            stdout=subprocess.PIPE, text=True
+        )
+        if child.returncode != 0:
+            print(f"{n_rows:>12,} rows: failed (exit {child.returncode})", file=sys.stderr)
+            results.append({'rows': n_rows, 'error': f"exit {child.returncode}"})
+            continue
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        results.append(result)
+
+        timings = "  ".join(f"{s} {result['stages'][s]['seconds']:.2f}s" for s in STAGES)
+        print(f"{n_rows:>12,} rows: {result['flows_per_sec'] or 0:>10,.0f} flows/s  "
+              f"peak {result['peak_rss_mb']:,.0f} MB  |  {timings}")
+
+    report = {
+        'netpulse_version': package_version(),
+        'git_commit': git_commit(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'format': args.format,
+        'chunk_rows': args.chunk_rows,
+        'max_predict_rows': args.max_predict_rows,
+        'results': results,
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"report written to {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""Cold-start time of the Streamlit app: first render and model ready.
+
+    python benchmarks/startup_time.py --runs 5 --report startup.json
+    python benchmarks/startup_time.py --baseline startup.json --tolerance 0.25
+
+Each run is a fresh interpreter that renders app.py once with no upload (the
+welcome screen) through Streamlit's AppTest, then waits for the background
+model load to finish. The median of the runs is compared against --max-seconds
+and, when given, a previous report; the exit status is 1 on a regression so the
+script can gate CI.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOADER_THREAD = "netpulse-model-load"
+# Modules the app must not import at all (matplotlib is not listed because
+# TensorFlow imports it itself)
+UNUSED_HEAVY_MODULES = ['seaborn']
+
+
+def measure(args):
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(args.app, default_timeout=args.timeout)
+    at.run()
+    first_render = time.perf_counter() - start
+    tf_at_render = 'tensorflow' in sys.modules
+
+    # The model keeps loading on its own thread after the first render
+    while any(t.name.startswith(LOADER_THREAD) for t in threading.enumerate()):
+        time.sleep(0.05)
+    model_ready = time.perf_counter() - start
+
+    return {
+        'first_render_seconds': round(first_render, 3),
+        'model_ready_seconds': round(model_ready, 3),
+        'tensorflow_loaded_at_render': tf_at_render,
+        'unused_modules_loaded': [m for m in UNUSED_HEAVY_MODULES if m in sys.modules],
+        'exceptions': [e.message for e in at.exception],
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(REPO_ROOT, "app.py"))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120, help="AppTest script timeout in seconds")
+    parser.add_argument("--max-seconds", type=float, default=5.0,
+                        help="fail when the median first render takes longer (default: 5)")
+    parser.add_argument("--baseline", help="previous report to compare the median first render against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown versus --baseline, as a fraction (default: 0.25)")
+    parser.add_argument("--report", default="startup_report.json")
+    parser.add_argument("--run-once", action="store_true", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+    if args.run_once:
+        print(json.dumps(measure(args)))
+        return 0
+
+    runs = []
+    for i in range(args.runs):
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *argv, "--run-once"],
+            stdout=subprocess.PIPE, text=True, cwd=os.path.dirname(os.path.abspath(args.app))
+        )
+        if child.returncode != 0:
+            print(f"run {i + 1}: failed (exit {child.returncode})", file=sys.stderr)
+            return 1
+        run = json.loads(child.stdout.strip().splitlines()[-1])
+        runs.append(run)
+        print(f"run {i + 1}: first render {run['first_render_seconds']:.2f}s  "
+              f"model ready {run['model_ready_seconds']:.2f}s")
+
+    first_render = statistics.median(r['first_render_seconds'] for r in runs)
+    model_ready = statistics.median(r['model_ready_seconds'] for r in runs)
+    failures = []
+    if first_render > args.max_seconds:
+        failures.append(f"median first render {first_render:.2f}s exceeds {args.max_seconds:.2f}s")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['first_render_seconds']
+        if first_render > baseline * (1 + args.tolerance):
+            failures.append(f"median first render {first_render:.2f}s is more than "
+                            f"{args.tolerance:.0%} slower than the baseline {baseline:.2f}s")
+    for run in runs:
+        if run['unused_modules_loaded']:
+            failures.append(f"app imported {', '.join(run['unused_modules_loaded'])}")
+        if run['exceptions']:
+            failures.append(f"app raised: {run['exceptions'][0]}")
+
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'first_render_seconds': first_render,
+        'model_ready_seconds': model_ready,
+        'runs': runs,
+        'failures': sorted(set(failures)),
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"median first render {first_render:.2f}s, model ready {model_ready:.2f}s; report written to {args.report}")
+    for failure in report['failures']:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if report['failures'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""NET PULSE scoring pipeline, shared by the Streamlit app and the CLI."""
@@ -0,0 +1,7 @@
+import sys
+
+from netpulse.cli import main
+
+# Guarded so spawned scoring workers can re-import this module safely
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Chart inputs for a set of scored flows, built together in one pass.
+
+chart_aggregates reduces a scored frame (one carrying attach_predictions'
+columns) to everything the dashboard charts draw: class counts, confidence
+histogram bins per class, hourly timeline buckets, protocol counts, per-class
+sums for the radar chart and the means and centred co-moments a Pearson
+correlation matrix is derived from. Per-class reductions are a single bincount over class codes
+rather than a groupby or mask per class.
+
+Aggregates of separate chunks combine with merge_aggregates, so the streaming
+path keeps a running total and the batch path builds one for the whole frame.
+Both render from the helpers at the bottom in O(bins), whatever the row count.
+"""
+import numpy as np
+import pandas as pd
+
+from netpulse.charts import TIMELINE_BUCKET
+
+CONF_BINS = np.linspace(0, 1, 31)
+RADAR_COLS = ['spkts', 'dpkts', 'sbytes', 'dbytes', 'dur']
+# Leading numeric columns the correlation heatmap covers
+CORR_MAX_COLS = 10
+TOP_PROTOCOLS = 10
+
+
+def _class_codes(df, labels):
+    values = df['prediction_label']
+    if isinstance(values.dtype, pd.CategoricalDtype) and list(values.cat.categories) == list(labels):
+        return values.cat.codes.to_numpy(np.int64)
+    return pd.Categorical(values, categories=labels).codes.astype(np.int64)
+
+
+def _class_bincount(codes, n_classes, keys=None, n_keys=1, weights=None):
+    # Counts (or weight sums) per (key, class), as an (n_keys, n_classes) array
+    flat = codes if keys is None else keys * n_classes + codes
+    return np.bincount(flat, weights=weights, minlength=n_keys * n_classes).reshape(n_keys, n_classes)
+
+
+def chart_aggregates(df, labels, bucket=TIMELINE_BUCKET, corr_cols=None):
+    """Every chart input for the scored rows of df.
+
+    labels: class labels in code order. corr_cols fixes the correlation
+    columns (a running aggregate must keep the ones its first chunk chose);
+    by default the first CORR_MAX_COLS numeric columns of df are used.
+    """
+    labels = list(labels)
+    k = len(labels)
+    codes = _class_codes(df, labels)
+    # Rows without a known class (code -1) are left out of the per-class reductions
+    known = codes >= 0
+    if not known.all():
+        codes = codes[known]
+        df = df[known]
+    counts = np.bincount(codes, minlength=k)
+    confidence = df['confidence'].to_numpy(np.float64)
+
+    # Same bins as np.histogram: half-open, except the last includes 1.0
+    bins = np.searchsorted(CONF_BINS, confidence, side='right') - 1
+    bins[confidence == CONF_BINS[-1]] = len(CONF_BINS) - 2
+    in_range = (bins >= 0) & (bins < len(CONF_BINS) - 1)
+    hist = _class_bincount(codes[in_range], k, bins[in_range], len(CONF_BINS) - 1)
+
+    agg = {
+        'total_flows': len(df),
+        'class_counts': pd.Series(counts, index=labels, dtype='int64'),
+        'confidence_sum': float(confidence.sum()),
+        'conf_hist': {label: hist[:, i].astype(np.int64) for i, label in enumerate(labels)},
+        'has_time': 'time' in df.columns,
+        'timeline': None,
+        'proto_counts': None,
+        'radar_sums': None,
+        'radar_counts': None,
+    }
+
+    if 'time' in df.columns:
+        times = pd.to_datetime(df['time'], errors='coerce').dt.floor(bucket)
+        bucket_codes, buckets = pd.factorize(times, sort=True)
+        valid = bucket_codes >= 0
+        per_bucket = _class_bincount(codes[valid], k, bucket_codes[valid], len(buckets))
+        b, c = np.nonzero(per_bucket)
+        agg['timeline'] = pd.Series(
+            per_bucket[b, c],
+            index=pd.MultiIndex.from_arrays([buckets[b], np.asarray(labels, dtype=object)[c]],
+                                            names=['time', 'prediction_label']),
+            dtype='int64',
+        )
+
+    if 'proto' in df.columns:
+        protos = df['proto'].value_counts()
+        agg['proto_counts'] = protos[protos > 0]
+
+    if all(c in df.columns for c in RADAR_COLS):
+        present = counts > 0
+        sums, nonnull = {}, {}
+        for col in RADAR_COLS:
+            x = pd.to_numeric(df[col], errors='coerce').to_numpy(np.float64)
+            ok = ~np.isnan(x)
+            sums[col] = _class_bincount(codes[ok], k, weights=x[ok])[0][present]
+            nonnull[col] = _class_bincount(codes[ok], k)[0][present].astype(np.int64)
+        index = pd.Index(np.asarray(labels, dtype=object)[present], name='prediction_label')
+        agg['radar_sums'] = pd.DataFrame(sums, index=index)
+        agg['radar_counts'] = pd.DataFrame(nonnull, index=index)
+
+    # Pearson correlation over complete rows, from centred co-moments: raw
+    # sums of products cancel catastrophically for columns with a large mean
+    # (epoch timestamps), centred ones do not
+    if corr_cols is None:
+        corr_cols = df.select_dtypes(include=[np.number]).columns.tolist()[:CORR_MAX_COLS]
+    agg['corr_cols'] = corr_cols
+    agg['corr_n'] = 0
+    agg['corr_mean'] = np.zeros(len(corr_cols))
+    agg['corr_comoment'] = np.zeros((len(corr_cols), len(corr_cols)))
+    if len(corr_cols) > 1:
+        x = df[corr_cols].apply(pd.to_numeric, errors='coerce').to_numpy(np.float64)
+        x = x[~np.isnan(x).any(axis=1)]
+        if len(x):
+            mean = x.mean(axis=0)
+            centred = x - mean
+            agg['corr_n'] = len(x)
+            agg['corr_mean'] = mean
+            agg['corr_comoment'] = centred.T @ centred
+    return agg
+
+
+def _add_counts(total, counts):
+    if counts is None:
+        return total
+    return counts if total is None else total.add(counts, fill_value=0).astype(counts.dtypes)
+
+
+def merge_aggregates(total, part):
+    """Fold the aggregates of another chunk into total, in place."""
+    total['total_flows'] += part['total_flows']
+    total['class_counts'] = total['class_counts'].add(part['class_counts'], fill_value=0).astype('int64')
+    total['confidence_sum'] += part['confidence_sum']
+    for label, hist in part['conf_hist'].items():
+        total['conf_hist'][label] = total['conf_hist'].get(label, 0) + hist
+    total['has_time'] = total['has_time'] or part['has_time']
+    for key in ('timeline', 'proto_counts', 'radar_sums', 'radar_counts'):
+        total[key] = _add_counts(total[key], part[key])
+    if total['corr_cols'] is None:
+        total['corr_cols'] = part['corr_cols']
+        total['corr_mean'] = np.zeros(len(part['corr_cols']))
+        total['corr_comoment'] = np.zeros((len(part['corr_cols']), len(part['corr_cols'])))
+    # Pairwise (Chan et al.) update of the mean and co-moments
+    n_total, n_part = total['corr_n'], part['corr_n']
+    if n_part:
+        n = n_total + n_part
+        delta = part['corr_mean'] - total['corr_mean']
+        total['corr_comoment'] = total['corr_comoment'] + part['corr_comoment'] + np.outer(delta, delta) * (n_total * n_part / n)
+        total['corr_mean'] = total['corr_mean'] + delta * (n_part / n)
+        total['corr_n'] = n
+    return total
+
+
+# =========================
+# Chart inputs
+# =========================
+def sorted_class_counts(agg):
+    # Most frequent class first, the order value_counts gives
+    return agg['class_counts'].sort_values(ascending=False, kind='stable')
+
+
+def mean_confidence(agg):
+    return agg['confidence_sum'] / agg['total_flows'] if agg['total_flows'] else 0.0
+
+
+def timeline_frame(agg):
+    return agg['timeline'].rename_axis(['time', 'prediction_label']).reset_index(name='count')
+
+
+def top_protocols(agg, n=TOP_PROTOCOLS):
+    return agg['proto_counts'].sort_values(ascending=False).head(n)
+
+
+def radar_stats(agg):
+    return (agg['radar_sums'] / agg['radar_counts']).reset_index()
+
+
+def corr_matrix(agg):
+    cols, n = agg['corr_cols'], agg['corr_n']
+    if not cols or len(cols) < 2 or n < 2:
+        return pd.DataFrame()
+    cov = agg['corr_comoment'] / n
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = cov / np.outer(std, std)
+    return pd.DataFrame(np.clip(corr, -1, 1), index=cols, columns=cols)
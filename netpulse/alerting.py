@@ -0,0 +1,192 @@
+"""Threshold alerting over per-class probabilities, aggregated into windows.
+
+A flow is an alert candidate when its most likely threat class (any class but
+Normal) has probability >= threshold. Candidates are grouped by (flow key,
+threat class) into sliding windows: a group stays open while its flows are no
+more than `window` apart, so a sustained burst from one source becomes one
+alert whose flow count grows. A rate limit caps how many new alerts may open per
+window; groups over the cap are tracked silently and counted as suppressed.
+Flows without timestamps are windowed by arrival order instead: a flow's
+position in the stream stands in for its time and a window spans
+`window_flows` flows.
+
+AlertEngine is incremental: feed it batches in arrival order (the real-time
+monitor does), or the whole frame at once.
+"""
+import numpy as np
+import pandas as pd
+
+DEFAULT_WINDOW = pd.Timedelta(minutes=5)
+DEFAULT_MAX_ALERTS_PER_WINDOW = 25
+DEFAULT_WINDOW_FLOWS = 10_000
+# Column pairs tried, in order, as the flow key alerts are grouped by
+FLOW_KEY_COLUMNS = [
+    ['srcip', 'dstip'],
+    ['src_ip', 'dst_ip'],
+    ['saddr', 'daddr'],
+    ['srcip'],
+    ['src_ip'],
+]
+
+
+def flow_key_columns(columns):
+    for candidate in FLOW_KEY_COLUMNS:
+        if all(c in columns for c in candidate):
+            return candidate
+    return None
+
+
+def flow_keys(df):
+    # One label per row ("10.0.0.1 → 10.0.0.9"), or None when no key columns exist
+    cols = flow_key_columns(df.columns)
+    if cols is None:
+        return None
+    keys = df[cols[0]].astype(str)
+    for col in cols[1:]:
+        keys = keys + " → " + df[col].astype(str)
+    return keys.to_numpy(dtype=object)
+
+
+def flow_times(df):
+    if 'time' not in df.columns:
+        return None
+    return pd.to_datetime(df['time'], errors='coerce').to_numpy('datetime64[ns]')
+
+
+class AlertEngine:
+    def __init__(self, class_map, threshold, window=DEFAULT_WINDOW,
+                 max_alerts_per_window=DEFAULT_MAX_ALERTS_PER_WINDOW, window_flows=DEFAULT_WINDOW_FLOWS):
+        self.class_map = class_map
+        self.threshold = threshold
+        self.window_ns = int(pd.Timedelta(window).value)
+        self.window_flows = window_flows
+        self.max_alerts_per_window = max_alerts_per_window
+        self.alerts = []
+        self.open = {}
+        self.opened_per_window = {}
+        self.flows_seen = 0
+        self.candidates = 0
+        self.suppressed_groups = 0
+        self.suppressed_flows = 0
+
+    def process(self, probs, times=None, keys=None, rows=None):
+        """Fold one batch of per-class probabilities into the alert state.
+
+        times: datetime64 per row (or None: windowed by arrival order),
+        keys: flow-key label per row (or None: group by threat class only),
+        rows: row ids reported as each alert's example (default 0..n-1 offset
+        by the flows seen so far).
+        """
+        probs = np.asarray(probs)
+        n = len(probs)
+        first_flow = self.flows_seen
+        if rows is None:
+            rows = np.arange(first_flow, first_flow + n)
+        self.flows_seen += n
+        if n == 0 or probs.shape[1] < 2:
+            return []
+
+        threat = probs[:, 1:]
+        severity = threat.argmax(axis=1) + 1
+        score = threat.max(axis=1)
+        hit = np.flatnonzero(score >= self.threshold)
+        self.candidates += len(hit)
+        if len(hit) == 0:
+            return []
+
+        if times is None:
+            t, span = first_flow + hit, self.window_flows
+        else:
+            t, span = np.asarray(times)[hit].astype('datetime64[ns]').view(np.int64), self.window_ns
+            t = np.where(t == np.iinfo(np.int64).min, 0, t)
+        if keys is None:
+            key_codes, key_labels = np.zeros(len(hit), dtype=np.int64), np.array([None], dtype=object)
+        else:
+            key_codes, key_labels = pd.factorize(np.asarray(keys, dtype=object)[hit])
+        sev, sc, rid = severity[hit], score[hit], np.asarray(rows)[hit]
+
+        # Sort by (key, class, time); a group breaks where key or class changes
+        # or consecutive flows are more than a window apart
+        order = np.lexsort((t, sev, key_codes))
+        t, sev, sc, rid, key_codes = t[order], sev[order], sc[order], rid[order], key_codes[order]
+        brk = np.ones(len(t), dtype=bool)
+        brk[1:] = (key_codes[1:] != key_codes[:-1]) | (sev[1:] != sev[:-1]) | (np.diff(t) > span)
+        starts = np.flatnonzero(brk)
+        ends = np.append(starts[1:], len(t))
+
+        flows = ends - starts
+        first, last = t[starts], t[ends - 1]
+        peak = np.maximum.reduceat(sc, starts)
+        total = np.add.reduceat(sc.astype(np.float64), starts)
+        # Position of each group's highest-probability flow, without a Python loop
+        group = np.repeat(np.arange(len(starts)), flows)
+        at_peak = np.flatnonzero(sc == peak[group])
+        peak_pos = at_peak[np.unique(group[at_peak], return_index=True)[1]]
+
+        new_alerts = []
+        for g in np.argsort(first, kind='stable'):
+            key = (key_labels[key_codes[starts[g]]], int(sev[starts[g]]))
+            alert = self.open.get(key)
+            if alert is not None and first[g] - alert['_last'] <= span:
+                alert['flows'] += int(flows[g])
+                alert['_last'] = max(alert['_last'], int(last[g]))
+                alert['_score_sum'] += float(total[g])
+                if peak[g] > alert['max_prob']:
+                    alert['max_prob'] = float(peak[g])
+                    alert['example_row'] = int(rid[peak_pos[g]])
+                if alert['suppressed']:
+                    self.suppressed_flows += int(flows[g])
+                continue
+
+            bucket = int(first[g] // span) if span else 0
+            opened = self.opened_per_window.get(bucket, 0)
+            alert = {
+                'severity': self.class_map.get(key[1], str(key[1])),
+                'key': key[0],
+                '_first': int(first[g]),
+                '_last': int(last[g]),
+                'flows': int(flows[g]),
+                'max_prob': float(peak[g]),
+                '_score_sum': float(total[g]),
+                'example_row': int(rid[peak_pos[g]]),
+                'suppressed': opened >= self.max_alerts_per_window,
+            }
+            self.open[key] = alert
+            if alert['suppressed']:
+                self.suppressed_groups += 1
+                self.suppressed_flows += alert['flows']
+            else:
+                self.opened_per_window[bucket] = opened + 1
+                self.alerts.append(alert)
+                new_alerts.append(alert)
+
+        # Groups idle for more than a window can no longer absorb new flows
+        horizon = int(t.max()) - span
+        self.open = {k: a for k, a in self.open.items() if a['_last'] >= horizon}
+        return new_alerts
+
+    def frame(self, timed=True):
+        columns = ['severity', 'key', 'first_seen', 'last_seen', 'flows', 'max_prob', 'mean_prob', 'example_row']
+        if not self.alerts:
+            return pd.DataFrame(columns=columns)
+        df = pd.DataFrame(self.alerts)
+        df['mean_prob'] = df['_score_sum'] / df['flows']
+        df['first_seen'] = pd.to_datetime(df['_first']) if timed else pd.NaT
+        df['last_seen'] = pd.to_datetime(df['_last']) if timed else pd.NaT
+        return df[columns]
+
+    def counts(self):
+        # Alerts and the flows they cover, per threat class
+        counts = {}
+        for alert in self.alerts:
+            entry = counts.setdefault(alert['severity'], {'alerts': 0, 'flows': 0})
+            entry['alerts'] += 1
+            entry['flows'] += alert['flows']
+        return counts
+
+
+def score_alerts(df, probs, class_map, threshold, **kwargs):
+    """One-shot alerting over a whole scored frame."""
+    engine = AlertEngine(class_map, threshold, **kwargs)
+    engine.process(probs, times=flow_times(df), keys=flow_keys(df), rows=np.arange(len(df)))
+    return engine
@@ -0,0 +1,66 @@
+"""Downsized copies of the dashboard's image assets, built once and served statically.
+
+The source logo is a 1536x1024 PNG of about 2 MB; the dashboard never shows it
+wider than 450 px. build_logo writes a copy at twice that width (for HiDPI
+screens) into static/, which Streamlit serves at app/static/ when
+server.enableStaticServing is on, so the browser fetches it once and caches it.
+
+    python -m netpulse.assets    # rebuild static/ after replacing the logo
+"""
+import base64
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOGO_SOURCES = [
+    os.path.join(REPO_ROOT, "assets", "netpulse_logo.png"),
+    "netpulse_logo.png",
+]
+STATIC_DIR = os.path.join(REPO_ROOT, "static")
+LOGO_FILE = "netpulse_logo.png"
+LOGO_WIDTH = 900
+
+
+def logo_source():
+    for path in LOGO_SOURCES:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def build_logo(source=None, static_dir=STATIC_DIR, width=LOGO_WIDTH):
+    """Return the path of the downsized logo, writing it if missing or stale.
+
+    Returns None when there is no source logo. On a read-only checkout the
+    existing copy is used as is.
+    """
+    source = source or logo_source()
+    target = os.path.join(static_dir, LOGO_FILE)
+    if source is None:
+        return target if os.path.exists(target) else None
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+        return target
+
+    from PIL import Image
+
+    try:
+        os.makedirs(static_dir, exist_ok=True)
+        partial = target + ".partial"
+        with Image.open(source) as image:
+            if image.width > width:
+                image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+            image.save(partial, format="PNG", optimize=True)
+        os.replace(partial, target)
+    except OSError:
+        if not os.path.exists(target):
+            raise
+    return target
+
+
+def data_uri(path, mime="image/png"):
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+if __name__ == "__main__":
+    path = build_logo()
+    print(f"{path}: {os.path.getsize(path):,} bytes" if path else "no logo source found")
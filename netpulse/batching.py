@@ -0,0 +1,172 @@
+"""Merge concurrent inference requests into shared batches on one thread.
+
+Every Streamlit session shares one model. Instead of each session calling it
+concurrently (threads contending for the same cores, each with a small batch),
+scoring calls are queued here. A single inference thread takes the oldest
+request plus whatever else is pending, up to max_batch_rows rows and waiting at
+most max_wait for more to arrive, runs them as one batch and hands every caller
+its slice of the result through a future.
+
+The wait is counted from when the oldest request was queued, so under load
+(the thread busy with the previous batch) requests are not delayed further.
+It also only applies while requests are actually arriving together (the last
+batch merged more than one): a lone session is scored as soon as it asks.
+"""
+import dataclasses
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from netpulse import pipeline
+
+DEFAULT_MAX_WAIT = 0.005
+# Batches kept for the recent-batch metrics
+STATS_WINDOW = 256
+_STOP = object()
+
+
+class InferenceBatcher:
+    """Queue in front of predict(flows_scaled, sequences) -> probabilities.
+
+    Callable with the same arguments, blocking until its rows are scored, so
+    it can stand in for Artifacts.infer (see batched_artifacts).
+    """
+
+    def __init__(self, predict, max_batch_rows=pipeline.INFER_BATCH_ROWS, max_wait=DEFAULT_MAX_WAIT,
+                 name="netpulse-inference"):
+        self._predict = predict
+        self.max_batch_rows = max(1, int(max_batch_rows))
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        # Request that would have overflowed the previous batch; it opens the next one
+        self._carry = None
+        self._lock = threading.Lock()
+        self._queued_rows = 0
+        self._closed = False
+        self._concurrent = False
+        self.requests = 0
+        self.batches = 0
+        self.rows = 0
+        self._recent = deque(maxlen=STATS_WINDOW)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, flows_scaled, sequences):
+        """Queue rows for scoring; the future resolves to their probabilities."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("inference batcher is closed")
+            self._queued_rows += len(flows_scaled)
+            self._queue.put((flows_scaled, sequences, future, time.perf_counter()))
+        return future
+
+    def __call__(self, flows_scaled, sequences):
+        return self.submit(flows_scaled, sequences).result()
+
+    # ----- inference thread -----
+    def _next_batch(self):
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+        if first is _STOP:
+            return None
+        batch, rows = [first], len(first[0])
+        deadline = first[3] + (self.max_wait if self._concurrent else 0)
+        while rows < self.max_batch_rows:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP or rows + len(item[0]) > self.max_batch_rows:
+                self._carry = item
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        with self._lock:
+            self._queued_rows -= sum(len(item[0]) for item in batch)
+        live = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not live:
+            return
+
+        start = time.perf_counter()
+        try:
+            if len(live) == 1:
+                flows, sequences = live[0][0], live[0][1]
+            else:
+                flows = np.concatenate([np.asarray(item[0], dtype=np.float32) for item in live])
+                sequences = np.concatenate([np.asarray(item[1], dtype=np.float32) for item in live])
+            probs = self._predict(flows, sequences)
+        except Exception as e:
+            for item in live:
+                item[2].set_exception(e)
+            return
+        run_seconds = time.perf_counter() - start
+        self._concurrent = len(live) > 1
+
+        offset = 0
+        for flows_part, _, future, _ in live:
+            future.set_result(probs[offset:offset + len(flows_part)])
+            offset += len(flows_part)
+        with self._lock:
+            self.batches += 1
+            self.requests += len(live)
+            self.rows += offset
+            self._recent.append((offset, len(live), start - min(item[3] for item in live), run_seconds))
+
+    # ----- metrics -----
+    def stats(self):
+        with self._lock:
+            recent = np.array(self._recent, dtype=np.float64).reshape(-1, 4)
+            stats = {
+                'queue_depth': self._queue.qsize() + (self._carry is not None),
+                'queued_rows': self._queued_rows,
+                'batches': self.batches,
+                'requests': self.requests,
+                'rows': self.rows,
+                'max_batch_rows': self.max_batch_rows,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+        # Over the last STATS_WINDOW batches
+        stats['mean_batch_rows'] = float(recent[:, 0].mean()) if len(recent) else 0.0
+        stats['mean_requests_per_batch'] = float(recent[:, 1].mean()) if len(recent) else 0.0
+        stats['mean_wait_ms'] = float(recent[:, 2].mean() * 1000) if len(recent) else 0.0
+        # Longest any request actually waited, against the configured max_wait_ms
+        stats['peak_wait_ms'] = float(recent[:, 2].max() * 1000) if len(recent) else 0.0
+        stats['mean_run_ms'] = float(recent[:, 3].mean() * 1000) if len(recent) else 0.0
+        return stats
+
+    def close(self):
+        # Requests already queued are still scored
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+
+def batched_artifacts(artifacts, **kwargs):
+    """Copy of artifacts whose predict goes through a new InferenceBatcher.
+
+    Artifacts.predict hands the batcher at most INFER_BATCH_ROWS rows at a
+    time, so a large upload is scored slice by slice and small requests from
+    other sessions interleave with it rather than waiting for all of it.
+    Returns (batched artifacts, batcher).
+    """
+    batcher = InferenceBatcher(artifacts.predict, **kwargs)
+    return dataclasses.replace(artifacts, infer=batcher), batcher
@@ -0,0 +1,470 @@
+"""Plotly figures for the dashboard, built from results frames or pre-aggregated inputs."""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+COLOR_MAP = {
+    "Normal": "#17b724",     # green
+    "Suspicious": "#ffae00",  # yellow
+    "Malicious": "#ff2a2a"    # red
+}
+
+# Bucket width for threat timeline charts
+TIMELINE_BUCKET = pd.Timedelta(hours=1)
+
+
+def create_pie_chart(pred_counts):
+    pred_counts = pred_counts.reindex(["Normal", "Suspicious", "Malicious"]).dropna()
+
+    fig = px.pie(
+        values=pred_counts.values,
+        names=pred_counts.index,
+        title="<b>Threat Distribution</b>",
+        color=pred_counts.index,
+        color_discrete_map=COLOR_MAP,
+        hole=0.5
+    )
+
+    fig.update_traces(
+        textposition='outside',
+        textinfo='percent+label',
+        marker=dict(
+            line=dict(color='rgba(0,0,0,0.5)', width=2)
+        ),
+        pull=[0, 0.05, 0.1],
+        hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage: %{percent}<extra></extra>'
+    )
+
+    fig.update_layout(
+        height=450,
+        showlegend=True,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit', size=13, color='#a0aec0'),
+        title_font=dict(size=18, color='#ffffff', family='Outfit'),
+        legend=dict(
+            orientation="v",
+            yanchor="middle",
+            y=0.5,
+            xanchor="left",
+            x=1.1,
+            bgcolor='rgba(255,255,255,0.03)',
+            bordercolor='rgba(255,255,255,0.1)',
+            borderwidth=1,
+            font=dict(size=12)
+        ),
+        margin=dict(l=20, r=150, t=60, b=20)
+    )
+
+    return fig
+
+
+def create_bar_chart(pred_counts):
+    fig = px.bar(
+        x=pred_counts.index,
+        y=pred_counts.values,
+        title="<b>Threat Count by Category</b>",
+        color=pred_counts.index,
+        color_discrete_map=COLOR_MAP,
+        labels={'x': 'Threat Category', 'y': 'Count'},
+        text=pred_counts.values
+    )
+
+    fig.update_traces(
+        marker=dict(
+            line=dict(color='rgba(0,0,0,0.5)', width=1.5),
+            pattern_shape="/"
+        ),
+        texttemplate='<b>%{text}</b>',
+        textposition='outside',
+        hovertemplate='<b>%{x}</b><br>Count: %{y}<br><extra></extra>'
+    )
+
+    fig.update_layout(
+        height=450,
+        showlegend=False,
+        xaxis_title="<b>Threat Category</b>",
+        yaxis_title="<b>Count</b>",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit', color='#a0aec0', size=12),
+        title_font=dict(size=18, color='#ffffff', family='Outfit'),
+        xaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            showline=True,
+            linecolor='rgba(255,255,255,0.1)',
+            linewidth=2,
+            tickfont=dict(size=13, color='#ffffff')
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            showline=True,
+            linecolor='rgba(255,255,255,0.1)',
+            linewidth=2,
+            tickfont=dict(size=12)
+        ),
+        margin=dict(l=60, r=40, t=60, b=60)
+    )
+
+    return fig
+
+
+def create_timeline_chart(timeline_df):
+    if len(timeline_df):
+        fig = px.line(
+            timeline_df,
+            x='time',
+            y='count',
+            color='prediction_label',
+            title="<b>Threat Activity Timeline</b>",
+            color_discrete_map=COLOR_MAP,
+            markers=True
+        )
+
+        fig.update_traces(
+            line=dict(width=3),
+            marker=dict(size=10, line=dict(width=2, color='rgba(0,0,0,0.5)')),
+            hovertemplate='<b>%{fullData.name}</b><br>Time: %{x}<br>Count: %{y}<extra></extra>'
+        )
+
+        fig.update_layout(
+            height=450,
+            xaxis_title="<b>Time</b>",
+            yaxis_title="<b>Threat Count</b>",
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Outfit', color='#a0aec0', size=12),
+            title_font=dict(size=18, color='#ffffff', family='Outfit'),
+            xaxis=dict(
+                gridcolor='rgba(255,255,255,0.05)',
+                showline=True,
+                linecolor='rgba(255,255,255,0.1)',
+                linewidth=2,
+                tickfont=dict(size=12)
+            ),
+            yaxis=dict(
+                gridcolor='rgba(255,255,255,0.05)',
+                showline=True,
+                linecolor='rgba(255,255,255,0.1)',
+                linewidth=2,
+                tickfont=dict(size=12)
+            ),
+            legend=dict(
+                bgcolor='rgba(255,255,255,0.03)',
+                bordercolor='rgba(255,255,255,0.1)',
+                borderwidth=1,
+                font=dict(size=12)
+            ),
+            hovermode='x unified',
+            margin=dict(l=60, r=40, t=60, b=60)
+        )
+
+        return fig
+    return None
+
+
+def create_heatmap_chart(corr_matrix):
+    if len(corr_matrix) > 1:
+        fig = px.imshow(
+            corr_matrix,
+            title="<b>Feature Correlation Heatmap</b>",
+            color_continuous_scale='RdBu_r',
+            aspect='auto',
+            zmin=-1,
+            zmax=1,
+            text_auto='.2f'
+        )
+
+        fig.update_traces(
+            hovertemplate='<b>%{x}</b> × <b>%{y}</b><br>Correlation: %{z:.3f}<extra></extra>'
+        )
+
+        fig.update_layout(
+            height=500,
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Outfit', color='#a0aec0', size=11),
+            title_font=dict(size=18, color='#ffffff', family='Outfit'),
+            xaxis=dict(tickfont=dict(size=11)),
+            yaxis=dict(tickfont=dict(size=11)),
+            margin=dict(l=100, r=40, t=60, b=100)
+        )
+
+        return fig
+    return None
+
+
+def create_protocol_chart(proto_counts):
+    fig = px.bar(
+        x=proto_counts.index,
+        y=proto_counts.values,
+        title="<b>Top Protocols</b>",
+        color=proto_counts.values,
+        color_continuous_scale='Viridis',
+        labels={'x': 'Protocol', 'y': 'Count'},
+        text=proto_counts.values
+    )
+    fig.update_traces(
+        texttemplate='%{text}',
+        textposition='outside',
+        hovertemplate='<b>Protocol %{x}</b><br>Count: %{y}<extra></extra>'
+    )
+    fig.update_layout(
+        height=450,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit', color='#a0aec0', size=12),
+        title_font=dict(size=18, color='#ffffff', family='Outfit'),
+        xaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            tickfont=dict(size=12)
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            tickfont=dict(size=12)
+        ),
+        margin=dict(l=60, r=40, t=60, b=60)
+    )
+
+    return fig
+
+
+def create_confidence_bins_chart(bin_edges, bin_counts):
+    centers = (bin_edges[:-1] + bin_edges[1:]) / 2
+    fig = go.Figure()
+    for label, counts in bin_counts.items():
+        fig.add_trace(go.Bar(
+            x=centers,
+            y=counts,
+            name=label,
+            marker=dict(color=COLOR_MAP.get(label, '#ffffff')),
+            hovertemplate='Confidence: %{x:.2%}<br>Count: %{y}<extra></extra>'
+        ))
+    fig.update_layout(
+        title="<b>Confidence Score Distribution</b>",
+        barmode='stack',
+        bargap=0,
+        height=450,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit', color='#a0aec0', size=12),
+        title_font=dict(size=18, color='#ffffff', family='Outfit'),
+        xaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            tickfont=dict(size=12),
+            title='<b>Confidence Score</b>'
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            tickfont=dict(size=12),
+            title='<b>Count</b>'
+        ),
+        legend=dict(
+            bgcolor='rgba(255,255,255,0.03)',
+            bordercolor='rgba(255,255,255,0.1)',
+            borderwidth=1,
+            font=dict(size=12)
+        ),
+        margin=dict(l=60, r=40, t=60, b=60)
+    )
+
+    return fig
+
+
+def create_packet_sequence_viz(sequence):
+    seq_array = np.array(sequence)
+
+    fig = go.Figure()
+
+    # Packet Size Bars with gradient
+    fig.add_trace(go.Bar(
+        x=list(range(len(seq_array))),
+        y=seq_array[:, 0],
+        name='Packet Size',
+        marker=dict(
+            color=seq_array[:, 0],
+            colorscale='Viridis',
+            line=dict(color='rgba(0,0,0,0.3)', width=1)
+        ),
+        opacity=0.9,
+        hovertemplate='<b>Packet %{x}</b><br>Size: %{y:.2f} bytes<extra></extra>'
+    ))
+
+    # Time Gap Line
+    fig.add_trace(go.Scatter(
+        x=list(range(len(seq_array))),
+        y=seq_array[:, 1] * 100,
+        name='Time Gap (scaled)',
+        yaxis='y2',
+        line=dict(color='#ff2a2a', width=4, shape='spline'),
+        mode='lines+markers',
+        marker=dict(size=8, line=dict(width=2, color='rgba(255,255,255,0.5)')),
+        fill='tozeroy',
+        fillcolor='rgba(255, 42, 42, 0.1)',
+        hovertemplate='<b>Packet %{x}</b><br>Time Gap: %{y:.2f} ms<extra></extra>'
+    ))
+
+    fig.update_layout(
+        title="<b>Packet Sequence Analysis</b>",
+        height=450,
+        xaxis_title="<b>Packet Number</b>",
+        yaxis_title="<b>Packet Size (bytes)</b>",
+        yaxis2=dict(
+            title="<b>Time Gap (ms)</b>",
+            overlaying='y',
+            side='right',
+            gridcolor='rgba(255,255,255,0.05)',
+            tickfont=dict(size=12, color='#ff2a2a')
+        ),
+        showlegend=True,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit', color='#a0aec0', size=12),
+        title_font=dict(size=18, color='#ffffff', family='Outfit'),
+        xaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            showline=True,
+            linecolor='rgba(255,255,255,0.1)',
+            linewidth=2,
+            tickfont=dict(size=12)
+        ),
+        yaxis=dict(
+            gridcolor='rgba(255,255,255,0.05)',
+            showline=True,
+            linecolor='rgba(255,255,255,0.1)',
+            linewidth=2,
+            tickfont=dict(size=12, color='#17b724')
+        ),
+        legend=dict(
+            bgcolor='rgba(255,255,255,0.03)',
+            bordercolor='rgba(255,255,255,0.1)',
+            borderwidth=1,
+            font=dict(size=12),
+            x=0.02,
+            y=0.98
+        ),
+        hovermode='x unified',
+        margin=dict(l=60, r=80, t=60, b=60)
+    )
+
+    return fig
+
+
+def create_radar_chart(threat_stats):
+    categories = ['Source Pkts', 'Dest Pkts', 'Source Bytes', 'Dest Bytes', 'Duration']
+    original_categories = ['spkts', 'dpkts', 'sbytes', 'dbytes', 'dur']
+
+    fig = go.Figure()
+
+    for threat in threat_stats['prediction_label'].unique():
+        values = threat_stats[threat_stats['prediction_label'] == threat][original_categories].values[0]
+        values = values / np.max(values) * 100 if np.max(values) > 0 else values
+
+        color = COLOR_MAP.get(threat, '#ffffff')
+
+        fig.add_trace(go.Scatterpolar(
+            r=values.tolist() + [values[0]],
+            theta=categories + [categories[0]],
+            name=threat,
+            fill='toself',
+            line=dict(color=color, width=3),
+            marker=dict(size=10, line=dict(width=2, color='rgba(255,255,255,0.3)')),
+            hovertemplate='<b>%{fullData.name}</b><br>%{theta}: %{r:.1f}<extra></extra>'
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                gridcolor='rgba(255,255,255,0.1)',
+                tickfont=dict(color='#a0aec0', size=11),
+                linecolor='rgba(255,255,255,0.1)'
+            ),
+            angularaxis=dict(
+                gridcolor='rgba(255,255,255,0.1)',
+                tickfont=dict(color='#ffffff', size=12),
+                linecolor='rgba(255,255,255,0.1)'
+            ),
+            bgcolor='rgba(0,0,0,0)'
+        ),
+        title="<b>Threat Characteristics Radar</b>",
+        height=500,
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Outfit', color='#a0aec0', size=12),
+        title_font=dict(size=18, color='#ffffff', family='Outfit'),
+        legend=dict(
+            bgcolor='rgba(255,255,255,0.03)',
+            bordercolor='rgba(255,255,255,0.1)',
+            borderwidth=1,
+            font=dict(size=12)
+        ),
+        margin=dict(l=80, r=80, t=80, b=80)
+    )
+
+    return fig
+
+
+def create_3d_scatter(df):
+    if 'spkts' in df.columns and 'dpkts' in df.columns and 'sbytes' in df.columns:
+        sample_df = df.head(200)
+
+        fig = px.scatter_3d(
+            sample_df,
+            x='spkts',
+            y='dpkts',
+            z='sbytes',
+            color='prediction_label',
+            title="<b>3D Traffic Pattern Analysis</b>",
+            color_discrete_map=COLOR_MAP,
+            opacity=0.8,
+            size_max=10,
+            hover_data=['confidence']
+        )
+
+        fig.update_traces(
+            marker=dict(
+                size=6,
+                line=dict(width=0.8, color='rgba(0,0,0,0.5)')
+            ),
+            hovertemplate='<b>%{fullData.name}</b><br>Src Pkts: %{x}<br>Dst Pkts: %{y}<br>Src Bytes: %{z}<br>Confidence: %{customdata[0]:.2%}<extra></extra>'
+        )
+
+        fig.update_layout(
+            height=600,
+            paper_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Outfit', color='#a0aec0', size=12),
+            title_font=dict(size=18, color='#ffffff', family='Outfit'),
+            scene=dict(
+                bgcolor='rgba(0,0,0,0)',
+                xaxis=dict(
+                    backgroundcolor='rgba(0,0,0,0)',
+                    gridcolor='rgba(255,255,255,0.1)',
+                    title=dict(text='<b>Source Packets</b>', font=dict(size=13, color='#ffffff')),
+                    tickfont=dict(size=11, color='#a0aec0')
+                ),
+                yaxis=dict(
+                    backgroundcolor='rgba(0,0,0,0)',
+                    gridcolor='rgba(255,255,255,0.1)',
+                    title=dict(text='<b>Dest Packets</b>', font=dict(size=13, color='#ffffff')),
+                    tickfont=dict(size=11, color='#a0aec0')
+                ),
+                zaxis=dict(
+                    backgroundcolor='rgba(0,0,0,0)',
+                    gridcolor='rgba(255,255,255,0.1)',
+                    title=dict(text='<b>Source Bytes</b>', font=dict(size=13, color='#ffffff')),
+                    tickfont=dict(size=11, color='#a0aec0')
+                )
+            ),
+            legend=dict(
+                bgcolor='rgba(255,255,255,0.03)',
+                bordercolor='rgba(255,255,255,0.1)',
+                borderwidth=1,
+                font=dict(size=12)
+            ),
+            margin=dict(l=0, r=0, t=60, b=0)
+        )
+
+        return fig
+    return None
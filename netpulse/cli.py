@@ -0,0 +1,134 @@
+"""netpulse-score: score flow captures with the NET PULSE fusion model, headless."""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from netpulse import pipeline
+from netpulse.export import write_parquet
+from netpulse.parallel import DEFAULT_SHARD_ROWS, ScoringPool
+from netpulse.sequences import SequenceTemplateCache
+
+
+def _write_output(frames, path):
+    lower = path.lower()
+    if lower.endswith((".parquet", ".pq")):
+        write_parquet(frames, path)
+        return
+
+    compression = "gzip" if lower.endswith(".gz") else None
+    mode, header = "w", True
+    for frame in frames:
+        frame.to_csv(path, mode=mode, header=header, index=False, compression=compression)
+        mode, header = "a", False
+
+
+def score_file(args, artifacts, level1, totals, pool=None):
+    columns = None if args.all_columns else pipeline.input_columns(artifacts.scaler3)
+    chunks = pipeline.read_flows(args.input, chunk_rows=args.chunk_rows, columns=columns)
+    for chunk in chunks:
+        if level1 is not None:
+            predict = pool.predict if pool is not None else None
+            preds, _ = pipeline.cascade_score(artifacts, level1, chunk, args.cascade, predict=predict)
+        elif pool is not None:
+            preds = pool.score(chunk, args.dedup, totals['dedup'])
+        else:
+            preds = pipeline.score_flows(artifacts, chunk, args.dedup, totals['dedup'])
+
+        chunk = pipeline.attach_predictions(chunk, preds, artifacts.class_map)
+        if args.probabilities:
+            for idx, label in artifacts.class_map.items():
+                chunk[f"prob_{label.lower()}"] = preds[:, idx].astype(np.float32)
+
+        totals['rows'] += len(chunk)
+        totals['counts'] = totals['counts'].add(chunk['prediction_label'].value_counts(), fill_value=0)
+        yield chunk
+
+
+def default_output(path):
+    base = os.path.basename(path)
+    for ext in (".csv.gz", ".csv", ".parquet", ".pq", ".feather", ".arrow", ".ipc"):
+        if base.lower().endswith(ext):
+            base = base[:-len(ext)]
+            break
+    return os.path.join(os.path.dirname(path), f"{base}_scored.csv")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="netpulse-score",
+        description="Score network flow captures (CSV, Parquet or Feather/Arrow IPC) with the NET PULSE fusion model."
+    )
+    parser.add_argument("input", help="flow capture to score (.csv, .csv.gz, .parquet, .feather, .arrow)")
+    parser.add_argument("-o", "--output", help="scored output (.csv, .csv.gz, .parquet); default <input>_scored.csv")
+    parser.add_argument("--model-dir", help="directory holding netpulse_fusion_v2.h5 and the pickled artifacts")
+    parser.add_argument("--runtime", choices=pipeline.RUNTIMES,
+                        help="model runtime; tflite ones need a model installed by python -m netpulse.tflite "
+                             "(default: $NETPULSE_RUNTIME or keras)")
+    parser.add_argument("--chunk-rows", type=int, default=100_000,
+                        help="rows scored per chunk; bounds memory for large CSVs (default: 100000)")
+    parser.add_argument("--probabilities", action="store_true", help="also write per-class probabilities")
+    parser.add_argument("--all-columns", action="store_true",
+                        help="read every column of Parquet/Feather inputs, not just those scoring uses")
+    parser.add_argument("--cascade", type=float, metavar="CUTOFF",
+                        help="screen flows with the level-1 model first; escalate p(attack) >= CUTOFF to fusion")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for fusion scoring; 1 scores in-process (default: 1)")
+    parser.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS,
+                        help="maximum rows per worker task; chunks smaller than workers x shard rows are "
+                             f"split evenly across the workers (default: {DEFAULT_SHARD_ROWS})")
+    parser.add_argument("--dedup", action="store_true",
+                        help="score each distinct feature vector in a chunk once and copy the result to repeats")
+    parser.add_argument("--sequence-templates", type=int, default=0, metavar="N",
+                        help="memoize up to N packet-sequence templates across chunks; 0 builds every sequence "
+                             "(default: 0)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output = args.output or default_output(args.input)
+
+    start = time.perf_counter()
+    artifacts = pipeline.load_artifacts(args.model_dir, runtime=args.runtime)
+    if args.sequence_templates > 0:
+        artifacts.sequence_cache = SequenceTemplateCache(args.sequence_templates, artifacts.seq_len)
+    level1 = pipeline.load_level1(artifacts.model_dir) if args.cascade is not None else None
+    pool = None
+    if args.workers > 1:
+        pool = ScoringPool(artifacts.model_dir, args.workers, args.shard_rows, runtime=artifacts.runtime,
+                           sequence_templates=args.sequence_templates).warm_up()
+    load_seconds = time.perf_counter() - start
+
+    totals = {'rows': 0, 'counts': pd.Series(dtype='float64'), 'dedup': {}}
+    start = time.perf_counter()
+    try:
+        _write_output(score_file(args, artifacts, level1, totals, pool), output)
+    finally:
+        if pool is not None:
+            pool.close()
+    score_seconds = time.perf_counter() - start
+
+    counts = ", ".join(f"{label}={int(totals['counts'].get(label, 0)):,}" for label in artifacts.class_map.values())
+    rate = totals['rows'] / score_seconds if score_seconds > 0 else 0.0
+    dedup = totals['dedup']
+    if dedup.get('unique'):
+        counts += (f"\ndedup: {dedup['unique']:,} distinct of {dedup['rows']:,} flows "
+                   f"({dedup['rows'] / dedup['unique']:.2f}x)")
+    if artifacts.sequence_cache is not None and pool is None:
+        cache = artifacts.sequence_cache.stats()
+        counts += (f"\nsequence templates: {cache['hit_rate']:.1%} hit rate, {cache['built']:,} built "
+                   f"for {cache['rows']:,} flows, {cache['templates']:,} cached")
+    print(
+        f"scored {totals['rows']:,} flows in {score_seconds:.2f}s ({rate:,.0f} flows/s, "
+        f"model load {load_seconds:.2f}s) -> {output}\n{counts}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
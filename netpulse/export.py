@@ -0,0 +1,114 @@
+"""Write scored results to disk on a background thread, one chunk at a time.
+
+Exports take an iterable of DataFrame chunks, so a result never has to exist
+as one giant CSV string: Parquet is written a row group per chunk (zstd
+compressed), CSV is appended chunk by chunk through gzip. Files are written
+under a temporary name and renamed when complete, so a reader never sees a
+half-written export.
+"""
+import gzip
+import io
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+EXPORT_FORMATS = {'parquet': ".parquet", 'csv': ".csv.gz"}
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+def iter_frame_chunks(df, chunk_rows=DEFAULT_CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_parquet(chunks, path, compression="zstd"):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, rows = None, 0
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema, compression=compression)
+            else:
+                # Later chunks are cast to the first chunk's schema
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def write_csv(chunks, path_or_buffer, compress=True):
+    rows = 0
+    stream = gzip.open(path_or_buffer, "wt", newline="") if compress else open(path_or_buffer, "w", newline="")
+    with stream:
+        for chunk in chunks:
+            chunk.to_csv(stream, index=False, header=rows == 0)
+            rows += len(chunk)
+    return rows
+
+
+def csv_bytes(chunks):
+    """CSV payload for a download button, encoded chunk by chunk."""
+    buffer = io.BytesIO()
+    header = True
+    for chunk in chunks:
+        buffer.write(chunk.to_csv(index=False, header=header).encode())
+        header = False
+    return buffer.getvalue()
+
+
+def export_chunks(chunks, path, fmt):
+    partial = path + ".partial"
+    if fmt == 'parquet':
+        rows = write_parquet(chunks, partial)
+    elif fmt == 'csv':
+        rows = write_csv(chunks, partial)
+    else:
+        raise ValueError(f"unknown export format {fmt!r}")
+    os.replace(partial, path)
+    return {'path': path, 'rows': rows, 'bytes': os.path.getsize(path)}
+
+
+class Exporter:
+    """Single background thread that writes exports in submission order.
+
+    Jobs are keyed, so resubmitting the same result (e.g. on a Streamlit rerun)
+    returns the existing future instead of writing it again.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="netpulse-export")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, make_chunks, out_dir, name, fmt='parquet'):
+        """Queue an export of make_chunks() to out_dir/name + extension.
+
+        make_chunks is called on the export thread, so building the chunk
+        iterator (e.g. re-reading an upload) also stays off the caller's thread.
+        """
+        path = os.path.join(out_dir, name + EXPORT_FORMATS[fmt])
+        job_key = (key, os.path.abspath(out_dir), fmt)
+        with self._lock:
+            future = self._jobs.get(job_key)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._executor.submit(self._run, make_chunks, out_dir, path, fmt)
+                self._jobs[job_key] = future
+        return future
+
+    @staticmethod
+    def _run(make_chunks, out_dir, path, fmt):
+        os.makedirs(out_dir, exist_ok=True)
+        return export_chunks(make_chunks(), path, fmt)
+
+    def pending(self):
+        with self._lock:
+            return sum(not future.done() for future in self._jobs.values())
+
+    def close(self):
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,205 @@
+"""Indexes over a scored flow frame for millisecond multi-predicate queries.
+
+Built once per scored upload:
+
+- categorical columns get one row set per value: a packed bitmap for common
+  values, a sorted row-id array for rare ones (the roaring-bitmap trade-off);
+- numeric columns used for range filters are kept as (sorted values, row ids),
+  so a range is two binary searches;
+- text columns feed a token index: a sorted vocabulary and, per token, its
+  row ids stored contiguously in vocabulary order. The tokens a search term
+  prefixes are a contiguous vocabulary range, so their rows are one slice.
+  Near-unique text columns are left out unless named explicitly.
+
+Queries AND the predicates together on packed bitmaps and return row positions.
+"""
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+CATEGORICAL_COLS = ['proto', 'service', 'state', 'prediction_label']
+RANGE_COLS = ['confidence', 'sbytes', 'dur']
+# Values covering at least 1/DENSE_FRACTION of the rows are stored as bitmaps
+DENSE_FRACTION = 64
+# By default, text columns with more distinct values than this share of the
+# rows (and than NEAR_UNIQUE_MIN) are not tokenized: timestamps, flow ids and
+# the like make the build cost grow with uniqueness and are not worth searching
+NEAR_UNIQUE_FRACTION = 0.5
+NEAR_UNIQUE_MIN = 10_000
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.:\-][a-z0-9]+)*")
+
+
+def _is_text(dtype):
+    return (pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+            or isinstance(dtype, pd.CategoricalDtype))
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(str(text).lower())
+
+
+class FlowIndex:
+    def __init__(self, df, categorical_cols=None, range_cols=None, text_cols=None):
+        self.n_rows = len(df)
+        self.n_bytes = (self.n_rows + 7) // 8
+        self.categorical = {}
+        self.ranges = {}
+        self.vocabulary = np.array([], dtype=object)
+        self.token_bounds = np.zeros(1, dtype=np.int64)
+        self.token_row_ids = np.array([], dtype=np.int32)
+
+        start = time.perf_counter()
+        for col in categorical_cols or CATEGORICAL_COLS:
+            if col in df.columns:
+                self.categorical[col] = self._build_categorical(df[col])
+        for col in range_cols or RANGE_COLS:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(np.float64)
+                order = np.argsort(values, kind='stable')
+                self.ranges[col] = (values[order], order.astype(np.int32 if len(order) < 2**31 else np.int64))
+        skip_near_unique = text_cols is None
+        if text_cols is None:
+            text_cols = [c for c in df.columns if _is_text(df[c].dtype)]
+        self.text_cols = [c for c in text_cols if c in df.columns]
+        # The text columns actually indexed
+        self.token_cols = []
+        self._build_tokens(df, skip_near_unique)
+        self.build_seconds = time.perf_counter() - start
+
+    # ----- building -----
+    @staticmethod
+    def _group_rows(codes, n_groups):
+        # Row ids grouped by code with one stable sort: rows for code k are
+        # order[bounds[k]:bounds[k + 1]], already in ascending row order
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(n_groups + 1))
+        return order.astype(np.int32 if len(order) < 2**31 else np.int64), bounds
+
+    def _row_set(self, rows):
+        return self._to_bitmap(rows) if len(rows) >= max(1, self.n_rows // DENSE_FRACTION) else rows
+
+    def _build_categorical(self, series):
+        codes, uniques = pd.factorize(series.astype(str), sort=True)
+        order, bounds = self._group_rows(codes, len(uniques))
+        return {value: self._row_set(order[bounds[k]:bounds[k + 1]]) for k, value in enumerate(uniques)}
+
+    def _build_tokens(self, df, skip_near_unique):
+        # Each distinct value is tokenized once. The (value, token) pairs are
+        # sorted by token and expanded to their rows with array operations, so
+        # each token's rows come out contiguous without sorting the rows.
+        orders, starts, counts, tokens, offset = [], [], [], [], 0
+        for col in self.text_cols:
+            codes, uniques = pd.factorize(df[col].astype(str))
+            if skip_near_unique and len(uniques) > max(NEAR_UNIQUE_MIN, self.n_rows * NEAR_UNIQUE_FRACTION):
+                continue
+            order, bounds = self._group_rows(codes, len(uniques))
+            found = pd.Series(uniques, dtype=object).str.lower().str.findall(TOKEN_RE).explode().dropna()
+            pairs = pd.DataFrame({'value': found.index.to_numpy(np.int64), 'token': found.to_numpy()}).drop_duplicates()
+            value = pairs['value'].to_numpy()
+            starts.append(offset + bounds[value])
+            counts.append(bounds[value + 1] - bounds[value])
+            tokens.append(pairs['token'].to_numpy())
+            orders.append(order)
+            offset += len(order)
+            self.token_cols.append(col)
+        if not tokens or not sum(len(t) for t in tokens):
+            return
+
+        token_codes, vocabulary = pd.factorize(np.concatenate(tokens))
+        # Renumber tokens in sorted order, so the tokens a term prefixes are a
+        # contiguous code range
+        vocabulary = np.asarray(vocabulary, dtype=object)
+        by_value = np.argsort(vocabulary)
+        rank = np.empty(len(vocabulary), dtype=np.int64)
+        rank[by_value] = np.arange(len(vocabulary))
+        self.vocabulary = vocabulary[by_value]
+        token_codes = rank[token_codes]
+
+        counts = np.concatenate(counts)
+        per_token = np.bincount(token_codes, weights=counts, minlength=len(self.vocabulary))
+        self.token_bounds = np.concatenate([[0], np.cumsum(per_token.astype(np.int64))])
+        by_token = np.argsort(token_codes, kind='stable')
+        starts = np.concatenate(starts)[by_token]
+        counts = counts[by_token]
+        # Position in the concatenated orders of every row of every pair
+        first = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        self.token_row_ids = np.concatenate(orders)[first + np.arange(counts.sum())]
+
+    def token_rows(self, token):
+        k = np.searchsorted(self.vocabulary, token)
+        if k == len(self.vocabulary) or self.vocabulary[k] != token:
+            return self.token_row_ids[:0]
+        return self.token_row_ids[self.token_bounds[k]:self.token_bounds[k + 1]]
+
+    # ----- row sets -----
+    def _to_bitmap(self, rows):
+        bits = np.zeros(self.n_bytes * 8, dtype=bool)
+        bits[rows] = True
+        return np.packbits(bits)
+
+    def _as_bitmap(self, rows_or_bitmap):
+        if rows_or_bitmap.dtype == np.uint8 and len(rows_or_bitmap) == self.n_bytes:
+            return rows_or_bitmap
+        return self._to_bitmap(rows_or_bitmap)
+
+    def _union(self, sets):
+        if not sets:
+            return np.zeros(self.n_bytes, dtype=np.uint8)
+        out = self._as_bitmap(sets[0]).copy()
+        for rows in sets[1:]:
+            np.bitwise_or(out, self._as_bitmap(rows), out=out)
+        return out
+
+    # ----- predicates -----
+    def categorical_bitmap(self, col, values):
+        sets = self.categorical.get(col, {})
+        return self._union([sets[str(v)] for v in values if str(v) in sets])
+
+    def range_bitmap(self, col, low=None, high=None):
+        values, order = self.ranges[col]
+        lo = 0 if low is None else np.searchsorted(values, low, side='left')
+        hi = np.searchsorted(values, np.inf, side='right') if high is None else np.searchsorted(values, high, side='right')
+        return self._to_bitmap(order[lo:hi])
+
+    def text_bitmap(self, text):
+        # Every query token must prefix some token in the row (AND across terms)
+        result = None
+        for term in tokenize(text):
+            lo = np.searchsorted(self.vocabulary, term, side='left')
+            hi = np.searchsorted(self.vocabulary, term + "\uffff", side='left')
+            bitmap = self._to_bitmap(self.token_row_ids[self.token_bounds[lo]:self.token_bounds[hi]])
+            result = bitmap if result is None else np.bitwise_and(result, bitmap)
+        return result
+
+    def query(self, categorical=None, ranges=None, text=None):
+        """Return matching row positions (ascending) for the ANDed predicates.
+
+        categorical: {column: [values]}; an empty or missing list means no filter.
+        ranges: {column: (low, high)}; either bound may be None.
+        text: free-text terms, each matched as a token prefix.
+        """
+        bitmaps = []
+        for col, values in (categorical or {}).items():
+            if values and col in self.categorical:
+                bitmaps.append(self.categorical_bitmap(col, values))
+        for col, (low, high) in (ranges or {}).items():
+            if col in self.ranges and (low is not None or high is not None):
+                bitmaps.append(self.range_bitmap(col, low, high))
+        if text and tokenize(text):
+            bitmaps.append(self.text_bitmap(text))
+
+        if not bitmaps:
+            return np.arange(self.n_rows)
+        result = bitmaps[0].copy()
+        for bitmap in bitmaps[1:]:
+            np.bitwise_and(result, bitmap, out=result)
+        return np.flatnonzero(np.unpackbits(result, count=self.n_rows))
+
+    @property
+    def nbytes(self):
+        total = sum(v.nbytes for sets in self.categorical.values() for v in sets.values())
+        total += sum(values.nbytes + order.nbytes for values, order in self.ranges.values())
+        total += self.token_bounds.nbytes + self.token_row_ids.nbytes
+        return total
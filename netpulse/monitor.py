@@ -0,0 +1,201 @@
+"""Live flow sources for the real-time monitor: a tailed CSV/flow log or a local socket.
+
+Sources hand out only rows that arrived since the previous read, so a monitor
+never re-reads or re-scores old flows. MicroBatcher sizes each read so that
+scoring one batch stays within a latency target.
+"""
+import io
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+
+import pandas as pd
+
+READ_BYTES = 8 << 20
+TAIL_SCAN_BYTES = 64 << 10
+
+
+def _parse_lines(header, lines):
+    data = b"\n".join([header, *lines]) + b"\n"
+    return pd.read_csv(io.BytesIO(data))
+
+
+class CsvTailer:
+    """Follows a growing CSV file (header line first), like `tail -f`.
+
+    Only complete lines are consumed; a partially written last line is picked
+    up on a later read, and a tailer that skips the existing rows starts right
+    after the last complete one. If the file shrinks (rotated or truncated),
+    reading restarts after its header.
+    """
+
+    def __init__(self, path, from_start=False):
+        self.path = path
+        self.header = None
+        self.offset = 0
+        self.rows_read = 0
+        self._open_header()
+        if not from_start:
+            self.offset = self._end_of_last_line(os.path.getsize(path))
+
+    def _open_header(self):
+        with open(self.path, "rb") as f:
+            first = f.readline()
+        if not first.endswith(b"\n"):
+            raise ValueError(f"{self.path} has no complete header line yet")
+        self.header = first.rstrip(b"\r\n")
+        self.offset = len(first)
+
+    def _end_of_last_line(self, size):
+        # Offset just past the last newline before size, scanning back in blocks
+        with open(self.path, "rb") as f:
+            end = size
+            while end > self.offset:
+                start = max(self.offset, end - TAIL_SCAN_BYTES)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    return start + newline + 1
+                end = start
+        return self.offset
+
+    def pending_bytes(self):
+        return max(os.path.getsize(self.path) - self.offset, 0)
+
+    def read(self, max_rows):
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            self._open_header()
+        if size <= self.offset or max_rows <= 0:
+            return None
+
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(READ_BYTES)
+        end = data.rfind(b"\n")
+        if end < 0:
+            return None
+        lines = data[:end + 1].split(b"\n")[:-1]
+        if len(lines) > max_rows:
+            lines = lines[:max_rows]
+        self.offset += sum(len(line) + 1 for line in lines)
+        lines = [line.rstrip(b"\r") for line in lines if line.strip()]
+        if not lines:
+            return None
+        self.rows_read += len(lines)
+        return _parse_lines(self.header, lines)
+
+    def close(self):
+        pass
+
+    def describe(self):
+        return f"tailing {self.path}"
+
+
+class _LineHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Each connection starts with a CSV header line, then one flow per line
+        header = self.rfile.readline().rstrip(b"\r\n")
+        if not header:
+            return
+        for line in self.rfile:
+            line = line.rstrip(b"\r\n")
+            if line:
+                self.server.lines.put((header, line))
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SocketListener:
+    """Accepts newline-delimited CSV on a local TCP port from any number of senders.
+
+    Received lines wait in a bounded queue; when it is full, senders block, which
+    pushes back on producers instead of growing memory.
+    """
+
+    def __init__(self, port, host="127.0.0.1", max_pending=1_000_000):
+        self.server = _ThreadingServer((host, port), _LineHandler)
+        self.server.lines = queue.Queue(maxsize=max_pending)
+        self.address = self.server.server_address
+        self.rows_read = 0
+        self._thread = threading.Thread(target=self.server.serve_forever, name="netpulse-monitor", daemon=True)
+        self._thread.start()
+
+    def pending_rows(self):
+        return self.server.lines.qsize()
+
+    def read(self, max_rows):
+        batches = {}
+        for _ in range(max_rows):
+            try:
+                header, line = self.server.lines.get_nowait()
+            except queue.Empty:
+                break
+            batches.setdefault(header, []).append(line)
+        if not batches:
+            return None
+        frames = [_parse_lines(header, lines) for header, lines in batches.items()]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        self.rows_read += len(df)
+        return df
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def describe(self):
+        host, port = self.address
+        return f"listening on {host}:{port}"
+
+
+def send_csv(path, port, host="127.0.0.1", rows_per_second=None):
+    """Replay a CSV file into a SocketListener, optionally rate-limited."""
+    with socket.create_connection((host, port)) as conn, open(path, "rb") as f:
+        conn.sendall(f.readline())
+        start, sent = time.monotonic(), 0
+        for line in f:
+            conn.sendall(line)
+            sent += 1
+            if rows_per_second:
+                ahead = sent / rows_per_second - (time.monotonic() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+    return sent
+
+
+class MicroBatcher:
+    """Picks a batch size that keeps scoring latency near the target.
+
+    The per-row cost is tracked as an exponential moving average of measured
+    batches, so the batch size adapts to the model, the hardware and load.
+    """
+
+    def __init__(self, latency_target=1.0, min_rows=64, max_rows=200_000, smoothing=0.3):
+        self.latency_target = latency_target
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.smoothing = smoothing
+        self.seconds_per_row = None
+        self.last_latency = None
+
+    def batch_rows(self):
+        if not self.seconds_per_row:
+            return self.min_rows
+        rows = int(self.latency_target / self.seconds_per_row)
+        return max(self.min_rows, min(rows, self.max_rows))
+
+    def record(self, rows, seconds):
+        self.last_latency = seconds
+        if rows <= 0:
+            return
+        cost = seconds / rows
+        if self.seconds_per_row is None:
+            self.seconds_per_row = cost
+        else:
+            self.seconds_per_row += self.smoothing * (cost - self.seconds_per_row)
@@ -0,0 +1,120 @@
+"""Shard fusion scoring across a pool of worker processes."""
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from netpulse import pipeline
+
+DEFAULT_SHARD_ROWS = 50_000
+# Seconds warm_up waits for every worker to load its model
+WARM_UP_TIMEOUT = 600
+
+# Per-process artifacts, loaded once by the pool initializer
+_worker_artifacts = None
+# Barrier shared by the pool's workers, so warm_up can hand each exactly one task
+_worker_ready = None
+
+
+def _init_worker(model_dir, threads, runtime, sequence_templates, ready):
+    global _worker_artifacts, _worker_ready
+    import tensorflow as tf
+
+    # Keep workers from oversubscribing the box: each gets its share of the cores
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    _worker_artifacts = pipeline.load_artifacts(model_dir, runtime=runtime)
+    if sequence_templates:
+        from netpulse.sequences import SequenceTemplateCache
+
+        _worker_artifacts.sequence_cache = SequenceTemplateCache(sequence_templates, _worker_artifacts.seq_len)
+    _worker_ready = ready
+
+
+def _predict_shard(flows, columns):
+    artifacts = _worker_artifacts
+    sequences = artifacts.build_sequences(columns)
+    flows_scaled = artifacts.scaler3.transform(flows)
+    return artifacts.predict(flows_scaled, sequences).astype(np.float32, copy=False)
+
+
+def _await_workers(timeout):
+    # Runs after the initializer, so this worker's model is loaded; holding it
+    # at the barrier until every worker has taken one task means no worker
+    # can take two
+    _worker_ready.wait(timeout)
+    return os.getpid()
+
+
+class ScoringPool:
+    """Process pool that scores flows in shards and merges the results in input order.
+
+    Categorical encoding and feature alignment run once in the parent, so every
+    shard sees the same label codes as an unsharded run; sequence building,
+    scaling and inference run in the workers.
+    """
+
+    def __init__(self, model_dir=None, workers=None, shard_rows=DEFAULT_SHARD_ROWS, runtime=None,
+                 sequence_templates=0):
+        self.model_dir = pipeline.resolve_model_dir(model_dir)
+        self.runtime = pipeline.resolve_runtime(runtime)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.shard_rows = max(1, int(shard_rows))
+        self.scaler3 = pipeline._load_pickle(self.model_dir, pipeline.SCALER_FILE)
+        self.class_map = pipeline._load_pickle(self.model_dir, pipeline.CLASS_MAP_FILE)
+        self.categories = pipeline.load_categories(self.model_dir)
+        # Worker process ids, once warm_up has run
+        self.pids = []
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        # TensorFlow is not fork-safe, so workers are always spawned
+        context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            # sequence_templates > 0 gives each worker its own SequenceTemplateCache
+            initargs=(self.model_dir, threads, self.runtime, sequence_templates, context.Barrier(self.workers)),
+        )
+
+    def warm_up(self, timeout=WARM_UP_TIMEOUT):
+        # Block until every worker has started and loaded its model; raises
+        # threading.BrokenBarrierError if they are not all up within timeout
+        self.pids = sorted(self._executor.map(_await_workers, [timeout] * self.workers))
+        return self
+
+    def shard_size(self, n_rows):
+        # shard_rows caps a shard; smaller inputs are split evenly so every
+        # worker still gets one
+        return max(1, min(self.shard_rows, math.ceil(n_rows / self.workers)))
+
+    def predict(self, flows, df, dedup=False, stats=None):
+        # Same contract as pipeline.predict_fusion: aligned features plus the raw
+        # frame the packet sequences are built from
+        if len(flows) == 0:
+            return np.empty((0, len(self.class_map)), dtype=np.float32)
+        columns = pipeline.sequence_columns(df)
+        inverse = None
+        if dedup:
+            flows, columns, inverse = pipeline.dedup_inputs(flows, columns, stats)
+        shard_rows = self.shard_size(len(flows))
+        shards = (
+            (flows.iloc[start:start + shard_rows], tuple(col[start:start + shard_rows] for col in columns))
+            for start in range(0, len(flows), shard_rows)
+        )
+        preds = np.concatenate(list(self._executor.map(_predict_shard, *zip(*shards))))
+        return preds if inverse is None else preds[inverse]
+
+    def score(self, df, dedup=False, stats=None):
+        flows = pipeline.align_features(pipeline.encode_categoricals(df.copy(), self.categories), self.scaler3)
+        return self.predict(flows, df, dedup, stats)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,646 @@
+"""Encode -> align -> sequence -> scale -> predict, without any UI dependency."""
+import hashlib
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from functools import lru_cache, partial
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# Artifacts
+# =========================
+FUSION_FILE = "netpulse_fusion_v2.h5"
+SCALER_FILE = "scaler3.pkl"
+CLASS_MAP_FILE = "class_map.pkl"
+CONFIG_FILE = "config.pkl"
+CATEGORIES_FILE = "categories.pkl"
+LEVEL1_FILE = "netpulse_level1.h5"
+LEVEL1_SCALER_FILE = "scaler.pkl"
+# Converted fusion models (python -m netpulse.tflite), by runtime name
+TFLITE_FILES = {
+    'tflite': "netpulse_fusion_v2.tflite",
+    'tflite-dynamic': "netpulse_fusion_v2_dynamic.tflite",
+    'tflite-int8': "netpulse_fusion_v2_int8.tflite",
+}
+DEFAULT_RUNTIME = "keras"
+RUNTIMES = [DEFAULT_RUNTIME, *TFLITE_FILES]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEQ_LEN = 50
+CAT_COLS = ['proto', 'service', 'state']
+DROP_COLS = ['id', 'attack_cat', 'label', 'class3']
+RESULT_COLS = ['prediction', 'prediction_label', 'confidence', 'threat_score']
+THREAT_SCORES = {0: 0.0, 1: 0.5, 2: 1.0}
+# Code given to categorical values that were not in the training vocabulary
+UNSEEN_CODE = -1
+# Rows per call of the compiled inference function; bounds activation memory
+INFER_BATCH_ROWS = 8192
+WARMUP_ROWS = 16
+
+
+@dataclass
+class Artifacts:
+    fusion: object
+    scaler3: object
+    class_map: dict
+    config: dict
+    model_dir: str
+    categories: dict = None
+    infer: object = None
+    runtime: str = DEFAULT_RUNTIME
+    # Optional memoized sequence builder, e.g. sequences.SequenceTemplateCache
+    sequence_cache: object = None
+
+    @property
+    def seq_len(self):
+        return self.config.get("SEQ_LEN", SEQ_LEN)
+
+    def build_sequences(self, columns):
+        """Packet sequences for sequence_columns output, memoized when a cache is set."""
+        if self.sequence_cache is not None:
+            return self.sequence_cache(*columns)
+        return flows_to_sequences(*columns, seq_len=self.seq_len)
+
+    def predict(self, flows_scaled, sequences, batch_rows=INFER_BATCH_ROWS):
+        """Class probabilities (float32) for scaled flows and their sequences."""
+        if self.infer is None:
+            return self.fusion.predict([flows_scaled, sequences], verbose=0)
+        flows_scaled = np.asarray(flows_scaled, dtype=np.float32)
+        sequences = np.asarray(sequences, dtype=np.float32)
+        out = np.empty((len(flows_scaled), self.fusion.output_shape[-1]), dtype=np.float32)
+        for start in range(0, len(out), batch_rows):
+            stop = start + batch_rows
+            out[start:stop] = self.infer(flows_scaled[start:stop], sequences[start:stop])
+        return out
+
+
+def resolve_model_dir(model_dir=None):
+    # Explicit dir, then $NETPULSE_MODEL_DIR, then the working directory (how the
+    # app has always been deployed), then the repo's models/ folder.
+    if model_dir:
+        return model_dir
+    candidates = [os.environ.get("NETPULSE_MODEL_DIR"), ".", os.path.join(REPO_ROOT, "models")]
+    for candidate in candidates:
+        if candidate and os.path.exists(os.path.join(candidate, FUSION_FILE)):
+            return candidate
+    return "."
+
+
+def resolve_runtime(runtime=None):
+    # Explicit runtime, then $NETPULSE_RUNTIME, then the Keras model
+    runtime = runtime or os.environ.get("NETPULSE_RUNTIME") or DEFAULT_RUNTIME
+    if runtime not in RUNTIMES:
+        raise ValueError(f"unknown runtime {runtime!r}; expected one of {', '.join(RUNTIMES)}")
+    return runtime
+
+
+@lru_cache(maxsize=32)
+def _file_digest(path, mtime_ns, size):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def artifact_fingerprint(model_dir, runtime=None):
+    # Changes whenever the fusion model, the flow scaler, the vocabularies or
+    # the converted model the runtime scores with are replaced on disk
+    runtime = resolve_runtime(runtime)
+    parts = [] if runtime == DEFAULT_RUNTIME else [runtime]
+    for name in (FUSION_FILE, SCALER_FILE, CATEGORIES_FILE, TFLITE_FILES.get(runtime)):
+        if name is None:
+            continue
+        path = os.path.join(model_dir, name)
+        try:
+            stat = os.stat(path)
+            parts.append(_file_digest(path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            parts.append("missing")
+    return hashlib.sha256(":".join(parts).encode()).hexdigest()[:16]
+
+
+def _load_pickle(model_dir, name):
+    with open(os.path.join(model_dir, name), "rb") as f:
+        return pickle.load(f)
+
+
+def load_categories(model_dir):
+    # Training vocabularies as {column: Index of values}; a value's position is
+    # the code LabelEncoder gave it in training. None for model dirs that
+    # predate categories.pkl, which fall back to per-upload fitting.
+    if not os.path.exists(os.path.join(model_dir, CATEGORIES_FILE)):
+        return None
+    vocab = _load_pickle(model_dir, CATEGORIES_FILE)
+    return {col: pd.Index(values) for col, values in vocab.items()}
+
+
+def compile_inference(model, n_features, seq_len):
+    """Trace the fusion model once into a graph with fixed input signatures.
+
+    Only the batch dimension varies, so every batch size reuses the same trace
+    and calls skip Model.predict's per-call setup.
+    """
+    import tensorflow as tf
+
+    @tf.function(input_signature=[
+        tf.TensorSpec((None, n_features), tf.float32),
+        tf.TensorSpec((None, seq_len, 3), tf.float32),
+    ])
+    def infer(flows, sequences):
+        return model([flows, sequences], training=False)
+
+    return infer
+
+
+def warm_up(artifacts, rows=WARMUP_ROWS):
+    # Traces the inference function and initialises kernels, so the first real
+    # batch sees steady-state latency
+    n_features = artifacts.fusion.inputs[0].shape[-1]
+    artifacts.predict(
+        np.zeros((rows, n_features), dtype=np.float32),
+        np.zeros((rows, artifacts.seq_len, 3), dtype=np.float32),
+    )
+    return artifacts
+
+
+def load_artifacts(model_dir=None, compiled=True, runtime=None):
+    """Load the fusion model and its preprocessing artifacts.
+
+    runtime picks what Artifacts.predict scores with (see resolve_runtime):
+    'keras' runs the Keras model, compiled unless compiled=False; the tflite
+    runtimes run a converted model from the same directory.
+    """
+    import tensorflow as tf
+
+    model_dir = resolve_model_dir(model_dir)
+    runtime = resolve_runtime(runtime)
+    artifacts = Artifacts(
+        fusion=tf.keras.models.load_model(os.path.join(model_dir, FUSION_FILE)),
+        scaler3=_load_pickle(model_dir, SCALER_FILE),
+        class_map=_load_pickle(model_dir, CLASS_MAP_FILE),
+        config=_load_pickle(model_dir, CONFIG_FILE),
+        model_dir=model_dir,
+        categories=load_categories(model_dir),
+        runtime=runtime,
+    )
+    if runtime != DEFAULT_RUNTIME:
+        from netpulse import tflite
+
+        artifacts.infer = tflite.load_runtime(model_dir, runtime)
+        warm_up(artifacts)
+    elif compiled:
+        scaler3 = artifacts.scaler3
+        if hasattr(scaler3, 'feature_names_in_'):
+            n_features = len(scaler3.feature_names_in_)
+        else:
+            n_features = artifacts.fusion.inputs[0].shape[-1]
+        artifacts.infer = compile_inference(artifacts.fusion, n_features, artifacts.seq_len)
+        warm_up(artifacts)
+    return artifacts
+
+
+def load_level1(model_dir=None):
+    import tensorflow as tf
+
+    model_dir = resolve_model_dir(model_dir)
+    level1 = tf.keras.models.load_model(os.path.join(model_dir, LEVEL1_FILE))
+    return level1, _load_pickle(model_dir, LEVEL1_SCALER_FILE)
+
+
+# =========================
+# Input
+# =========================
+# Input columns the sequence builder reads (see sequence_columns)
+SEQUENCE_INPUT_COLS = ['spkts', 'src_pkts', 'dpkts', 'dst_pkts', 'sbytes', 'src_bytes',
+                       'dbytes', 'dst_bytes', 'dur', 'duration']
+# Row identity columns keep their stored type: ids and timestamps are
+# near-unique per row, and float32 would round numeric ones
+IDENTITY_COLS = ('id', 'time')
+COLUMNAR_FORMATS = {'.parquet': 'parquet', '.pq': 'parquet', '.feather': 'arrow',
+                    '.arrow': 'arrow', '.ipc': 'arrow', '.arrows': 'arrow'}
+
+
+def input_format(name):
+    # 'parquet', 'arrow' (Feather v2 / Arrow IPC) or 'csv'
+    return COLUMNAR_FORMATS.get(os.path.splitext(str(name).lower())[1], 'csv')
+
+
+def input_columns(scaler3, extra=()):
+    """Columns scoring needs: model features, sequence inputs and time.
+
+    None when the scaler does not record its feature names, meaning read all.
+    """
+    if scaler3 is None or not hasattr(scaler3, 'feature_names_in_'):
+        return None
+    columns = dict.fromkeys([*scaler3.feature_names_in_, *SEQUENCE_INPUT_COLS, 'time', *extra])
+    return list(columns)
+
+
+def _compact_table(table):
+    # float32 numerics and dictionary-encoded strings, which to_pandas turns into
+    # float32 and categorical columns without an intermediate float64/object copy
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    for i, field in enumerate(table.schema):
+        if field.name in IDENTITY_COLS:
+            continue
+        if pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+            column = table.column(i).cast(pa.float32(), safe=False)
+        elif pa.types.is_string(field.type) or pa.types.is_large_string(field.type):
+            column = pc.dictionary_encode(table.column(i))
+        else:
+            continue
+        table = table.set_column(i, field.name, column)
+    return table
+
+
+def _columnar_table(source, fmt, columns):
+    # Paths are memory-mapped; uploads are wrapped without copying their bytes
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if isinstance(source, (str, os.PathLike)):
+        buffer = pa.memory_map(str(source), "r")
+    else:
+        data = source.getvalue() if hasattr(source, "getvalue") else source.read()
+        buffer = pa.BufferReader(pa.py_buffer(data))
+
+    if fmt == 'parquet':
+        parquet = pq.ParquetFile(buffer)
+        present = None if columns is None else [c for c in columns if c in parquet.schema_arrow.names]
+        return parquet, present
+    try:
+        reader = pa.ipc.open_file(buffer)
+        table = reader.read_all()
+    except pa.ArrowInvalid:
+        buffer.seek(0)
+        table = pa.ipc.open_stream(buffer).read_all()
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table, None
+
+
+def _chunk_frames(tables):
+    # One RangeIndex continued across chunks, as pd.read_csv(chunksize=...)
+    # gives, so row ids are positions in the whole input
+    start = 0
+    for table in tables:
+        yield table.to_pandas().set_axis(pd.RangeIndex(start, start + table.num_rows))
+        start += table.num_rows
+
+
+def read_columnar(source, fmt='parquet', columns=None, chunk_rows=None):
+    """Read a Parquet or Feather/Arrow IPC input with only the given columns.
+
+    Returns a DataFrame, or an iterator of DataFrames when chunk_rows is set;
+    chunks are indexed by row position in the input, like CSV chunks.
+    """
+    import pyarrow as pa
+
+    table, present = _columnar_table(source, fmt, columns)
+    if fmt == 'parquet':
+        if chunk_rows:
+            batches = table.iter_batches(batch_size=chunk_rows, columns=present)
+            return _chunk_frames(_compact_table(pa.Table.from_batches([batch])) for batch in batches)
+        table = table.read(columns=present)
+    table = _compact_table(table)
+    if chunk_rows:
+        return _chunk_frames(table.slice(start, chunk_rows) for start in range(0, table.num_rows, chunk_rows))
+    return table.to_pandas()
+
+
+def read_flows(source, chunk_rows=None, columns=None, fmt=None):
+    """Read a flow capture: a path, or a file-like upload with fmt given.
+
+    Returns a DataFrame, or an iterator of DataFrames when chunk_rows is set.
+    Columnar inputs read only `columns` (see input_columns) as float32 and
+    categorical; CSV is read whole or streamed in fixed-size chunks.
+    """
+    fmt = fmt or input_format(source)
+    if fmt != 'csv':
+        return read_columnar(source, fmt, columns=columns, chunk_rows=chunk_rows)
+    return pd.read_csv(source, chunksize=chunk_rows) if chunk_rows else pd.read_csv(source)
+
+
+# =========================
+# Flow -> Sequence Conversion
+# =========================
+def flow_to_sequence(row, seq_len=SEQ_LEN):
+    spkts = int(row.get('spkts', row.get('src_pkts', 0)))
+    dpkts = int(row.get('dpkts', row.get('dst_pkts', 0)))
+    sbytes = float(row.get('sbytes', row.get('src_bytes', 0)))
+    dbytes = float(row.get('dbytes', row.get('dst_bytes', 0)))
+    dur = float(row.get('dur', row.get('duration', 0.001)) or 0.001)
+
+    src_sizes = [sbytes/spkts] * spkts if spkts > 0 else []
+    dst_sizes = [dbytes/dpkts] * dpkts if dpkts > 0 else []
+    src_times = np.linspace(0, dur, len(src_sizes)) if len(src_sizes) else []
+    dst_times = np.linspace(0, dur, len(dst_sizes)) if len(dst_sizes) else []
+    src_dir = [+1] * len(src_sizes)
+    dst_dir = [-1] * len(dst_sizes)
+
+    packets = list(zip(src_times, src_sizes, src_dir)) + \
+              list(zip(dst_times, dst_sizes, dst_dir))
+    packets.sort(key=lambda x: x[0])
+
+    seq = []
+    prev_t = 0
+    for t, size, d in packets:
+        gap = t - prev_t
+        prev_t = t
+        seq.append([size, gap, d])
+
+    if len(seq) < seq_len:
+        seq += [[0, 0, 0]] * (seq_len - len(seq))
+    else:
+        seq = seq[:seq_len]
+
+    return np.array(seq)
+
+
+# Rows per block in flows_to_sequences; bounds the (block, 2*seq_len) sort buffers
+SEQ_BLOCK_ROWS = 65536
+
+
+def _first_column(df, names, default):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return pd.Series(default, index=df.index)
+
+
+def sequence_columns(df):
+    # Same column aliases as flow_to_sequence, resolved once per frame
+    spkts = _first_column(df, ['spkts', 'src_pkts'], 0)
+    dpkts = _first_column(df, ['dpkts', 'dst_pkts'], 0)
+    sbytes = _first_column(df, ['sbytes', 'src_bytes'], 0)
+    dbytes = _first_column(df, ['dbytes', 'dst_bytes'], 0)
+    dur = _first_column(df, ['dur', 'duration'], 0.001)
+    return (
+        pd.to_numeric(spkts, errors='coerce').fillna(0).to_numpy(np.float64),
+        pd.to_numeric(dpkts, errors='coerce').fillna(0).to_numpy(np.float64),
+        pd.to_numeric(sbytes, errors='coerce').fillna(0).to_numpy(np.float64),
+        pd.to_numeric(dbytes, errors='coerce').fillna(0).to_numpy(np.float64),
+        pd.to_numeric(dur, errors='coerce').fillna(0.001).to_numpy(np.float64),
+    )
+
+
+def _direction_times(n, dur, seq_len):
+    # np.linspace(0, dur, n) for the seq_len earliest packets of every row: the
+    # first ones, or the last ones when a negative duration runs times backwards
+    idx = np.arange(seq_len, dtype=np.float64)
+    div = np.maximum(n - 1, 1)
+    packet = np.where((dur < 0)[:, None], (n - 1)[:, None] - idx[None, :], idx[None, :])
+    times = packet * (dur / div)[:, None]
+    last = packet == (n - 1)[:, None]
+    times = np.where(last & (n > 1)[:, None], dur[:, None], times)
+    return np.where(idx[None, :] < n[:, None], times, np.inf)
+
+
+def flows_to_sequences(spkts, dpkts, sbytes, dbytes, dur, seq_len=SEQ_LEN):
+    # Batch equivalent of flow_to_sequence: only the first seq_len packets of each
+    # direction can land in the truncated sequence, so each row merges at most
+    # 2 * seq_len synthetic packets with a stable sort (source wins ties).
+    spkts = np.maximum(np.trunc(np.asarray(spkts, dtype=np.float64)), 0)
+    dpkts = np.maximum(np.trunc(np.asarray(dpkts, dtype=np.float64)), 0)
+    sbytes = np.asarray(sbytes, dtype=np.float64)
+    dbytes = np.asarray(dbytes, dtype=np.float64)
+    dur = np.asarray(dur, dtype=np.float64)
+    dur = np.where(dur == 0, 0.001, dur)
+
+    n_rows = len(spkts)
+    out = np.zeros((n_rows, seq_len, 3), dtype=np.float32)
+    direction = np.concatenate([np.ones(seq_len), -np.ones(seq_len)])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, n_rows, SEQ_BLOCK_ROWS):
+            end = min(start + SEQ_BLOCK_ROWS, n_rows)
+            ns, nd, d = spkts[start:end], dpkts[start:end], dur[start:end]
+
+            times = np.concatenate([
+                _direction_times(ns, d, seq_len),
+                _direction_times(nd, d, seq_len),
+            ], axis=1)
+            order = np.argsort(times, axis=1, kind='stable')[:, :seq_len]
+            sorted_times = np.take_along_axis(times, order, axis=1)
+            valid = np.isfinite(sorted_times)
+
+            src_size = np.where(ns > 0, sbytes[start:end] / ns, 0)
+            dst_size = np.where(nd > 0, dbytes[start:end] / nd, 0)
+            is_src = order < seq_len
+            sizes = np.where(is_src, src_size[:, None], dst_size[:, None])
+
+            sorted_times = np.where(valid, sorted_times, 0)
+            gaps = np.diff(sorted_times, axis=1, prepend=0)
+
+            block = out[start:end]
+            block[..., 0] = np.where(valid, sizes, 0)
+            block[..., 1] = np.where(valid, gaps, 0)
+            block[..., 2] = np.where(valid, direction[order], 0)
+
+    return out
+
+
+# =========================
+# Scoring
+# =========================
+def encode_categoricals(flows, categories=None):
+    for col in CAT_COLS:
+        if col not in flows.columns:
+            continue
+        if categories is not None and col in categories:
+            values = flows[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Look up each category once, then broadcast through the codes
+                lookup = categories[col].get_indexer(values.cat.categories.astype(str))
+                codes = np.append(lookup, UNSEEN_CODE)[values.cat.codes.to_numpy()]
+                flows[col] = codes.astype(np.int16)
+                continue
+            if values.dtype != object:
+                values = values.astype(str)
+            flows[col] = categories[col].get_indexer(values).astype(np.int16)
+        else:
+            from sklearn.preprocessing import LabelEncoder
+
+            le = LabelEncoder()
+            flows[col] = le.fit_transform(flows[col].astype(str))
+    return flows
+
+
+def align_features(flows, scaler3):
+    flows = flows.drop(columns=DROP_COLS, errors='ignore')
+    if scaler3 is not None and hasattr(scaler3, 'feature_names_in_'):
+        flows = flows.reindex(columns=scaler3.feature_names_in_)
+    return flows
+
+
+def unique_inputs(flows, columns):
+    """Distinct model inputs among the rows of an aligned feature frame.
+
+    A row's input is its encoded feature vector plus its sequence columns
+    (see sequence_columns). Rows are grouped by a 64-bit hash of both, and
+    the grouping is checked value for value, so a hash collision cannot merge
+    different flows. Returns (first, inverse): first[i] is a row holding the
+    i-th distinct input and inverse[j] the distinct input of row j, or None
+    when the check fails.
+    """
+    matrix = np.column_stack([flows.to_numpy(np.float64), *columns])
+    hashes = pd.util.hash_pandas_object(pd.DataFrame(matrix), index=False).to_numpy()
+    _, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+    if not np.array_equal(matrix[first][inverse], matrix, equal_nan=True):
+        return None
+    return first, inverse
+
+
+def dedup_inputs(flows, columns, stats=None):
+    """Keep one row per distinct model input.
+
+    Returns (flows, columns, inverse); score the reduced rows and index the
+    result with inverse to scatter it back to every row. inverse is None when
+    every row is distinct, and the inputs come back unchanged. stats, when
+    given, accumulates 'rows' and 'unique' counts.
+    """
+    grouping = unique_inputs(flows, columns) if len(flows) else None
+    if stats is not None:
+        stats['rows'] = stats.get('rows', 0) + len(flows)
+        stats['unique'] = stats.get('unique', 0) + (len(grouping[0]) if grouping else len(flows))
+    if grouping is None or len(grouping[0]) == len(flows):
+        return flows, columns, None
+    first, inverse = grouping
+    return flows.iloc[first], tuple(column[first] for column in columns), inverse
+
+
+def predict_fusion(artifacts, flows, df, dedup=False, stats=None):
+    columns = sequence_columns(df)
+    inverse = None
+    if dedup:
+        flows, columns, inverse = dedup_inputs(flows, columns, stats)
+    sequences = artifacts.build_sequences(columns)
+    flows_scaled = artifacts.scaler3.transform(flows)
+    preds = artifacts.predict(flows_scaled, sequences)
+    return preds if inverse is None else preds[inverse]
+
+
+def prepare_inputs(artifacts, df):
+    # Model inputs (scaled float32 flows, packet sequences) for a raw flow frame
+    flows = align_features(encode_categoricals(df.copy(), artifacts.categories), artifacts.scaler3)
+    sequences = artifacts.build_sequences(sequence_columns(df))
+    return artifacts.scaler3.transform(flows).astype(np.float32), sequences
+
+
+def score_flows(artifacts, df, dedup=False, stats=None):
+    flows = align_features(encode_categoricals(df.copy(), artifacts.categories), artifacts.scaler3)
+    return predict_fusion(artifacts, flows, df, dedup, stats)
+
+
+def attach_predictions(df, preds, class_map):
+    # int8 codes, a categorical label over every class (so counts and chunks
+    # line up), float32 confidence and a table lookup for the threat score
+    codes = preds.argmax(axis=1).astype(np.int8)
+    labels = [class_map[k] for k in sorted(class_map)]
+    scores = np.array([THREAT_SCORES.get(k, 0.0) for k in sorted(class_map)], dtype=np.float32)
+    df['prediction'] = codes
+    df['prediction_label'] = pd.Categorical.from_codes(codes, categories=labels)
+    df['confidence'] = preds.max(axis=1).astype(np.float32)
+    df['threat_score'] = scores[codes]
+    return df
+
+
+def compact_dtypes(df, max_category_ratio=0.5, keep=IDENTITY_COLS):
+    """Downcast a frame in place: smallest integers, float32, categorical strings.
+
+    String columns become categorical when they repeat enough to pay off
+    (distinct values at most max_category_ratio of the rows); near-unique ones
+    such as timestamps stay as they are. Columns in keep are left untouched;
+    pass the model inputs (see input_columns) so scoring sees the values as
+    read, not float32-rounded ones.
+    """
+    keep = set(keep or ())
+    for col in df.columns:
+        if col in keep:
+            continue
+        values = df[col]
+        if pd.api.types.is_bool_dtype(values.dtype):
+            continue
+        if pd.api.types.is_integer_dtype(values.dtype):
+            df[col] = pd.to_numeric(values, downcast='integer')
+        elif pd.api.types.is_float_dtype(values.dtype):
+            df[col] = values.astype(np.float32)
+        elif pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+            if values.nunique(dropna=False) <= max_category_ratio * max(len(values), 1):
+                df[col] = values.astype('category')
+    return df
+
+
+# =========================
+# Cascade Scoring
+# =========================
+# The level-1 binary model (Dense 64 -> 32 -> 1) screens every flow; only flows
+# whose attack probability reaches the cutoff are sequenced and scored by the
+# fusion model. Screened flows are labelled Normal with confidence 1 - p(attack),
+# the remaining mass spread evenly over the threat classes.
+def level1_features(encoded, scaler1):
+    names = list(scaler1.feature_names_in_)
+    flows = encoded.drop(columns=['id', 'label', 'class3'], errors='ignore').reindex(columns=names)
+    # The level-1 notebook kept attack_cat as an input feature; it is a label, so
+    # pin it to its training mean (0 after scaling) instead of trusting the upload.
+    if 'attack_cat' in names:
+        flows['attack_cat'] = scaler1.mean_[names.index('attack_cat')]
+    return scaler1.transform(flows)
+
+
+def cascade_score(artifacts, level1, df, cutoff, measure_agreement=False, predict=None):
+    # predict(flows, df) scores the escalated flows; defaults to in-process fusion
+    predict = predict or partial(predict_fusion, artifacts)
+    model1, scaler1 = level1
+    n_rows = len(df)
+    n_classes = len(artifacts.class_map)
+    stats = {'cutoff': cutoff, 'total_flows': n_rows}
+
+    start = time.perf_counter()
+    encoded = encode_categoricals(df.copy(), artifacts.categories)
+    p_attack = model1.predict(level1_features(encoded, scaler1), verbose=0).ravel()
+    stats['level1_seconds'] = time.perf_counter() - start
+
+    escalate = p_attack >= cutoff
+    preds = np.empty((n_rows, n_classes), dtype=np.float32)
+    preds[:, 0] = 1 - p_attack
+    preds[:, 1:] = (p_attack / (n_classes - 1))[:, None]
+
+    flows = align_features(encoded, artifacts.scaler3)
+    start = time.perf_counter()
+    if escalate.any():
+        preds[escalate] = predict(flows[escalate], df[escalate])
+    stats['fusion_seconds'] = time.perf_counter() - start
+    stats['escalated_flows'] = int(escalate.sum())
+
+    if measure_agreement:
+        start = time.perf_counter()
+        full = predict(flows, df).argmax(axis=1)
+        stats['full_fusion_seconds'] = time.perf_counter() - start
+        stats['agreement_rate'] = float((full == preds.argmax(axis=1)).mean()) if n_rows else 1.0
+        stats['missed_threats'] = int(((full != 0) & ~escalate).sum())
+
+    return preds, stats
+
+
+def merge_cascade_stats(total, stats):
+    """Fold the cascade_score stats of another chunk into total (None starts a new one)."""
+    if total is None:
+        return dict(stats)
+    n_total, n_chunk = total['total_flows'], stats['total_flows']
+    if 'agreement_rate' in stats:
+        n = n_total + n_chunk
+        rate = total.get('agreement_rate', 1.0)
+        total['agreement_rate'] = (rate * n_total + stats['agreement_rate'] * n_chunk) / n if n else 1.0
+    for key in ('total_flows', 'escalated_flows', 'missed_threats',
+                'level1_seconds', 'fusion_seconds', 'full_fusion_seconds'):
+        if key in stats:
+            total[key] = total.get(key, 0) + stats[key]
+    return total
@@ -0,0 +1,87 @@
+"""Wall-clock timing spans and optional cProfile capture for a scoring run."""
+import cProfile
+import io
+import json
+import pstats
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+
+class StageTimer:
+    """Records named spans; spans sharing a name are summed in the summary."""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, name, rows=None):
+        # Yields the span record, so rows can be filled in once they are known
+        start = time.perf_counter()
+        record = {'name': name, 'start': start - self.origin, 'seconds': 0.0, 'rows': rows}
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self.spans.append(record)
+
+    def timed(self, fn, name=None):
+        # Wrap a callable so each call is recorded under its own name
+        name = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def summary(self):
+        stages = {}
+        for span in self.spans:
+            stage = stages.setdefault(span['name'], {'name': span['name'], 'calls': 0, 'seconds': 0.0, 'rows': None})
+            stage['calls'] += 1
+            stage['seconds'] += span['seconds']
+            if span['rows'] is not None:
+                stage['rows'] = (stage['rows'] or 0) + span['rows']
+        for stage in stages.values():
+            rows, seconds = stage['rows'], stage['seconds']
+            stage['flows_per_sec'] = rows / seconds if rows and seconds > 0 else None
+        return list(stages.values())
+
+    @property
+    def total_seconds(self):
+        return sum(span['seconds'] for span in self.spans)
+
+    def to_json(self, **meta):
+        return json.dumps({**meta, 'summary': self.summary(), 'spans': self.spans}, indent=2)
+
+
+class Profiler:
+    """cProfile capture that is a no-op unless enabled."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._profile = cProfile.Profile() if enabled else None
+
+    def start(self):
+        if self._profile is not None:
+            self._profile.enable()
+        return self
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def report(self, limit=40, sort='cumulative'):
+        if self._profile is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
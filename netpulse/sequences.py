@@ -0,0 +1,113 @@
+"""Bounded LRU of packet-sequence templates.
+
+A flow's packet sequence is a pure function of five numbers: its packet
+counts, byte counts and duration (see pipeline.flow_to_sequence). Real
+captures repeat those tuples heavily (single-packet probes, fixed-size
+beacons, the same handshake over and over), so far fewer sequences are
+distinct than there are rows. SequenceTemplateCache builds each distinct
+sequence once with pipeline.flows_to_sequences, keeps the most recently used
+ones, and assembles a batch by indexing into them.
+
+Keys are the inputs as flows_to_sequences sees them: packet counts truncated
+to whole packets and a zero duration replaced by 0.001, so every key maps to
+exactly the sequence the uncached builder would produce. With decimals set,
+byte counts and durations are also rounded to that many decimal places first,
+which raises the hit rate on noisy durations at the cost of the sequences no
+longer matching the unrounded ones bit for bit.
+
+    templates = SequenceTemplateCache()
+    sequences = templates(*pipeline.sequence_columns(df))
+    templates.stats()  # {'rows': ..., 'built': ..., 'hit_rate': ..., ...}
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from netpulse import pipeline
+
+# 50 x 3 float32 templates take 600 bytes each: about 20MB when full
+DEFAULT_MAX_TEMPLATES = 32768
+
+
+class SequenceTemplateCache:
+    """Callable like pipeline.flows_to_sequences (without seq_len), memoized.
+
+    Thread-safe, so one cache can be shared by every session of the app.
+    """
+
+    def __init__(self, max_templates=DEFAULT_MAX_TEMPLATES, seq_len=pipeline.SEQ_LEN, decimals=None):
+        self.max_templates = max(1, int(max_templates))
+        self.seq_len = seq_len
+        self.decimals = decimals
+        self._templates = OrderedDict()
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.built = 0
+        self.evictions = 0
+
+    def keys(self, spkts, dpkts, sbytes, dbytes, dur):
+        """Normalized (n, 5) float64 key matrix for the builder's inputs."""
+        spkts = np.maximum(np.trunc(np.asarray(spkts, dtype=np.float64)), 0)
+        dpkts = np.maximum(np.trunc(np.asarray(dpkts, dtype=np.float64)), 0)
+        sbytes = np.asarray(sbytes, dtype=np.float64)
+        dbytes = np.asarray(dbytes, dtype=np.float64)
+        dur = np.asarray(dur, dtype=np.float64)
+        dur = np.where(dur == 0, 0.001, dur)
+        if self.decimals is not None:
+            sbytes, dbytes, dur = (np.round(x, self.decimals) for x in (sbytes, dbytes, dur))
+        # + 0.0 folds -0.0 into 0.0 so equal values share a key
+        return np.column_stack([spkts, dpkts, sbytes, dbytes, dur]) + 0.0
+
+    def __call__(self, spkts, dpkts, sbytes, dbytes, dur):
+        keys = np.ascontiguousarray(self.keys(spkts, dpkts, sbytes, dbytes, dur))
+        if len(keys) == 0:
+            return np.zeros((0, self.seq_len, 3), dtype=np.float32)
+        # One bytes key per row; np.unique groups repeats within the batch
+        packed = keys.view(np.dtype((np.void, keys.shape[1] * keys.itemsize))).ravel()
+        unique, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+        unique = unique.tolist()
+
+        with self._lock:
+            found = [self._templates.get(key) for key in unique]
+            for key, template in zip(unique, found):
+                if template is not None:
+                    self._templates.move_to_end(key)
+        missing = [i for i, template in enumerate(found) if template is None]
+        if missing:
+            rows = keys[first[missing]]
+            built = pipeline.flows_to_sequences(*rows.T, seq_len=self.seq_len)
+            for i, template in zip(missing, built):
+                # A copy, so a cached template does not pin the whole block
+                found[i] = template.copy()
+
+        with self._lock:
+            for i in missing:
+                self._templates[unique[i]] = found[i]
+            overflow = len(self._templates) - self.max_templates
+            for _ in range(max(overflow, 0)):
+                self._templates.popitem(last=False)
+            self.evictions += max(overflow, 0)
+            self.rows += len(keys)
+            self.built += len(missing)
+        return np.stack(found)[inverse.ravel()]
+
+    # ----- metrics -----
+    def stats(self):
+        with self._lock:
+            rows, built = self.rows, self.built
+            return {
+                'templates': len(self._templates),
+                'max_templates': self.max_templates,
+                'rows': rows,
+                'built': built,
+                'hits': rows - built,
+                # Share of rows whose sequence was not built from scratch
+                'hit_rate': (rows - built) / rows if rows else 0.0,
+                'evictions': self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self.rows = self.built = self.evictions = 0
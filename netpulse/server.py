@@ -0,0 +1,344 @@
+"""netpulse-serve: a local HTTP scoring service around the NET PULSE pipeline.
+
+    netpulse-serve --port 9600
+    curl -s --data-binary @flows.jsonl -H 'Content-Type: application/x-ndjson' localhost:9600/score
+
+Endpoints:
+
+- POST /score: a batch of flow records, as JSON lines (application/x-ndjson;
+  a JSON array also works) or Arrow IPC (application/vnd.apache.arrow.stream
+  or .file). Returns one result per record, in order: prediction, label,
+  confidence and prob_<class>, plus the record's `id` when it has one. The
+  response uses the request's format unless Accept asks for the other.
+- GET /health: model, runtime, uptime, counters and the batcher's queue state.
+- GET /latency: request latency histograms, per endpoint.
+
+Connections are kept alive (HTTP/1.1). Each request is parsed and encoded on
+its own thread; inference from all of them goes through one InferenceBatcher,
+so concurrent clients share batches. The service binds to 127.0.0.1 unless
+told otherwise.
+"""
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from netpulse import pipeline
+from netpulse.batching import DEFAULT_MAX_WAIT, batched_artifacts
+
+DEFAULT_PORT = 9600
+DEFAULT_MAX_BODY_MB = 64
+JSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json")
+ARROW_TYPES = ("application/vnd.apache.arrow.stream", "application/vnd.apache.arrow.file")
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyHistogram:
+    """Request latencies in fixed buckets; percentiles are interpolated within a bucket."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.bounds = np.asarray(buckets_ms, dtype=np.float64)
+        self.counts = np.zeros(len(self.bounds) + 1, dtype=np.int64)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[np.searchsorted(self.bounds, ms)] += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def _percentile(self, counts, q):
+        cumulative = np.cumsum(counts)
+        target = q * cumulative[-1]
+        k = int(np.searchsorted(cumulative, target))
+        if k >= len(self.bounds):
+            return self.max_ms
+        lower = float(self.bounds[k - 1]) if k else 0.0
+        upper = min(float(self.bounds[k]), self.max_ms)
+        below = cumulative[k - 1] if k else 0
+        return float(lower + (upper - lower) * (target - below) / counts[k])
+
+    def snapshot(self):
+        with self._lock:
+            counts, total_ms, max_ms = self.counts.copy(), self.total_ms, self.max_ms
+        n = int(counts.sum())
+        labels = [f"{b:g}" for b in self.bounds] + ["+Inf"]
+        return {
+            'count': n,
+            'mean_ms': total_ms / n if n else 0.0,
+            'max_ms': max_ms,
+            'p50_ms': self._percentile(counts, 0.50) if n else 0.0,
+            'p95_ms': self._percentile(counts, 0.95) if n else 0.0,
+            'p99_ms': self._percentile(counts, 0.99) if n else 0.0,
+            # Cumulative, like a Prometheus histogram: requests at or under each bound
+            'buckets': dict(zip(labels, np.cumsum(counts).tolist())),
+        }
+
+
+class ScoringService:
+    """Parses, scores and renders /score requests; shared by all handler threads."""
+
+    def __init__(self, artifacts, max_batch_rows=pipeline.INFER_BATCH_ROWS, max_wait=DEFAULT_MAX_WAIT):
+        self.artifacts, self.batcher = batched_artifacts(artifacts, max_batch_rows=max_batch_rows, max_wait=max_wait)
+        self.columns = pipeline.input_columns(artifacts.scaler3, extra=('id',))
+        self.labels = [artifacts.class_map[k] for k in sorted(artifacts.class_map)]
+        self.fingerprint = pipeline.artifact_fingerprint(artifacts.model_dir, artifacts.runtime)
+        self.latency = {'/score': LatencyHistogram(), '/health': LatencyHistogram(), '/latency': LatencyHistogram()}
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.flows_scored = 0
+        self._lock = threading.Lock()
+
+    # ----- /score -----
+    def parse(self, body, content_type):
+        if not body:
+            raise RequestError(400, "empty request body")
+        if content_type in ARROW_TYPES:
+            try:
+                return pipeline.read_flows(io.BytesIO(body), columns=self.columns, fmt='arrow')
+            except Exception as e:
+                raise RequestError(400, f"invalid Arrow IPC body: {e}")
+        if content_type in JSON_TYPES or not content_type:
+            if body.lstrip()[:1] != b"[":
+                # JSON lines become one array, parsed in a single json.loads call
+                # (several times faster than pd.read_json's per-column type inference)
+                body = b"[" + b",".join(line for line in body.splitlines() if line.strip()) + b"]"
+            try:
+                return pd.DataFrame.from_records(json.loads(body))
+            except ValueError as e:
+                raise RequestError(400, f"invalid JSON body: {e}")
+        raise RequestError(415, f"unsupported Content-Type {content_type!r}; "
+                                f"send one of {', '.join(JSON_TYPES + ARROW_TYPES)}")
+
+    def score(self, df):
+        if len(df) == 0:
+            raise RequestError(400, "no flow records in the request")
+        probs = pipeline.score_flows(self.artifacts, df)
+        codes = probs.argmax(axis=1).astype(np.int8)
+        out = pd.DataFrame({
+            'prediction': codes,
+            'label': pd.Categorical.from_codes(codes, categories=self.labels),
+            'confidence': probs.max(axis=1).astype(np.float32),
+        })
+        for k, label in enumerate(self.labels):
+            out[f"prob_{label.lower()}"] = probs[:, k].astype(np.float32)
+        if 'id' in df.columns:
+            out.insert(0, 'id', df['id'].to_numpy())
+        with self._lock:
+            self.flows_scored += len(out)
+        return out
+
+    @staticmethod
+    def render(out, arrow):
+        if arrow:
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(out, preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes(), ARROW_TYPES[0]
+        body = out.to_json(orient='records', lines=True, double_precision=6) if len(out) else ""
+        return body.encode(), JSON_TYPES[0]
+
+    # ----- /health -----
+    def health(self):
+        with self._lock:
+            counters = {'requests': self.requests, 'errors': self.errors, 'flows_scored': self.flows_scored}
+        return {
+            'status': "ok",
+            'model_dir': self.artifacts.model_dir,
+            'runtime': self.artifacts.runtime,
+            'model_fingerprint': self.fingerprint,
+            'classes': self.labels,
+            'uptime_seconds': round(time.time() - self.started, 1),
+            **counters,
+            'batcher': self.batcher.stats(),
+        }
+
+    def latency_report(self):
+        return {path: histogram.snapshot() for path, histogram in self.latency.items()}
+
+    def count(self, error=False):
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+
+    def close(self):
+        self.batcher.close()
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "netpulse-serve"
+    # Idle keep-alive connections are closed after this many seconds
+    timeout = 60
+    # Headers and body go out as separate writes; without TCP_NODELAY the body
+    # waits on the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        start = time.perf_counter()
+        if path == "/health":
+            self._send_json(200, self.service.health())
+        elif path == "/latency":
+            self._send_json(200, self.service.latency_report())
+        else:
+            self._send_json(404, {'error': f"no such endpoint {path}"})
+            return
+        self.service.latency[path].record(time.perf_counter() - start)
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        if path != "/score":
+            self._discard_body()
+            self._send_json(404, {'error': f"no such endpoint {path}"})
+            return
+        start = time.perf_counter()
+        try:
+            content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            df = self.service.parse(self._read_body(), content_type)
+            out = self.service.score(df)
+            accept = self.headers.get("Accept", "")
+            arrow = any(t in accept for t in ARROW_TYPES) or (content_type in ARROW_TYPES and "json" not in accept)
+            body, response_type = self.service.render(out, arrow)
+        except RequestError as e:
+            self.service.count(error=True)
+            self._send_json(e.status, {'error': str(e)})
+            return
+        except Exception as e:
+            self.service.count(error=True)
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+            return
+        self._send(200, body, response_type, {'X-Flows': str(len(out))})
+        self.service.count()
+        self.service.latency[path].record(time.perf_counter() - start)
+
+    def _content_length(self):
+        # Without a valid length the end of the body is unknown, so the
+        # connection is closed after the error response
+        value = self.headers.get("Content-Length")
+        if value is None:
+            self.close_connection = True
+            raise RequestError(411, "Content-Length required")
+        try:
+            length = int(value)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            raise RequestError(400, f"invalid Content-Length {value!r}")
+        return length
+
+    def _read_body(self):
+        length = self._content_length()
+        if length > self.server.max_body_bytes:
+            self._discard_body()
+            raise RequestError(413, f"request body over {self.server.max_body_bytes >> 20} MB")
+        return self.rfile.read(length)
+
+    def _discard_body(self):
+        # Keeps the connection usable for the client's next request
+        try:
+            remaining = self._content_length()
+        except RequestError:
+            return
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 1 << 20))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, service, max_body_bytes=DEFAULT_MAX_BODY_MB << 20, verbose=False):
+        super().__init__(address, ScoringHandler)
+        self.service = service
+        self.max_body_bytes = max_body_bytes
+        self.verbose = verbose
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="netpulse-serve",
+        description="Serve NET PULSE fusion-model verdicts over local HTTP (JSON lines or Arrow IPC)."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--model-dir", help="directory holding netpulse_fusion_v2.h5 and the pickled artifacts")
+    parser.add_argument("--runtime", choices=pipeline.RUNTIMES, help="model runtime (default: $NETPULSE_RUNTIME or keras)")
+    parser.add_argument("--max-batch-rows", type=int, default=pipeline.INFER_BATCH_ROWS,
+                        help="largest inference batch concurrent requests are merged into "
+                             f"(default: {pipeline.INFER_BATCH_ROWS})")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT * 1000,
+                        help=f"how long to wait for requests to merge (default: {DEFAULT_MAX_WAIT * 1000:g})")
+    parser.add_argument("--max-body-mb", type=int, default=DEFAULT_MAX_BODY_MB,
+                        help=f"largest accepted request body (default: {DEFAULT_MAX_BODY_MB})")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    artifacts = pipeline.load_artifacts(args.model_dir, runtime=args.runtime)
+    service = ScoringService(artifacts, args.max_batch_rows, args.max_wait_ms / 1000)
+    server = ScoringServer((args.host, args.port), service, args.max_body_mb << 20, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"netpulse-serve: {artifacts.runtime} model loaded in {time.perf_counter() - start:.2f}s; "
+          f"listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
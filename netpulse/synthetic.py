@@ -0,0 +1,173 @@
+"""Seeded generator of UNSW-NB15-shaped flow records, for benchmarks and load tests.
+
+Categorical mixes follow the UNSW-NB15 training split (tcp/udp dominated, most
+udp flows are dns, most tcp flows end in FIN). Packet and byte counts are
+Pareto-tailed, so a few flows are orders of magnitude larger than the median,
+and the derived rate/load/inter-packet columns are computed from them.
+"""
+import numpy as np
+import pandas as pd
+
+from netpulse.export import write_parquet
+
+# Column order of scaler3.feature_names_in_
+FLOW_COLUMNS = [
+    'dur', 'proto', 'service', 'state', 'spkts', 'dpkts', 'sbytes', 'dbytes', 'rate', 'sttl', 'dttl',
+    'sload', 'dload', 'sloss', 'dloss', 'sinpkt', 'dinpkt', 'sjit', 'djit', 'swin', 'stcpb', 'dtcpb',
+    'dwin', 'tcprtt', 'synack', 'ackdat', 'smean', 'dmean', 'trans_depth', 'response_body_len',
+    'ct_srv_src', 'ct_state_ttl', 'ct_dst_ltm', 'ct_src_dport_ltm', 'ct_dst_sport_ltm', 'ct_dst_src_ltm',
+    'is_ftp_login', 'ct_ftp_cmd', 'ct_flw_http_mthd', 'ct_src_ltm', 'ct_srv_dst', 'is_sm_ips_ports',
+]
+
+PROTOS = {
+    'tcp': 0.455, 'udp': 0.36, 'unas': 0.069, 'arp': 0.016, 'ospf': 0.015,
+    'sctp': 0.007, 'icmp': 0.004, 'any': 0.004, 'gre': 0.004, 'ipv6': 0.004,
+    # Long tail of rare protocols, as in the dataset
+    'pim': 0.002, 'rsvp': 0.002, 'igmp': 0.002, 'swipe': 0.002, 'mobile': 0.002,
+    'sun-nd': 0.002, 'sep': 0.002, 'ib': 0.002, 'ggp': 0.002, 'xns-idp': 0.002, 'egp': 0.002,
+}
+SERVICES = {
+    'tcp': {'-': 0.5, 'http': 0.2, 'smtp': 0.06, 'ftp-data': 0.1, 'ftp': 0.08,
+            'ssh': 0.03, 'pop3': 0.02, 'ssl': 0.005, 'irc': 0.005},
+    'udp': {'dns': 0.75, '-': 0.24, 'snmp': 0.004, 'dhcp': 0.004, 'radius': 0.002},
+}
+STATES = {
+    'tcp': {'FIN': 0.78, 'CON': 0.1, 'INT': 0.08, 'REQ': 0.02, 'RST': 0.02},
+    'udp': {'INT': 0.8, 'CON': 0.18, 'REQ': 0.02},
+    'arp': {'INT': 0.97, 'REQ': 0.03},
+}
+DEFAULT_STATES = {'INT': 0.99, 'ECO': 0.005, 'REQ': 0.005}
+
+START_TIME = pd.Timestamp('2024-01-01')
+FLOWS_PER_SECOND = 20.0
+
+
+def _choice(rng, weights, n):
+    values = np.array(list(weights), dtype=object)
+    p = np.array(list(weights.values()), dtype=np.float64)
+    return values[rng.choice(len(values), size=n, p=p / p.sum())]
+
+
+def _conditional(rng, key, tables, default, n):
+    out = np.empty(n, dtype=object)
+    for value in np.unique(key):
+        mask = key == value
+        out[mask] = _choice(rng, tables.get(value, default), int(mask.sum()))
+    return out
+
+
+def _heavy_tail(rng, n, alpha, scale, cap):
+    # Pareto (Lomax) tail: median around scale, occasional values near cap
+    return np.minimum(np.floor(rng.pareto(alpha, n) * scale), cap)
+
+
+def generate_flows(n_rows, seed=0, offset=0, feature_names=None, with_time=True):
+    """Return n_rows synthetic flows; the same (seed, offset) always gives the same rows."""
+    rng = np.random.default_rng([seed, offset])
+    n = int(n_rows)
+
+    proto = _choice(rng, PROTOS, n)
+    service = _conditional(rng, proto, SERVICES, {'-': 1.0}, n)
+    state = _conditional(rng, proto, STATES, DEFAULT_STATES, n)
+    tcp = proto == 'tcp'
+    answered = state != 'INT'
+
+    spkts = 1 + _heavy_tail(rng, n, 1.3, 4, 100_000)
+    dpkts = np.where(answered, _heavy_tail(rng, n, 1.2, 6, 100_000), 0)
+    smean = np.clip(rng.lognormal(4.5, 0.9, n), 28, 1500).round()
+    dmean = np.where(dpkts > 0, np.clip(rng.lognormal(5.5, 1.2, n), 28, 1500).round(), 0)
+    sbytes = spkts * smean
+    dbytes = dpkts * dmean
+
+    dur = np.where(spkts + dpkts > 1, np.clip(rng.lognormal(-2.5, 2.2, n), 1e-6, 60.0), 0.0)
+    safe_dur = np.where(dur > 0, dur, 1.0)
+    rate = np.where(dur > 0, (spkts + dpkts - 1) / safe_dur, 0.0)
+    sinpkt = np.where(spkts > 1, dur * 1000 / np.maximum(spkts - 1, 1), 0.0)
+    dinpkt = np.where(dpkts > 1, dur * 1000 / np.maximum(dpkts - 1, 1), 0.0)
+
+    tcp_rtt = np.where(tcp & answered, rng.exponential(0.03, n), 0.0)
+    synack = tcp_rtt * rng.uniform(0.3, 0.7, n)
+    window = np.where(tcp & answered, 255, 0)
+    http = service == 'http'
+    ftp = (service == 'ftp') | (service == 'ftp-data')
+
+    def counter(scale):
+        return 1 + _heavy_tail(rng, n, 1.5, scale, 60)
+
+    flows = {
+        'dur': dur,
+        'proto': proto,
+        'service': service,
+        'state': state,
+        'spkts': spkts.astype(np.int64),
+        'dpkts': dpkts.astype(np.int64),
+        'sbytes': sbytes.astype(np.int64),
+        'dbytes': dbytes.astype(np.int64),
+        'rate': rate,
+        'sttl': rng.choice([254, 62, 31, 0], size=n, p=[0.45, 0.4, 0.1, 0.05]),
+        'dttl': np.where(answered, rng.choice([252, 60, 29], size=n, p=[0.4, 0.5, 0.1]), 0),
+        'sload': np.where(dur > 0, sbytes * 8 / safe_dur, 0.0),
+        'dload': np.where(dur > 0, dbytes * 8 / safe_dur, 0.0),
+        'sloss': rng.binomial(spkts.astype(np.int64), 0.01),
+        'dloss': rng.binomial(dpkts.astype(np.int64), 0.01),
+        'sinpkt': sinpkt,
+        'dinpkt': dinpkt,
+        'sjit': sinpkt * rng.lognormal(0, 1, n),
+        'djit': dinpkt * rng.lognormal(0, 1, n),
+        'swin': window,
+        'stcpb': np.where(window > 0, rng.integers(0, 2**32, n), 0),
+        'dtcpb': np.where(window > 0, rng.integers(0, 2**32, n), 0),
+        'dwin': window,
+        'tcprtt': tcp_rtt,
+        'synack': synack,
+        'ackdat': tcp_rtt - synack,
+        'smean': smean.astype(np.int64),
+        'dmean': dmean.astype(np.int64),
+        'trans_depth': np.where(http, 1 + rng.poisson(0.2, n), 0),
+        'response_body_len': np.where(http, _heavy_tail(rng, n, 1.1, 2_000, 5_000_000), 0).astype(np.int64),
+        'ct_srv_src': counter(4),
+        'ct_state_ttl': rng.choice(7, size=n, p=[0.25, 0.3, 0.3, 0.05, 0.04, 0.03, 0.03]),
+        'ct_dst_ltm': counter(3),
+        'ct_src_dport_ltm': counter(2),
+        'ct_dst_sport_ltm': counter(2),
+        'ct_dst_src_ltm': counter(4),
+        'is_ftp_login': np.where(ftp, rng.random(n) < 0.4, False).astype(np.int64),
+        'ct_ftp_cmd': np.where(ftp, rng.poisson(0.6, n), 0),
+        'ct_flw_http_mthd': np.where(http, rng.poisson(1.0, n), 0),
+        'ct_src_ltm': counter(3),
+        'ct_srv_dst': counter(4),
+        'is_sm_ips_ports': (rng.random(n) < 0.01).astype(np.int64),
+    }
+    df = pd.DataFrame(flows)
+    for col in ('ct_srv_src', 'ct_dst_ltm', 'ct_src_dport_ltm', 'ct_dst_sport_ltm',
+                'ct_dst_src_ltm', 'ct_src_ltm', 'ct_srv_dst'):
+        df[col] = df[col].astype(np.int64)
+
+    if feature_names is not None:
+        df = df.reindex(columns=list(feature_names), fill_value=0)
+    if with_time:
+        # Arrival times continue across offsets, so chunks concatenate into one capture
+        seconds = (offset + np.arange(n) + rng.random(n)) / FLOWS_PER_SECOND
+        df['time'] = START_TIME + pd.to_timedelta(seconds, unit='s')
+    return df
+
+
+def iter_flows(n_rows, chunk_rows=1_000_000, seed=0, **kwargs):
+    """Yield n_rows flows in chunks; deterministic for a given (seed, chunk_rows)."""
+    for offset in range(0, int(n_rows), chunk_rows):
+        yield generate_flows(min(chunk_rows, n_rows - offset), seed=seed, offset=offset, **kwargs)
+
+
+def write_flows(path, n_rows, chunk_rows=1_000_000, seed=0, **kwargs):
+    """Write a synthetic capture to CSV (optionally .gz) or Parquet without holding it in memory."""
+    lower = str(path).lower()
+    if lower.endswith((".parquet", ".pq")):
+        write_parquet(iter_flows(n_rows, chunk_rows, seed, **kwargs), path)
+        return path
+
+    compression = "gzip" if lower.endswith(".gz") else None
+    mode, header = "w", True
+    for chunk in iter_flows(n_rows, chunk_rows, seed, **kwargs):
+        chunk.to_csv(path, mode=mode, header=header, index=False, compression=compression)
+        mode, header = "a", False
+    return path
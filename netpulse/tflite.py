@@ -0,0 +1,299 @@
+"""Convert the fusion model to TensorFlow Lite and run it as a scoring runtime.
+
+The converted model keeps the fusion model's inputs and outputs (float32), so
+it drops into Artifacts.predict in place of the compiled Keras function. The
+LSTM is unrolled over its fixed SEQ_LEN steps before conversion: the converter
+cannot lower Keras' while-loop LSTM with a variable batch size, and the
+unrolled graph keeps the batch dimension free.
+
+Quantization options:
+
+- float32: no quantization, same predictions as Keras up to rounding;
+- dynamic: int8 weights, activations quantized on the fly;
+- int8: int8 weights and activations, calibrated on a sample of flows, with
+  float fallback for ops that have no int8 kernel.
+
+    python -m netpulse.tflite                                  # float32 + dynamic, synthetic sample
+    python -m netpulse.tflite --quantize int8 --sample flows.csv --report tflite_report.json
+
+Each run writes a report comparing latency, throughput and prediction
+agreement against the Keras model. Converted models that agree on at least
+--min-agreement of the flows are installed next to netpulse_fusion_v2.h5;
+the others are discarded, along with any earlier copy, so a runtime that
+failed the gate cannot be loaded. Score with an installed one via
+NETPULSE_RUNTIME=tflite-dynamic (or netpulse-score --runtime tflite-dynamic).
+"""
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import warnings
+
+import numpy as np
+
+from netpulse import pipeline
+
+# Quantization option -> runtime name (see pipeline.TFLITE_FILES)
+QUANTIZATIONS = {'float32': 'tflite', 'dynamic': 'tflite-dynamic', 'int8': 'tflite-int8'}
+CALIBRATION_BATCH_ROWS = 64
+
+
+def unrolled_model(model):
+    # Same layers and weights, with every LSTM unrolled over its time steps
+    import tensorflow as tf
+
+    def clone(layer):
+        config = layer.get_config()
+        if isinstance(layer, tf.keras.layers.LSTM):
+            config['unroll'] = True
+        return layer.__class__.from_config(config)
+
+    clone_ = tf.keras.models.clone_model(model, clone_function=clone)
+    clone_.set_weights(model.get_weights())
+    return clone_
+
+
+def convert(model, quantize='float32', calibration=None):
+    """Return the TFLite flatbuffer of model, quantized as requested.
+
+    calibration: (flows_scaled, sequences) used to pick int8 activation ranges;
+    required for quantize='int8'.
+    """
+    import tensorflow as tf
+
+    if quantize not in QUANTIZATIONS:
+        raise ValueError(f"unknown quantization {quantize!r}; expected one of {', '.join(QUANTIZATIONS)}")
+    converter = tf.lite.TFLiteConverter.from_keras_model(unrolled_model(model))
+    if quantize != 'float32':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantize == 'int8':
+        if calibration is None:
+            raise ValueError("int8 quantization needs a calibration sample")
+        flows, sequences = (np.asarray(a, dtype=np.float32) for a in calibration)
+
+        def representative_dataset():
+            for start in range(0, len(flows), CALIBRATION_BATCH_ROWS):
+                stop = start + CALIBRATION_BATCH_ROWS
+                yield [flows[start:stop], sequences[start:stop]]
+
+        converter.representative_dataset = representative_dataset
+    return converter.convert()
+
+
+def _interpreter(path, num_threads):
+    # The standalone LiteRT interpreter when installed, else the one bundled
+    # with TensorFlow (deprecated there, hence the silenced warning)
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        import tensorflow as tf
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+    return Interpreter(model_path=path, num_threads=num_threads)
+
+
+class TFLiteModel:
+    """A converted fusion model, callable like the compiled Keras function.
+
+    The interpreter is resized whenever the batch size changes and is not
+    thread-safe, so calls are serialized.
+    """
+
+    def __init__(self, path, num_threads=None):
+        self.path = path
+        self._interpreter = _interpreter(path, num_threads)
+        inputs = self._interpreter.get_input_details()
+        # The flatbuffer does not keep the Keras input order; tell them apart by rank
+        self._flows = next(d['index'] for d in inputs if len(d['shape_signature']) == 2)
+        self._sequences = next(d['index'] for d in inputs if len(d['shape_signature']) == 3)
+        self._output = self._interpreter.get_output_details()[0]['index']
+        self._rows = None
+        self._lock = threading.Lock()
+
+    def __call__(self, flows, sequences):
+        interpreter = self._interpreter
+        with self._lock:
+            if len(flows) != self._rows:
+                interpreter.resize_tensor_input(self._flows, flows.shape)
+                interpreter.resize_tensor_input(self._sequences, sequences.shape)
+                interpreter.allocate_tensors()
+                self._rows = len(flows)
+            interpreter.set_tensor(self._flows, np.ascontiguousarray(flows, dtype=np.float32))
+            interpreter.set_tensor(self._sequences, np.ascontiguousarray(sequences, dtype=np.float32))
+            interpreter.invoke()
+            return interpreter.get_tensor(self._output).copy()
+
+
+def tflite_path(model_dir, runtime):
+    if runtime not in pipeline.TFLITE_FILES:
+        raise ValueError(f"unknown runtime {runtime!r}; expected one of {', '.join(pipeline.RUNTIMES)}")
+    return os.path.join(model_dir, pipeline.TFLITE_FILES[runtime])
+
+
+def open_model(path):
+    import tensorflow as tf
+
+    # Follows the intra-op thread setting, so pool workers keep to their share of cores
+    threads = tf.config.threading.get_intra_op_parallelism_threads() or os.cpu_count()
+    return TFLiteModel(path, num_threads=threads)
+
+
+def load_runtime(model_dir, runtime):
+    path = tflite_path(model_dir, runtime)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} not found; convert the model first with python -m netpulse.tflite "
+                                f"(models below its --min-agreement are not installed)")
+    return open_model(path)
+
+
+# =========================
+# Export tool
+# =========================
+def load_sample(args, artifacts):
+    n_rows = args.calibration_rows + args.eval_rows
+    if args.sample:
+        columns = pipeline.input_columns(artifacts.scaler3)
+        df = pipeline.read_flows(args.sample, columns=columns).head(n_rows)
+    else:
+        from netpulse import synthetic
+
+        df = synthetic.generate_flows(n_rows, seed=args.seed, feature_names=list(artifacts.scaler3.feature_names_in_))
+    return pipeline.prepare_inputs(artifacts, df)
+
+
+def measure(predict, flows, sequences, latency_rows, repeats):
+    """Probabilities over the whole sample, plus latency and throughput."""
+    small = (flows[:latency_rows], sequences[:latency_rows])
+    predict(*small)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(*small)
+        latencies.append(time.perf_counter() - start)
+    predict(flows, sequences)
+    start = time.perf_counter()
+    probs = predict(flows, sequences)
+    seconds = time.perf_counter() - start
+    return probs, {
+        'latency_ms': round(statistics.median(latencies) * 1000, 3),
+        'latency_rows': len(small[0]),
+        'rows_per_second': round(len(flows) / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def compare(reference, probs, class_map):
+    labels = [class_map[k] for k in sorted(class_map)]
+    ref, got = reference.argmax(axis=1), probs.argmax(axis=1)
+    return {
+        'agreement': float((ref == got).mean()) if len(ref) else 1.0,
+        'max_abs_diff': float(np.abs(reference - probs).max()) if len(ref) else 0.0,
+        'class_counts': {label: int((got == k).sum()) for k, label in enumerate(labels)},
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m netpulse.tflite",
+        description="Convert the NET PULSE fusion model to TensorFlow Lite and compare it against Keras."
+    )
+    parser.add_argument("--model-dir", help="directory holding netpulse_fusion_v2.h5; converted models are written there")
+    parser.add_argument("--quantize", nargs="+", choices=list(QUANTIZATIONS), default=['float32', 'dynamic'],
+                        help="models to build (default: float32 dynamic)")
+    parser.add_argument("--sample", help="flow capture used for calibration and comparison (default: synthetic flows)")
+    parser.add_argument("--calibration-rows", type=int, default=1000,
+                        help="leading sample rows used to calibrate int8 (default: 1000)")
+    parser.add_argument("--eval-rows", type=int, default=10_000,
+                        help="sample rows, after the calibration rows, the comparison runs on (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the synthetic sample")
+    parser.add_argument("--latency-rows", type=int, default=64, help="batch size of the latency measurement (default: 64)")
+    parser.add_argument("--repeats", type=int, default=50, help="timed latency calls per model (default: 50)")
+    parser.add_argument("--min-agreement", type=float, default=0.99,
+                        help="install only models that agree with Keras on at least this share of predictions; "
+                             "exit non-zero when one does not (default: 0.99)")
+    parser.add_argument("--report", default="tflite_report.json")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    artifacts = pipeline.load_artifacts(args.model_dir, runtime=pipeline.DEFAULT_RUNTIME)
+    flows, sequences = load_sample(args, artifacts)
+    calibration = (flows[:args.calibration_rows], sequences[:args.calibration_rows])
+    flows, sequences = flows[args.calibration_rows:], sequences[args.calibration_rows:]
+    if len(flows) == 0:
+        print("the sample has no rows left after the calibration rows", file=sys.stderr)
+        return 1
+
+    reference, timing = measure(artifacts.predict, flows, sequences, args.latency_rows, args.repeats)
+    models = {pipeline.DEFAULT_RUNTIME: {
+        'file': pipeline.FUSION_FILE,
+        'bytes': os.path.getsize(os.path.join(artifacts.model_dir, pipeline.FUSION_FILE)),
+        **timing,
+        **compare(reference, reference, artifacts.class_map),
+    }}
+
+    failures = []
+    for quantize in args.quantize:
+        runtime = QUANTIZATIONS[quantize]
+        path = tflite_path(artifacts.model_dir, runtime)
+        start = time.perf_counter()
+        model = convert(artifacts.fusion, quantize, calibration)
+        with open(path + ".partial", "wb") as f:
+            f.write(model)
+        convert_seconds = time.perf_counter() - start
+
+        # Measured before it is installed, so a model failing the gate never
+        # replaces the runtime file
+        lite = dataclasses.replace(artifacts, infer=open_model(path + ".partial"), runtime=runtime)
+        probs, timing = measure(lite.predict, flows, sequences, args.latency_rows, args.repeats)
+        models[runtime] = {
+            'file': os.path.basename(path),
+            'quantize': quantize,
+            'bytes': len(model),
+            'convert_seconds': round(convert_seconds, 2),
+            **timing,
+            **compare(reference, probs, artifacts.class_map),
+        }
+        models[runtime]['installed'] = models[runtime]['agreement'] >= args.min_agreement
+        if models[runtime]['installed']:
+            os.replace(path + ".partial", path)
+        else:
+            os.remove(path + ".partial")
+            if os.path.exists(path):
+                os.remove(path)
+            failures.append(f"{runtime} agrees with keras on {models[runtime]['agreement']:.2%} of flows, "
+                            f"below {args.min_agreement:.2%}; not installed")
+
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'sample': args.sample or f"synthetic (seed {args.seed})",
+        'calibration_rows': len(calibration[0]),
+        'eval_rows': len(flows),
+        'models': models,
+        'failures': failures,
+    }
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'runtime':<16}{'size':>10}{'latency':>12}{'flows/s':>12}{'agreement':>11}{'max diff':>10}")
+    for runtime, m in models.items():
+        print(f"{runtime:<16}{m['bytes'] / 1024:>8,.0f}KB{m['latency_ms']:>10.2f}ms{m['rows_per_second']:>12,.0f}"
+              f"{m['agreement']:>11.2%}{m['max_abs_diff']:>10.4f}")
+    print(f"latency: {args.latency_rows}-row batch median; report written to {args.report}")
+    for failure in failures:
+        print(f"WARNING: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Chart aggregates merged across chunks against pandas on the whole frame."""
+import numpy as np
+import pandas as pd
+
+from netpulse.aggregates import chart_aggregates, corr_matrix, merge_aggregates
+
+LABELS = ['Normal', 'Suspicious', 'Malicious']
+
+
+def flows(n=5000):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=n)
+    return pd.DataFrame({
+        'sbytes': rng.integers(0, 10_000, n).astype(np.float64),
+        'dur': x,
+        # Epoch seconds: a mean near 1.4e9 with a spread of a few seconds
+        'stime': 1.4e9 + 3 * x + rng.normal(scale=0.5, size=n),
+        'ltime': 1.4e9 + 5 + 3 * x + rng.normal(scale=2, size=n),
+        'prediction_label': rng.choice(LABELS, n),
+        'confidence': rng.random(n),
+    })
+
+
+CORR_COLS = ['sbytes', 'dur', 'stime', 'ltime', 'confidence']
+
+
+def test_corr_matrix_matches_pandas_with_offset_columns():
+    df = flows()
+    got = corr_matrix(chart_aggregates(df, LABELS, corr_cols=CORR_COLS))
+    np.testing.assert_allclose(got.to_numpy(), df[CORR_COLS].corr().to_numpy(), atol=1e-6)
+
+
+def test_merged_chunks_match_one_pass():
+    df = flows()
+    df.loc[[3, 700, 4001], 'stime'] = np.nan
+    total = None
+    for start, stop in [(0, 1), (1, 1200), (1200, 1200), (1200, 3100), (3100, 5000)]:
+        part = chart_aggregates(df.iloc[start:stop], LABELS, corr_cols=CORR_COLS)
+        total = part if total is None else merge_aggregates(total, part)
+    assert total['total_flows'] == len(df)
+    assert total['corr_n'] == len(df) - 3
+    expected = df[CORR_COLS].dropna().corr()
+    np.testing.assert_allclose(corr_matrix(total).to_numpy(), expected.to_numpy(), atol=1e-6)
+    assert total['class_counts'].to_dict() == df['prediction_label'].value_counts().to_dict()
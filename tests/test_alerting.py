@@ -0,0 +1,93 @@
+"""AlertEngine windowing, grouping and rate limiting."""
+import numpy as np
+import pandas as pd
+
+from netpulse.alerting import AlertEngine
+
+CLASS_MAP = {0: 'Normal', 1: 'Suspicious', 2: 'Malicious'}
+T0 = pd.Timestamp('2024-01-01')
+
+
+def probs(*classes, p=0.9):
+    # One row per flow with probability p on the given class
+    out = np.full((len(classes), 3), (1 - p) / 2)
+    out[np.arange(len(classes)), classes] = p
+    return out
+
+
+def at(*minutes):
+    return (T0 + pd.to_timedelta(minutes, unit='min')).to_numpy('datetime64[ns]')
+
+
+def engine(**kwargs):
+    kwargs.setdefault('window', pd.Timedelta(minutes=5))
+    kwargs.setdefault('max_alerts_per_window', 25)
+    return AlertEngine(CLASS_MAP, 0.8, **kwargs)
+
+
+def test_flows_more_than_a_window_apart_split():
+    e = engine()
+    e.process(probs(2, 2, 2, 2), times=at(0, 4, 9, 20))
+    frame = e.frame()
+    assert frame['flows'].tolist() == [3, 1]
+    assert frame['first_seen'].tolist() == [T0, T0 + pd.Timedelta(minutes=20)]
+    assert frame['last_seen'].iloc[0] == T0 + pd.Timedelta(minutes=9)
+
+
+def test_alerts_group_by_key_and_class():
+    e = engine()
+    keys = np.array(['a', 'a', 'b', 'a', 'b'], dtype=object)
+    e.process(probs(2, 1, 2, 2, 2), times=at(0, 1, 2, 3, 4), keys=keys)
+    groups = sorted((a['key'], a['severity'], a['flows']) for a in e.alerts)
+    assert groups == [('a', 'Malicious', 2), ('a', 'Suspicious', 1), ('b', 'Malicious', 2)]
+
+
+def test_groups_merge_across_process_calls():
+    e = engine()
+    first = e.process(probs(2, 2), times=at(0, 1), keys=np.array(['a', 'a'], dtype=object))
+    second = e.process(probs(2, 2), times=at(4, 12), keys=np.array(['a', 'a'], dtype=object),
+                       rows=np.array([10, 11]))
+    assert len(first) == 1 and len(second) == 1
+    assert [a['flows'] for a in e.alerts] == [3, 1]
+    assert e.flows_seen == 4
+
+
+def test_example_row_follows_the_peak_probability():
+    e = engine()
+    p = probs(2, 2, 2)
+    p[1, 2] = 0.99
+    e.process(p, times=at(0, 1, 2), rows=np.array([7, 8, 9]))
+    more = probs(2, p=0.995)
+    e.process(more, times=at(3), rows=np.array([42]))
+    assert e.alerts[0]['example_row'] == 42 and e.alerts[0]['max_prob'] == 0.995
+
+
+def test_rate_limit_counts_new_alerts_per_window():
+    e = engine(max_alerts_per_window=2)
+    keys = np.array(['a', 'b', 'c', 'd', 'e'], dtype=object)
+    e.process(probs(2, 2, 2, 2, 2), times=at(0, 1, 1, 2, 6), keys=keys)
+    # Four groups open in the first five-minute window; c and d are over the cap
+    assert [a['key'] for a in e.alerts] == ['a', 'b', 'e']
+    assert e.suppressed_groups == 2 and e.suppressed_flows == 2
+    # A suppressed group keeps absorbing its flows silently
+    e.process(probs(2), times=at(3), keys=np.array(['c'], dtype=object))
+    assert e.suppressed_flows == 3 and len(e.alerts) == 3
+
+
+def test_threshold_is_inclusive():
+    e = engine()
+    p = np.array([[0.2, 0.0, 0.8], [0.21, 0.0, 0.79], [0.2, 0.8, 0.0]])
+    e.process(p, times=at(0, 0, 0))
+    assert e.candidates == 2
+    assert sorted(a['severity'] for a in e.alerts) == ['Malicious', 'Suspicious']
+
+
+def test_untimed_flows_are_windowed_by_arrival():
+    e = engine(window_flows=10, max_alerts_per_window=1)
+    classes = [0] * 50
+    classes[0] = classes[5] = classes[40] = 2
+    e.process(probs(*classes[:30]), keys=None)
+    e.process(probs(*classes[30:]), keys=None)
+    # Flows 0 and 5 are one group; flow 40 is more than ten flows later
+    assert [(a['flows'], a['example_row']) for a in e.alerts] == [(2, 0), (1, 40)]
+    assert e.frame(timed=False)['first_seen'].isna().all()
@@ -0,0 +1,148 @@
+"""InferenceBatcher merging, splitting and metrics, with a stub model."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from netpulse.batching import InferenceBatcher
+
+SEQ_SHAPE = (4, 3)
+
+
+class StubModel:
+    """Scores each row as its own flow features doubled; records batch sizes.
+
+    With hold_first, the first batch blocks on `gate` after signalling
+    `entered`, so a test can queue requests behind a busy inference thread.
+    """
+
+    def __init__(self, hold_first=False):
+        self.batches = []
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        if not hold_first:
+            self.gate.set()
+
+    def __call__(self, flows, sequences):
+        assert len(sequences) == len(flows)
+        self.entered.set()
+        self.gate.wait(timeout=10)
+        self.batches.append(len(flows))
+        return np.asarray(flows, dtype=np.float32) * 2
+
+
+def request(rows, tag):
+    # Row i of request `tag` carries (tag, i), so every slice is identifiable
+    flows = np.column_stack([np.full(rows, tag), np.arange(rows)]).astype(np.float32)
+    return flows, np.zeros((rows, *SEQ_SHAPE), dtype=np.float32)
+
+
+@pytest.fixture
+def batcher_for():
+    batchers = []
+
+    def make(model, **kwargs):
+        batchers.append(InferenceBatcher(model, **kwargs))
+        return batchers[-1]
+
+    yield make
+    for batcher in batchers:
+        batcher.close()
+
+
+def queue_behind_busy_thread(batcher, model, sizes):
+    # The first request occupies the inference thread, the rest queue up
+    futures = [batcher.submit(*request(sizes[0], 0))]
+    assert model.entered.wait(timeout=10)
+    futures += [batcher.submit(*request(rows, tag)) for tag, rows in enumerate(sizes[1:], start=1)]
+    model.gate.set()
+    return [future.result(timeout=10) for future in futures]
+
+
+def check_results(results, sizes):
+    for tag, (probs, rows) in enumerate(zip(results, sizes)):
+        np.testing.assert_array_equal(probs, request(rows, tag)[0] * 2)
+
+
+def test_concurrent_submitters_get_their_own_rows(batcher_for):
+    model = StubModel()
+    batcher = batcher_for(model, max_batch_rows=64, max_wait=0.02)
+    sizes = [1 + tag % 7 for tag in range(40)]
+    results = [None] * len(sizes)
+    start = threading.Barrier(len(sizes))
+
+    def submit(tag):
+        start.wait()
+        results[tag] = batcher(*request(sizes[tag], tag))
+
+    threads = [threading.Thread(target=submit, args=(tag,)) for tag in range(len(sizes))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    check_results(results, sizes)
+    # Metrics are recorded after the futures resolve; close joins the thread
+    batcher.close()
+    stats = batcher.stats()
+    assert stats['requests'] == len(sizes) and stats['rows'] == sum(sizes)
+    assert sum(model.batches) == sum(sizes) and max(model.batches) <= 64
+
+
+def test_queued_requests_merge_in_arrival_order(batcher_for):
+    model = StubModel(hold_first=True)
+    batcher = batcher_for(model, max_batch_rows=100)
+    sizes = [5, 3, 4, 2]
+    check_results(queue_behind_busy_thread(batcher, model, sizes), sizes)
+    assert model.batches == [5, 9]
+    batcher.close()
+    assert batcher.stats()['mean_requests_per_batch'] == 2.0
+
+
+def test_batches_split_at_max_batch_rows_and_carry_over(batcher_for):
+    model = StubModel(hold_first=True)
+    batcher = batcher_for(model, max_batch_rows=10)
+    # 4 + 4 fit; the next 4 would overflow, so it is carried into the next batch
+    sizes = [1, 4, 4, 4, 6, 10, 3]
+    check_results(queue_behind_busy_thread(batcher, model, sizes), sizes)
+    assert model.batches == [1, 8, 10, 10, 3]
+    assert batcher.stats()['queue_depth'] == 0 and batcher.stats()['queued_rows'] == 0
+
+
+def test_oversized_request_runs_alone(batcher_for):
+    model = StubModel(hold_first=True)
+    batcher = batcher_for(model, max_batch_rows=10)
+    sizes = [1, 2, 25, 2]
+    check_results(queue_behind_busy_thread(batcher, model, sizes), sizes)
+    assert model.batches == [1, 2, 25, 2]
+
+
+def test_peak_wait_reports_the_longest_queue_time(batcher_for):
+    model = StubModel(hold_first=True)
+    batcher = batcher_for(model, max_batch_rows=100)
+    assert batcher.stats()['peak_wait_ms'] == 0.0
+    futures = [batcher.submit(*request(1, 0))]
+    assert model.entered.wait(timeout=10)
+    futures.append(batcher.submit(*request(1, 1)))
+    time.sleep(0.2)
+    model.gate.set()
+    for future in futures:
+        future.result(timeout=10)
+    batcher.close()
+    stats = batcher.stats()
+    # The second request waited out the blocked first batch; the first did not wait
+    assert stats['peak_wait_ms'] >= 190
+    assert stats['mean_wait_ms'] < 0.6 * stats['peak_wait_ms']
+    assert stats['batches'] == 2
+
+
+def test_errors_reach_every_caller_in_the_batch(batcher_for):
+    def failing(flows, sequences):
+        raise ValueError("model failed")
+
+    batcher = batcher_for(failing)
+    with pytest.raises(ValueError, match="model failed"):
+        batcher(*request(3, 0))
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(*request(1, 1))
@@ -0,0 +1,53 @@
+"""Scoring distinct inputs once gives every row the prediction it would get alone."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from netpulse import pipeline, synthetic
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    return pipeline.load_artifacts()
+
+
+@pytest.fixture(scope="module")
+def flows(artifacts):
+    df = synthetic.generate_flows(300, seed=1, feature_names=list(artifacts.scaler3.feature_names_in_))
+    # Every row three times, shuffled
+    rng = np.random.default_rng(0)
+    return df.iloc[rng.permutation(np.tile(np.arange(len(df)), 3))].reset_index(drop=True)
+
+
+def aligned(artifacts, df):
+    return pipeline.align_features(pipeline.encode_categoricals(df.copy(), artifacts.categories), artifacts.scaler3)
+
+
+def test_unique_inputs_groups_duplicated_rows(artifacts, flows):
+    first, inverse = pipeline.unique_inputs(aligned(artifacts, flows), pipeline.sequence_columns(flows))
+    assert len(first) <= len(flows) // 3
+    matrix = aligned(artifacts, flows).to_numpy(np.float64)
+    np.testing.assert_array_equal(matrix[first][inverse], matrix)
+
+
+def test_dedup_predictions_match_full_scoring(artifacts, flows):
+    stats = {}
+    deduped = pipeline.score_flows(artifacts, flows, dedup=True, stats=stats)
+    assert stats['rows'] == len(flows) and stats['unique'] <= len(flows) // 3
+    np.testing.assert_allclose(deduped, pipeline.score_flows(artifacts, flows), rtol=1e-5, atol=1e-6)
+
+
+def test_hash_collision_falls_back_to_every_row(artifacts, flows, monkeypatch):
+    # Every row hashes alike, so the value check must reject the grouping
+    monkeypatch.setattr(pd.util, "hash_pandas_object",
+                        lambda obj, index=False: pd.Series(np.zeros(len(obj), dtype=np.uint64)))
+    x, columns = aligned(artifacts, flows), pipeline.sequence_columns(flows)
+    assert pipeline.unique_inputs(x, columns) is None
+    kept, kept_columns, inverse = pipeline.dedup_inputs(x, columns)
+    assert inverse is None and kept is x and kept_columns is columns
+
+    stats = {}
+    deduped = pipeline.score_flows(artifacts, flows, dedup=True, stats=stats)
+    assert stats == {'rows': len(flows), 'unique': len(flows)}
+    monkeypatch.undo()
+    np.testing.assert_allclose(deduped, pipeline.score_flows(artifacts, flows), rtol=1e-5, atol=1e-6)
@@ -0,0 +1,77 @@
+"""compact_dtypes' keep= contract and the dtypes attach_predictions adds."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from netpulse import pipeline, synthetic
+from netpulse.pipeline import IDENTITY_COLS, attach_predictions, compact_dtypes
+
+CLASS_MAP = {0: 'Normal', 1: 'Suspicious', 2: 'Malicious'}
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    return pipeline.load_artifacts()
+
+
+@pytest.fixture(scope="module")
+def flows(artifacts):
+    df = synthetic.generate_flows(400, seed=3, feature_names=list(artifacts.scaler3.feature_names_in_))
+    df.insert(0, 'id', np.arange(len(df), dtype=np.int64))
+    # Not a model input, so it is still compacted
+    df['sensor'] = ['edge-1', 'edge-2'] * (len(df) // 2)
+    return df
+
+
+def test_compacts_columns_outside_keep():
+    df = pd.DataFrame({
+        'small': np.arange(100, dtype=np.int64),
+        'ratio': np.linspace(0, 1, 100),
+        'proto': ['tcp', 'udp'] * 50,
+        'time': [f"2024-01-01 00:00:{i:02d}" for i in range(100)],
+        'flag': [True, False] * 50,
+        'id': np.arange(100, dtype=np.int64),
+    })
+    compact_dtypes(df)
+    assert df['small'].dtype == np.int8
+    assert df['ratio'].dtype == np.float32
+    assert isinstance(df['proto'].dtype, pd.CategoricalDtype)
+    assert df['flag'].dtype == bool
+    # Near-unique strings are not worth a category; identity columns are kept
+    assert not isinstance(df['time'].dtype, pd.CategoricalDtype)
+    assert df['id'].dtype == np.int64
+
+
+def test_keep_leaves_named_columns_untouched():
+    df = pd.DataFrame({'a': np.arange(10, dtype=np.int64), 'b': np.full(10, 0.1), 'c': ['x'] * 10})
+    original = df.copy()
+    compact_dtypes(df, keep=['a', 'b', 'c'])
+    pd.testing.assert_frame_equal(df, original)
+    compact_dtypes(df, keep=None)
+    assert df['a'].dtype == np.int8 and df['b'].dtype == np.float32
+    assert isinstance(df['c'].dtype, pd.CategoricalDtype)
+
+
+def test_model_inputs_pass_through_unchanged(artifacts, flows):
+    keep = [*IDENTITY_COLS, *pipeline.input_columns(artifacts.scaler3)]
+    compacted = compact_dtypes(flows.copy(), keep=keep)
+    inputs = [c for c in keep if c in flows.columns]
+    pd.testing.assert_frame_equal(compacted[inputs], flows[inputs])
+    assert isinstance(compacted['sensor'].dtype, pd.CategoricalDtype)
+    np.testing.assert_array_equal(pipeline.score_flows(artifacts, compacted), pipeline.score_flows(artifacts, flows))
+
+
+def test_attach_predictions_dtypes():
+    # No row is Suspicious; the label still has every class as a category
+    preds = np.array([[0.7, 0.1, 0.2], [0.1, 0.2, 0.7], [0.05, 0.05, 0.9]], dtype=np.float64)
+    df = attach_predictions(pd.DataFrame({'sbytes': [1, 2, 3]}), preds, CLASS_MAP)
+    assert df['prediction'].dtype == np.int8
+    assert df['prediction'].tolist() == [0, 2, 2]
+    assert isinstance(df['prediction_label'].dtype, pd.CategoricalDtype)
+    assert list(df['prediction_label'].cat.categories) == ['Normal', 'Suspicious', 'Malicious']
+    assert df['prediction_label'].tolist() == ['Normal', 'Malicious', 'Malicious']
+    assert df['prediction_label'].value_counts()['Suspicious'] == 0
+    assert df['confidence'].dtype == np.float32 and df['threat_score'].dtype == np.float32
+    np.testing.assert_array_equal(df['confidence'], np.float32([0.7, 0.7, 0.9]))
+    np.testing.assert_array_equal(df['threat_score'], np.float32([0.0, 1.0, 1.0]))
+    assert df['sbytes'].tolist() == [1, 2, 3]
@@ -0,0 +1,66 @@
+"""encode_categoricals against the persisted training vocabularies."""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from netpulse.pipeline import CAT_COLS, UNSEEN_CODE, encode_categoricals, load_categories, resolve_model_dir
+
+
+@pytest.fixture(scope="module")
+def categories():
+    return load_categories(resolve_model_dir())
+
+
+def flows(dtype=object):
+    df = pd.DataFrame({
+        'proto': ['tcp', 'udp', 'no-such-proto', None, 'tcp', 'arp'],
+        'service': ['-', 'dns', 'http', 'gopher+', np.nan, '-'],
+        'state': ['FIN', 'INT', 'CON', 'FIN', 'XYZ', None],
+        'sbytes': [100, 200, 300, 400, 500, 600],
+    })
+    for col in CAT_COLS:
+        df[col] = df[col].astype(dtype)
+    return df
+
+
+def test_known_values_get_training_codes(categories):
+    encoded = encode_categoricals(flows(), categories)
+    for col in CAT_COLS:
+        vocab = categories[col]
+        for value, code in zip(flows()[col], encoded[col]):
+            if isinstance(value, str) and value in vocab:
+                assert code == vocab.get_loc(value)
+    assert encoded['sbytes'].tolist() == flows()['sbytes'].tolist()
+
+
+def test_unseen_and_missing_values(categories):
+    encoded = encode_categoricals(flows(), categories)
+    assert encoded.loc[2, 'proto'] == UNSEEN_CODE
+    assert encoded.loc[3, 'proto'] == UNSEEN_CODE
+    assert encoded.loc[3, 'service'] == UNSEEN_CODE
+    assert encoded.loc[4, 'service'] == UNSEEN_CODE
+    assert encoded.loc[4, 'state'] == UNSEEN_CODE
+    assert encoded.loc[5, 'state'] == UNSEEN_CODE
+    assert all(encoded[col].dtype == np.int16 for col in CAT_COLS)
+
+
+@pytest.mark.parametrize('dtype', ['category', 'str', pd.StringDtype()])
+def test_dtypes_encode_like_object(categories, dtype):
+    expected = encode_categoricals(flows(), categories)
+    pd.testing.assert_frame_equal(encode_categoricals(flows(dtype), categories), expected)
+
+
+def test_arrow_dictionary_input_encodes_like_object(categories):
+    # What read_columnar hands over for a dictionary-encoded Parquet/Feather column
+    table = pa.Table.from_pandas(flows(), preserve_index=False)
+    table = table.set_column(0, 'proto', table.column('proto').dictionary_encode())
+    df = table.to_pandas()
+    assert isinstance(df['proto'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(encode_categoricals(df, categories), encode_categoricals(flows(), categories))
+
+
+def test_without_vocabularies_fits_per_upload():
+    encoded = encode_categoricals(flows().dropna(), None)
+    # Sorted labels of this upload: no-such-proto, tcp, udp
+    assert encoded['proto'].tolist() == [1, 2, 0]
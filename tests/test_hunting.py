@@ -0,0 +1,88 @@
+"""FlowIndex queries against brute-force filtering of the same frame."""
+import numpy as np
+import pandas as pd
+
+from netpulse.hunting import DENSE_FRACTION, FlowIndex, tokenize
+
+N = 1280
+
+
+def flows(n=N):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'srcip': [f"10.0.{a}.{b}" for a, b in rng.integers(0, 4, (n, 2))],
+        'proto': rng.choice(['tcp', 'udp', 'arp'], n, p=[0.6, 0.395, 0.005]),
+        'service': rng.choice(['-', 'http', 'dns'], n),
+        'state': rng.choice(['FIN', 'INT', 'CON'], n),
+        'prediction_label': rng.choice(['Normal', 'Suspicious', 'Malicious'], n),
+        'confidence': rng.random(n).round(2),
+        'sbytes': rng.integers(0, 1000, n),
+        'dur': rng.random(n),
+    })
+
+
+def matches(df, text):
+    tokens = [set(t for col in ('srcip', 'proto', 'service', 'state', 'prediction_label')
+                  for t in tokenize(row[col])) for _, row in df.iterrows()]
+    return [i for i, row_tokens in enumerate(tokens)
+            if all(any(t.startswith(term) for t in row_tokens) for term in tokenize(text))]
+
+
+def test_dense_values_are_bitmaps_and_rare_ones_row_ids():
+    index = FlowIndex(flows())
+    sets = index.categorical['proto']
+    assert sets['tcp'].dtype == np.uint8 and len(sets['tcp']) == index.n_bytes
+    assert len(sets['arp']) < N // DENSE_FRACTION and sets['arp'].dtype != np.uint8
+
+
+def test_categorical_filters_mix_bitmap_and_sparse_sets():
+    df = flows()
+    index = FlowIndex(df)
+    for values in (['tcp'], ['arp'], ['tcp', 'arp'], ['udp', 'arp', 'no-such']):
+        expected = np.flatnonzero(df['proto'].isin(values))
+        assert index.query(categorical={'proto': values}).tolist() == expected.tolist()
+    rows = index.query(categorical={'proto': ['arp'], 'service': ['http', 'dns']})
+    assert rows.tolist() == np.flatnonzero((df['proto'] == 'arp') & df['service'].isin(['http', 'dns'])).tolist()
+
+
+def test_empty_filters_select_every_row():
+    index = FlowIndex(flows())
+    everything = np.arange(N).tolist()
+    assert index.query().tolist() == everything
+    assert index.query(categorical={'proto': [], 'state': []}).tolist() == everything
+    assert index.query(ranges={'confidence': (None, None)}, text="  ").tolist() == everything
+
+
+def test_range_bounds_are_inclusive_and_optional():
+    df = flows()
+    index = FlowIndex(df)
+    c = df['confidence']
+    assert index.query(ranges={'confidence': (0.25, 0.5)}).tolist() == np.flatnonzero((c >= 0.25) & (c <= 0.5)).tolist()
+    assert index.query(ranges={'confidence': (0.9, None)}).tolist() == np.flatnonzero(c >= 0.9).tolist()
+    assert index.query(ranges={'confidence': (None, 0.1)}).tolist() == np.flatnonzero(c <= 0.1).tolist()
+    rows = index.query(categorical={'state': ['FIN']}, ranges={'sbytes': (100, 200)})
+    expected = (df['state'] == 'FIN') & df['sbytes'].between(100, 200)
+    assert rows.tolist() == np.flatnonzero(expected).tolist()
+
+
+def test_text_terms_prefix_tokens_and_are_anded():
+    df = flows()
+    index = FlowIndex(df)
+    for text in ("http", "HTTP fin", "10.0.1", "10.0.1.3", "mal 10.0.3", "susp arp", "nothing-here"):
+        assert index.query(text=text).tolist() == matches(df, text), text
+    assert len(index.query(text="10.0.1.3")) > 0
+
+
+def test_token_rows_cover_every_text_column():
+    df = flows()
+    index = FlowIndex(df)
+    assert sorted(index.token_rows('fin').tolist()) == np.flatnonzero(df['state'] == 'FIN').tolist()
+    assert len(index.token_rows('fi')) == 0
+    assert set(index.token_cols) == {'srcip', 'proto', 'service', 'state', 'prediction_label'}
+
+
+def test_near_unique_columns_only_indexed_when_named():
+    df = pd.DataFrame({'flow': [f"flow-{i}" for i in range(20_001)], 'proto': 'tcp'})
+    assert FlowIndex(df).token_cols == ['proto']
+    index = FlowIndex(df, text_cols=['flow', 'proto'])
+    assert index.query(text="flow-1234").tolist() == [1234] + list(range(12340, 12350))
@@ -0,0 +1,132 @@
+"""Live flow sources and micro-batch sizing for the real-time monitor."""
+import socket
+import time
+
+import pytest
+
+from netpulse import monitor
+from netpulse.monitor import CsvTailer, MicroBatcher, SocketListener, send_csv
+
+HEADER = b"proto,sbytes\n"
+
+
+def rows(start, stop):
+    return b"".join(b"tcp,%d\n" % i for i in range(start, stop))
+
+
+@pytest.fixture
+def capture(tmp_path):
+    path = tmp_path / "flows.csv"
+    path.write_bytes(HEADER + rows(0, 5))
+    return path
+
+
+def append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_tailer_from_start_reads_existing_rows(capture):
+    tailer = CsvTailer(str(capture), from_start=True)
+    assert tailer.read(3)['sbytes'].tolist() == [0, 1, 2]
+    assert tailer.read(10)['sbytes'].tolist() == [3, 4]
+    assert tailer.read(10) is None
+    assert tailer.rows_read == 5
+
+
+def test_tailer_skips_existing_rows(capture):
+    tailer = CsvTailer(str(capture))
+    assert tailer.read(10) is None
+    append(capture, rows(5, 7))
+    assert tailer.read(10)['sbytes'].tolist() == [5, 6]
+
+
+def test_tailer_starts_after_last_complete_line(capture):
+    # The writer is midway through row 5 when the monitor starts
+    append(capture, b"tcp,5")
+    tailer = CsvTailer(str(capture))
+    assert tailer.pending_bytes() == len(b"tcp,5")
+    assert tailer.read(10) is None
+    append(capture, b"55\n" + rows(6, 7))
+    assert tailer.read(10)['sbytes'].tolist() == [555, 6]
+
+
+def test_tailer_scans_back_across_blocks(capture, monkeypatch):
+    monkeypatch.setattr(monitor, 'TAIL_SCAN_BYTES', 3)
+    append(capture, b"tcp,12345")
+    tailer = CsvTailer(str(capture))
+    append(capture, b"\n")
+    assert tailer.read(10)['sbytes'].tolist() == [12345]
+
+
+def test_tailer_waits_for_partial_lines(capture):
+    tailer = CsvTailer(str(capture), from_start=True)
+    tailer.read(10)
+    append(capture, b"udp,9")
+    assert tailer.read(10) is None
+    append(capture, b"9\n")
+    df = tailer.read(10)
+    assert df['proto'].tolist() == ['udp'] and df['sbytes'].tolist() == [99]
+
+
+def test_tailer_restarts_after_truncation(capture):
+    tailer = CsvTailer(str(capture), from_start=True)
+    tailer.read(10)
+    capture.write_bytes(HEADER + rows(100, 102))
+    assert tailer.read(10)['sbytes'].tolist() == [100, 101]
+
+
+def test_tailer_needs_a_header(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_bytes(b"proto,sb")
+    with pytest.raises(ValueError):
+        CsvTailer(str(path))
+
+
+def read_all(listener, expected, timeout=10):
+    frames, got, deadline = [], 0, time.monotonic() + timeout
+    while got < expected and time.monotonic() < deadline:
+        df = listener.read(expected)
+        if df is None:
+            time.sleep(0.01)
+            continue
+        frames.append(df)
+        got += len(df)
+    return frames
+
+
+def test_socket_listener_receives_from_senders(capture):
+    listener = SocketListener(0)
+    try:
+        port = listener.address[1]
+        assert send_csv(str(capture), port) == 5
+        with socket.create_connection(("127.0.0.1", port)) as conn:
+            conn.sendall(b"sbytes,proto\n7,udp\n")
+        frames = read_all(listener, 6)
+        assert sum(len(df) for df in frames) == 6
+        assert sorted(v for df in frames for v in df['sbytes']) == [0, 1, 2, 3, 4, 7]
+        assert listener.rows_read == 6
+        assert listener.read(10) is None
+    finally:
+        listener.close()
+    # The port is released on close
+    with socket.socket() as probe:
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        probe.bind(("127.0.0.1", port))
+
+
+def test_micro_batcher_tracks_latency_target():
+    batcher = MicroBatcher(latency_target=0.5, min_rows=10, max_rows=1000, smoothing=0.5)
+    assert batcher.batch_rows() == 10
+    batcher.record(100, 0.1)
+    assert batcher.batch_rows() == 500
+    batcher.record(100, 0.3)
+    # Moving average of 1ms and 3ms per row
+    assert batcher.batch_rows() == 250
+    batcher.record(10, 100.0)
+    assert batcher.batch_rows() == 10
+    batcher.record(0, 0.0)
+    assert batcher.last_latency == 0.0
+    fast = MicroBatcher(latency_target=1.0, max_rows=1000)
+    fast.record(1000, 0.001)
+    assert fast.batch_rows() == 1000
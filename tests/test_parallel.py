@@ -0,0 +1,27 @@
+"""ScoringPool sharding and warm-up against in-process scoring."""
+import numpy as np
+import pytest
+
+from netpulse import pipeline, synthetic
+from netpulse.parallel import ScoringPool
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ScoringPool(workers=2, shard_rows=1000) as pool:
+        yield pool.warm_up()
+
+
+def test_warm_up_starts_every_worker(pool):
+    assert len(set(pool.pids)) == 2
+
+
+@pytest.mark.parametrize('n_rows, expected', [(0, 1), (1, 1), (3, 2), (1500, 750), (10_000, 1000)])
+def test_shard_size_splits_small_inputs_across_workers(pool, n_rows, expected):
+    assert pool.shard_size(n_rows) == expected
+
+
+def test_matches_in_process_scoring(pool):
+    artifacts = pipeline.load_artifacts()
+    df = synthetic.generate_flows(1500, seed=0, feature_names=list(artifacts.scaler3.feature_names_in_))
+    np.testing.assert_allclose(pool.score(df), pipeline.score_flows(artifacts, df), rtol=1e-5, atol=1e-6)
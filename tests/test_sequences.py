@@ -0,0 +1,93 @@
+"""flows_to_sequences and SequenceTemplateCache against the row-wise flow_to_sequence."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from netpulse import pipeline
+from netpulse.pipeline import SEQ_LEN, flow_to_sequence, flows_to_sequences, sequence_columns
+from netpulse.sequences import SequenceTemplateCache
+
+
+def reference(df, seq_len=SEQ_LEN):
+    return np.stack([flow_to_sequence(row, seq_len=seq_len) for _, row in df.iterrows()])
+
+
+def assert_matches_reference(df, seq_len=SEQ_LEN):
+    expected = reference(df, seq_len)
+    actual = flows_to_sequences(*sequence_columns(df), seq_len=seq_len)
+    assert actual.shape == (len(df), seq_len, 3)
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-6)
+
+
+def random_flows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'spkts': rng.integers(0, 80, n),
+        'dpkts': rng.integers(0, 80, n),
+        'sbytes': rng.integers(0, 100_000, n).astype(float),
+        'dbytes': rng.integers(0, 100_000, n).astype(float),
+        'dur': rng.exponential(2.0, n),
+    })
+
+
+def test_random_flows():
+    assert_matches_reference(random_flows(500))
+
+
+@pytest.mark.parametrize('aliases', [
+    {'spkts': 'src_pkts', 'dpkts': 'dst_pkts', 'sbytes': 'src_bytes', 'dbytes': 'dst_bytes', 'dur': 'duration'},
+    {'spkts': 'src_pkts', 'dbytes': 'dst_bytes'},
+])
+def test_column_aliases(aliases):
+    assert_matches_reference(random_flows(100, seed=1).rename(columns=aliases))
+
+
+def test_missing_columns():
+    # Absent counts default to 0 and an absent duration to 0.001
+    assert_matches_reference(random_flows(50, seed=2).drop(columns=['dpkts', 'dur']))
+
+
+@pytest.mark.parametrize('dur', [0.0, -0.0, -1.5])
+def test_zero_and_negative_duration(dur):
+    df = random_flows(50, seed=3)
+    df['dur'] = dur
+    assert_matches_reference(df)
+
+
+def test_empty_and_single_packet_flows():
+    df = pd.DataFrame({
+        'spkts': [0, 1, 0, 1, 1],
+        'dpkts': [0, 0, 1, 1, 3],
+        'sbytes': [0.0, 60.0, 0.0, 40.0, 52.0],
+        'dbytes': [0.0, 0.0, 1500.0, 40.0, 4500.0],
+        'dur': [0.5, 0.0, 1.0, 0.25, 2.0],
+    })
+    assert_matches_reference(df)
+
+
+@pytest.mark.parametrize('seq_len', [1, 7, SEQ_LEN])
+def test_truncation(seq_len):
+    # Both directions longer than the sequence, so the merge must cut it off
+    df = pd.DataFrame({
+        'spkts': [seq_len, seq_len + 1, 3 * seq_len, 500],
+        'dpkts': [seq_len, 2 * seq_len, seq_len + 5, 499],
+        'sbytes': [1000.0, 2000.0, 3000.0, 1e6],
+        'dbytes': [500.0, 100.0, 9000.0, 2e6],
+        'dur': [1.0, 3.0, 0.01, 60.0],
+    })
+    assert_matches_reference(df, seq_len)
+
+
+def test_block_boundaries(monkeypatch):
+    monkeypatch.setattr(pipeline, 'SEQ_BLOCK_ROWS', 64)
+    assert_matches_reference(random_flows(200, seed=5))
+
+
+def test_template_cache_matches_builder():
+    df = pd.concat([random_flows(200, seed=4)] * 3, ignore_index=True)
+    columns = sequence_columns(df)
+    templates = SequenceTemplateCache(max_templates=150)
+    np.testing.assert_array_equal(templates(*columns), flows_to_sequences(*columns))
+    stats = templates.stats()
+    assert stats['rows'] == len(df)
+    assert stats['templates'] == 150
@@ -0,0 +1,121 @@
+"""netpulse-serve /score over a live local server."""
+import http.client
+import io
+import json
+import socket
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from netpulse import pipeline, synthetic
+from netpulse.server import ARROW_TYPES, ScoringServer, ScoringService
+
+MAX_BODY = 1 << 20
+
+
+@pytest.fixture(scope="module")
+def artifacts():
+    return pipeline.load_artifacts()
+
+
+@pytest.fixture(scope="module")
+def server(artifacts):
+    service = ScoringService(artifacts)
+    server = ScoringServer(("127.0.0.1", 0), service, max_body_bytes=MAX_BODY)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+@pytest.fixture(scope="module")
+def flows(artifacts):
+    df = synthetic.generate_flows(50, seed=2, feature_names=list(artifacts.scaler3.feature_names_in_), with_time=False)
+    df.insert(0, 'id', [f"flow-{i}" for i in range(len(df))])
+    return df
+
+
+@pytest.fixture(scope="module")
+def expected(artifacts, flows):
+    return pipeline.score_flows(artifacts, flows)
+
+
+def post(server, body, content_type):
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=60)
+    conn.request("POST", "/score", body=body, headers={'Content-Type': content_type})
+    response = conn.getresponse()
+    payload = response.read()
+    conn.close()
+    return response, payload
+
+
+def raw_post(server, headers, body=b""):
+    # http.client always sends a valid Content-Length; these requests must not
+    with socket.create_connection(server.server_address[:2], timeout=10) as sock:
+        sock.sendall(b"POST /score HTTP/1.1\r\nHost: test\r\nContent-Type: application/x-ndjson\r\n"
+                     + b"".join(f"{k}: {v}\r\n".encode() for k, v in headers.items()) + b"\r\n" + body)
+        reply = b""
+        while chunk := sock.recv(65536):
+            reply += chunk
+    head, _, payload = reply.partition(b"\r\n\r\n")
+    return int(head.split()[1]), head.decode().lower(), json.loads(payload)
+
+
+def records(df):
+    return json.loads(df.to_json(orient='records'))
+
+
+def check(result, flows, expected):
+    assert result['id'].tolist() == flows['id'].tolist()
+    assert result['prediction'].tolist() == expected.argmax(axis=1).tolist()
+    np.testing.assert_allclose(result[['prob_normal', 'prob_suspicious', 'prob_malicious']].to_numpy(),
+                               expected, rtol=1e-4, atol=1e-5)
+
+
+def test_json_lines(server, flows, expected):
+    body = "\n".join(json.dumps(r) for r in records(flows)).encode()
+    response, payload = post(server, body, "application/x-ndjson")
+    assert response.status == 200 and response.getheader("X-Flows") == str(len(flows))
+    check(pd.read_json(io.BytesIO(payload), lines=True), flows, expected)
+
+
+def test_json_array(server, flows, expected):
+    response, payload = post(server, json.dumps(records(flows)).encode(), "application/json")
+    assert response.status == 200
+    check(pd.read_json(io.BytesIO(payload), lines=True), flows, expected)
+
+
+def test_arrow_round_trip(server, flows, expected):
+    table = pa.Table.from_pandas(flows, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    response, payload = post(server, sink.getvalue().to_pybytes(), ARROW_TYPES[0])
+    assert response.status == 200 and response.getheader("Content-Type") == ARROW_TYPES[0]
+    check(pa.ipc.open_stream(payload).read_all().to_pandas(), flows, expected)
+
+
+def test_oversized_body_is_413(server):
+    response, payload = post(server, b"x" * (MAX_BODY + 1), "application/x-ndjson")
+    assert response.status == 413 and "error" in json.loads(payload)
+
+
+def test_unsupported_type_is_415(server, flows):
+    response, _ = post(server, flows.to_csv(index=False).encode(), "text/csv")
+    assert response.status == 415
+
+
+def test_missing_content_length_is_411(server):
+    status, head, payload = raw_post(server, {'Transfer-Encoding': 'chunked'}, b"0\r\n\r\n")
+    assert status == 411 and "connection: close" in head and "error" in payload
+
+
+@pytest.mark.parametrize("length", ["-5", "abc", "12x"])
+def test_invalid_content_length_is_400(server, length):
+    status, head, payload = raw_post(server, {'Content-Length': length})
+    assert status == 400 and "connection: close" in head and "Content-Length" in payload['error']